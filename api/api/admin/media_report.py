@@ -36,6 +36,7 @@ from api.models import (
     SensitiveAudio,
     SensitiveImage,
 )
+from api.utils.index_update_queue import IndexUpdateQueue, index_update_queue
 from api.utils.moderation import perform_moderation
 from api.utils.moderation_lock import LockManager
 
@@ -43,6 +44,22 @@ from api.utils.moderation_lock import LockManager
 logger = structlog.get_logger(__name__)
 
 
+def _report_index_update_failures(request, queue: IndexUpdateQueue):
+    """Warn the moderator about documents that could not be updated in ES."""
+
+    if not queue.failures:
+        return
+
+    document_ids = sorted(
+        {str(result.get("_id")) for item in queue.failures for result in item.values()}
+    )
+    messages.warning(
+        request,
+        f"{len(queue.failures)} search index update(s) failed for media with "
+        f"ID(s) {', '.join(document_ids)}. Moderate these items again to retry.",
+    )
+
+
 def register(site):
     site.register(Image, ImageListViewAdmin)
     site.register(Audio, AudioListViewAdmin)
@@ -394,7 +411,11 @@ class BulkModerationMixin:
             # The user has already confirmed so we will perform the
             # moderation and return ``None`` to display the change list
             # view again.
-            decision = perform_moderation(request, self.media_type, queryset, action)
+            with index_update_queue(raise_on_error=False) as queue:
+                decision = perform_moderation(
+                    request, self.media_type, queryset, action
+                )
+            _report_index_update_failures(request, queue)
             path = reverse(
                 f"admin:api_{self.media_type}decision_change", args=(decision.id,)
             )
@@ -622,7 +643,7 @@ class MediaListAdmin(BulkModerationMixin, admin.ModelAdmin):
 
         extra_context["media_type"] = self.media_type
 
-        valid_locks = self.lock_manager.prune()
+        valid_locks = self.lock_manager.prune() or {}
         locked_media = list(
             int(item.replace(f"{self.media_type}:", ""))
             for moderator, lock_set in valid_locks.items()
@@ -757,10 +778,12 @@ class MediaListAdmin(BulkModerationMixin, admin.ModelAdmin):
                 moderator=request.user.get_username(),
             )
 
-            through = through_model.objects.create(
-                decision=decision,
-                media_obj=media_obj,
-            )
+            with index_update_queue(raise_on_error=False) as queue:
+                through = through_model.objects.create(
+                    decision=decision,
+                    media_obj=media_obj,
+                )
+            _report_index_update_failures(request, queue)
             logger.debug(
                 "Through model created",
                 through=through.id,
@@ -1061,6 +1084,12 @@ class MediaDecisionAdmin(admin.ModelAdmin):
         obj.moderator = request.user
         return super().save_model(request, obj, form, change)
 
+    def save_related(self, request, form, formsets, change):
+        # Each media object added to the decision updates its ES documents
+        with index_update_queue(raise_on_error=False) as queue:
+            super().save_related(request, form, formsets, change)
+        _report_index_update_failures(request, queue)
+
 
 class MediaSubreportAdmin(BulkModerationMixin, admin.ModelAdmin):
     media_type = None
@@ -31,3 +31,10 @@ LENGTHS = {
     "medium",
     "long",
 }
+
+PEAKS_LIST = "list"
+PEAKS_PACKED = "packed"
+PEAKS_ENCODINGS = [
+    (PEAKS_LIST, "List"),  # default
+    (PEAKS_PACKED, "Packed"),
+]
@@ -55,7 +55,7 @@ def get_es_response(s, *args, **kwargs):
         if settings.VERBOSE_ES_RESPONSE:
             logger.info(pprint.pprint(search_response.to_dict()))
     except (BadRequestError, NotFoundError) as e:
-        raise ValueError(e)
+        raise ValueError(e) from e
 
     return search_response
 
@@ -9,9 +9,41 @@ from api.controllers.search_controller import (
     _post_process_results,
     get_excluded_sources_query,
 )
+from api.utils import related_media_cache
+from api.utils.check_dead_links import check_dead_links
 
 
 def related_media(uuid: str, index: str, filter_dead: bool) -> list[Hit]:
+    """
+    Given a UUID, gets the 10 related search results precomputed for it, or
+    finds them with ``query_related_media`` if they are not precomputed.
+
+    The results precomputed for an item only have their ``identifier``, ``url``
+    and ``provider``, which are enough to check them for dead links again.
+
+    :param uuid: The UUID of the item to find related results for.
+    :param index: The Elasticsearch index to search (e.g. 'image')
+    :param filter_dead: Whether dead links should be removed.
+    :return: List of related results.
+    """
+
+    # The item is looked up even when its related results are precomputed, so
+    # that an item removed from the index since is not found.
+    item_hit = _get_item(uuid, index)
+    related_media_cache.record_request(index, uuid)
+
+    if (
+        related_results := related_media_cache.get_related_results(index, uuid)
+    ) is not None:
+        results = [Hit({"_source": result}) for result in related_results]
+        if filter_dead:
+            check_dead_links(None, 0, results)
+        return results
+
+    return _query_related_media(item_hit, uuid, index, filter_dead)
+
+
+def query_related_media(uuid: str, index: str, filter_dead: bool) -> list[Hit]:
     """
     Given a UUID, finds 10 related search results based on title and tags.
 
@@ -25,12 +57,20 @@ def related_media(uuid: str, index: str, filter_dead: bool) -> list[Hit]:
     :return: List of related results.
     """
 
+    return _query_related_media(_get_item(uuid, index), uuid, index, filter_dead)
+
+
+def _get_item(uuid: str, index: str) -> Hit:
     # Search the default index for the item itself as it might be sensitive.
     item_search = Search(index=index)
     # This will raise ``IndexError`` if no hits are found. This error is caught
     # in the viewset handler function.
-    item_hit = item_search.query(Term(identifier=uuid)).execute().hits[0]
+    return item_search.query(Term(identifier=uuid)).execute().hits[0]
+
 
+def _query_related_media(
+    item_hit: Hit, uuid: str, index: str, filter_dead: bool
+) -> list[Hit]:
     # Match related using title.
     title = getattr(item_hit, "title", None)
     tags = getattr(item_hit, "tags", None)
@@ -15,11 +15,12 @@ from elasticsearch_dsl.query import EMPTY_QUERY
 from elasticsearch_dsl.response import Hit, Response
 from redis.exceptions import ConnectionError
 
-import api.models as models
 from api.constants.media_types import OriginIndex, SearchIndex
+from api.constants.restricted_features import MAX_RESULT_COUNT
 from api.constants.search import SearchStrategy
 from api.constants.sorting import INDEXED_ON
 from api.controllers.elasticsearch.helpers import (
+    DEAD_LINK_RATIO,
     ELASTICSEARCH_MAX_RESULT_WINDOW,
     get_es_response,
     get_query_slice,
@@ -28,7 +29,10 @@ from api.controllers.elasticsearch.helpers import (
 from api.utils import tallies
 from api.utils.check_dead_links import check_dead_links
 from api.utils.dead_link_mask import get_query_hash
+from api.utils.filtered_sources import get_filtered_sources
 from api.utils.search_context import SearchContext
+from api.utils.search_cursor import ExpiredCursorError, SearchCursor
+from api.utils.source_registry import SourceRegistry
 
 
 # Using TYPE_CHECKING to avoid circular imports when importing types
@@ -40,9 +44,11 @@ logger = structlog.get_logger(__name__)
 
 NESTING_THRESHOLD = config("POST_PROCESS_NESTING_THRESHOLD", cast=int, default=5)
 SOURCE_CACHE_TIMEOUT = 60 * 60 * 4  # 4 hours
-FILTER_CACHE_TIMEOUT = 30
-FILTERED_SOURCES_CACHE_KEY = "filtered_sources"
-FILTERED_SOURCES_CACHE_VERSION = 1
+# The number of seconds after which each process refreshes its copy of the sources
+SOURCE_REGISTRY_TTL = config("SOURCE_REGISTRY_TTL", cast=int, default=60)
+INDEX_SORT_CACHE_TIMEOUT = 60 * 60  # 1 hour
+# How long the point in time of a search cursor is kept between its pages
+SEARCH_CURSOR_KEEP_ALIVE = config("SEARCH_CURSOR_KEEP_ALIVE", default="5m")
 DEFAULT_BOOST = 10000
 DEFAULT_SEARCH_FIELDS = ["title", "description", "tags.name"]
 DEFAULT_SQS_FLAGS = "AND|NOT|PHRASE|WHITESPACE"
@@ -127,7 +133,11 @@ def _post_process_results(
             end = 90 + 45
             ```
             """
-            if end >= search_results.hits.total.value:
+            # The total is only a lower bound if Elasticsearch stopped counting
+            # hits, see ``query_media``, in which case more hits are available
+            total_hits = search_results.hits.total
+            is_total_exact = total_hits.relation != "gte"
+            if is_total_exact and end >= total_hits.value:
                 # Total available hits already exhausted in previous iteration
                 return results
 
@@ -139,13 +149,13 @@ def _post_process_results(
             # subtract start to account for the records skipped
             # and which should not count towards the total
             # available hits for the query
-            total_available_hits = search_results.hits.total.value - start
-            if query_size > total_available_hits:
+            total_available_hits = total_hits.value - start
+            if is_total_exact and query_size > total_available_hits:
                 # Clamp the query size to last available hit. On the next
                 # iteration, if results are still insufficient, the check
                 # to compare previous_query_size and total_available_hits
                 # will prevent further query attempts
-                end = search_results.hits.total.value
+                end = total_hits.value
 
             s = s[start:end]
             search_response = get_es_response(s, es_query="postprocess_search")
@@ -162,38 +172,12 @@ def get_excluded_sources_query() -> Q | None:
     Hide data sources from the catalog dynamically.
     To exclude a source, set ``filter_content`` to ``True`` in the
     ``ContentSource`` model in Django admin.
-    The list of ``source_identifier``s is cached in Redis with
-    `:FILTERED_SOURCES_CACHE_VERSION:FILTERED_SOURCES_CACHE_KEY` key.
+    The list of ``source_identifier``s is kept in the memory of the process, see
+    ``api.utils.filtered_sources``.
     """
 
-    try:
-        filtered_sources = cache.get(
-            key=FILTERED_SOURCES_CACHE_KEY, version=FILTERED_SOURCES_CACHE_VERSION
-        )
-        logger.info(f"Filtered sources from cache: {filtered_sources}")
-    except ConnectionError:
-        logger.warning("Redis connect failed, cannot get cached filtered sources.")
-        filtered_sources = None
-
-    if not filtered_sources:
-        filtered_sources = list(
-            models.ContentSource.objects.filter(filter_content=True).values_list(
-                "source_identifier", flat=True
-            )
-        )
-
-        try:
-            cache.set(
-                key=FILTERED_SOURCES_CACHE_KEY,
-                version=FILTERED_SOURCES_CACHE_VERSION,
-                timeout=FILTER_CACHE_TIMEOUT,
-                value=filtered_sources,
-            )
-        except ConnectionError:
-            logger.warning("Redis connect failed, cannot cache filtered sources.")
-
-    if filtered_sources:
-        return Q("terms", source=filtered_sources)
+    if filtered_sources := get_filtered_sources():
+        return Q("terms", source=sorted(filtered_sources))
     return None
 
 
@@ -396,6 +380,43 @@ query_builders = {
 }
 
 
+def build_media_search(
+    search_params: MediaSearchRequestSerializer,
+    index: SearchIndex,
+) -> tuple[Search, SearchStrategy, list[dict]]:
+    """
+    Build the search or collection query for the search params.
+
+    :param search_params: Search query params, see :class: `MediaSearchRequestSerializer`.
+    :param index: The Elasticsearch index or alias to search.
+    :return: Tuple with the Search object, without sorting, the search strategy and
+    the sort to apply, which is empty for results ranked by relevance.
+    """
+    strategy: SearchStrategy = (
+        "collection" if search_params.validated_data.get("collection") else "search"
+    )
+
+    query = query_builders[strategy](search_params)
+
+    s = Search(index=index).query(query)
+
+    if strategy == "search":
+        # Use highlighting to determine which fields contribute to the selection of
+        # top results.
+        s = s.highlight(*DEFAULT_SEARCH_FIELDS)
+        s = s.highlight_options(order="score")
+        s.extra(track_scores=True)
+
+    # Sort by `created_on` if the parameter is set or if `strategy` is `collection`.
+    sort = []
+    sort_by = search_params.validated_data.get("sort_by")
+    if strategy == "collection" or sort_by == INDEXED_ON:
+        sort_dir = search_params.validated_data.get("sort_dir", "desc")
+        sort.append({"created_on": {"order": sort_dir}})
+
+    return s, strategy, sort
+
+
 def query_media(
     search_params: MediaSearchRequestSerializer,
     origin_index: OriginIndex,
@@ -428,31 +449,25 @@ def query_media(
     """
     index = get_index(exact_index, origin_index, search_params)
 
-    strategy: SearchStrategy = (
-        "collection" if search_params.validated_data.get("collection") else "search"
-    )
-
-    query = query_builders[strategy](search_params)
-
-    s = Search(index=index).query(query)
-
-    if strategy == "search":
-        # Use highlighting to determine which fields contribute to the selection of
-        # top results.
-        s = s.highlight(*DEFAULT_SEARCH_FIELDS)
-        s = s.highlight_options(order="score")
-        s.extra(track_scores=True)
+    s, strategy, sort = build_media_search(search_params, index)
 
     # Route users to the same Elasticsearch worker node to reduce
     # pagination inconsistencies and increase cache hits.
     # TODO: Re-add 7s request_timeout when ES stability is restored
     s = s.params(preference=str(ip))
 
-    # Sort by `created_on` if the parameter is set or if `strategy` is `collection`.
-    sort_by = search_params.validated_data.get("sort_by")
-    if strategy == "collection" or sort_by == INDEXED_ON:
-        sort_dir = search_params.validated_data.get("sort_dir", "desc")
-        s = s.sort({"created_on": {"order": sort_dir}})
+    if sort:
+        s = s.sort(*sort)
+        # If the index is sorted in the same order, its segments can be searched
+        # in order, and the search can terminate once enough hits are counted.
+        # No more results than the maximum result count of the request are ever
+        # reported, so counting stops there, and the total becomes a lower bound.
+        sort_dir = sort[0]["created_on"]["order"]
+        if get_index_sort(index) == ("created_on", sort_dir):
+            _, max_result_count = MAX_RESULT_COUNT.request_level(
+                search_params.context.get("request")
+            )
+            s = s.extra(track_total_hits=max_result_count)
 
     # Execute paginated search and tally results
     page_count, result_count, results = execute_search(
@@ -465,6 +480,72 @@ def query_media(
     return results, page_count, result_count, search_context.asdict()
 
 
+def query_media_by_cursor(
+    search_params: MediaSearchRequestSerializer,
+    origin_index: OriginIndex,
+    exact_index: bool,
+    page_size: int,
+    filter_dead: bool,
+    cursor: SearchCursor,
+) -> tuple[list[Hit], int, int, dict, SearchCursor | None]:
+    """
+    Build the search or collection query, and return the page of results at the
+    position of the cursor.
+
+    The pages of a cursor are read from an Elasticsearch point in time, which is
+    opened for the first page, so they are consistent with each other. Each page
+    continues from the sort values of the last hit examined for the previous page,
+    including dead links, so retrieving a page costs the same at any depth and the
+    dead links before it are never checked again.
+
+    :param search_params: Search query params, see :class: `MediaSearchRequestSerializer`.
+    :param origin_index: The Elasticsearch index to search (e.g. 'image')
+    :param exact_index: whether to skip all modifications to the index name
+    :param page_size: The number of results to return per page.
+    :param filter_dead: Whether dead links should be removed.
+    :param cursor: The position of the page of results to return.
+    :return: Tuple with a list of Hits from elasticsearch, the total count of
+    pages, the number of results, the ``SearchContext`` as a dict, and the cursor
+    to the next page, ``None`` if there are no more results.
+    """
+    index = get_index(exact_index, origin_index, search_params)
+
+    s, strategy, sort = build_media_search(search_params, index)
+
+    pit_id = cursor.pit_id or open_point_in_time(index)
+    # Searches of a point in time must not have an index. The shard and position
+    # of each document tiebreak the hits, so their sort values are unique.
+    s = s.index().sort(*(sort or ["_score"]), {"_shard_doc": "asc"})
+
+    page_count, result_count, results, next_cursor = execute_cursor_search(
+        s, cursor, pit_id, page_size, filter_dead, index, es_query=strategy
+    )
+
+    result_ids = [result.identifier for result in results]
+    search_context = SearchContext.build(result_ids, origin_index)
+
+    return results, page_count, result_count, search_context.asdict(), next_cursor
+
+
+def open_point_in_time(index: SearchIndex) -> str:
+    """Open a point in time of the index, and return its ID."""
+
+    response = settings.ES.open_point_in_time(
+        index=index, keep_alive=SEARCH_CURSOR_KEEP_ALIVE
+    )
+    return response["id"]
+
+
+def close_point_in_time(pit_id: str) -> None:
+    """Close the point in time of a cursor once all its results are retrieved."""
+
+    try:
+        settings.ES.close_point_in_time(id=pit_id)
+    except NotFoundError:
+        # The point in time has already expired
+        pass
+
+
 def tally_results(
     index: SearchIndex, results: list[Hit] | None, page: int, page_size: int
 ) -> None:
@@ -529,6 +610,80 @@ def execute_search(
     return page_count, result_count, results
 
 
+def execute_cursor_search(
+    s: Search,
+    cursor: SearchCursor,
+    pit_id: str,
+    page_size: int,
+    filter_dead: bool,
+    index: SearchIndex,
+    es_query: str,
+) -> tuple[int, int, list[Hit], SearchCursor | None]:
+    """
+    Execute the sorted search from the position of the cursor, in the point in
+    time, post-process the results, and return the results, the result and page
+    counts, and the cursor to the next page.
+
+    Hits are fetched in batches after the last hit examined until the page is
+    filled with live results, for at most ``NESTING_THRESHOLD`` batches.
+
+    :raise: ``ExpiredCursorError`` if the point in time no longer exists
+    """
+    batch_size = ceil(page_size / (1 - DEAD_LINK_RATIO)) if filter_dead else page_size
+    search_after = cursor.search_after
+    results: list[Hit] = []
+    response = None
+    is_exhausted = False
+
+    for _ in range(NESTING_THRESHOLD):
+        batch = s.extra(pit={"id": pit_id, "keep_alive": SEARCH_CURSOR_KEEP_ALIVE})
+        if search_after is not None:
+            batch = batch.extra(search_after=search_after)
+        batch = batch[:batch_size]
+        try:
+            batch_response = get_es_response(batch, es_query=f"{es_query}_cursor")
+        except ValueError as error:
+            # Searches of a point in time have no index, so a missing point in
+            # time is the only thing which cannot be found
+            if isinstance(error.__cause__, NotFoundError):
+                raise ExpiredCursorError(pit_id) from error
+            raise
+        response = response or batch_response
+        # The ID of a point in time can change between searches
+        pit_id = batch_response.pit_id
+
+        hits = list(batch_response)
+        live_hits = list(hits)
+        if filter_dead:
+            check_dead_links(None, 0, live_hits)
+        live_ids = {id(hit) for hit in live_hits}
+
+        for hit in hits:
+            search_after = list(hit.meta.sort)
+            if id(hit) in live_ids:
+                results.append(hit)
+                if len(results) == page_size:
+                    break
+
+        if len(results) == page_size:
+            break
+        if len(hits) < batch_size:
+            is_exhausted = True
+            break
+
+    if is_exhausted:
+        close_point_in_time(pit_id)
+        next_cursor = None
+    else:
+        next_cursor = cursor.advance(pit_id, search_after)
+
+    result_count, page_count = _get_result_and_page_count(
+        response, results, page_size, cursor.page
+    )
+    tally_results(index, results, cursor.page, page_size)
+    return page_count, result_count, results, next_cursor
+
+
 def get_sources(index):
     """
     Given an index, find all available data sources and return their counts.
@@ -584,6 +739,66 @@ def get_sources(index):
     return sources
 
 
+source_registry = SourceRegistry(get_sources, ttl=SOURCE_REGISTRY_TTL)
+
+
+def get_available_sources(index: str) -> dict[str, int]:
+    """
+    Get the sources of an index from the memory of the process, for validating
+    requests without reading the sources from the cache.
+
+    The sources are refreshed in the background from ``get_sources``, so they can be
+    up to ``SOURCE_REGISTRY_TTL`` seconds older than the cached sources.
+
+    :param index: An Elasticsearch index, such as `'image'`.
+    :return: A dictionary mapping sources to the count of their images.
+    """
+    return source_registry.get(index)
+
+
+def get_index_sort(index: SearchIndex) -> tuple[str, str] | None:
+    """
+    Get the field and order by which the documents of the index are sorted.
+
+    The sort of an index cannot change, but an alias can be pointed at a new index,
+    so the sort is only cached for a short time.
+
+    :param index: An Elasticsearch index or alias, such as `'image'`.
+    :return: the field and order of the sort, or None if the index is not sorted.
+    """
+    cache_key = f"index-sort-{index}"
+    try:
+        index_sort = cache.get(key=cache_key)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot get cached index sort.")
+        index_sort = None
+
+    if index_sort is None:
+        try:
+            response = settings.ES.indices.get_settings(
+                index=index, name="index.sort.*", flat_settings=True
+            )
+        except NotFoundError:
+            return None
+        # An alias points to a single index, whose settings are the only ones.
+        index_settings = next(iter(response.values()), {}).get("settings", {})
+        # The sort is stored as a list to be cacheable; an empty list means none.
+        index_sort = [
+            index_settings[f"index.sort.{key}"]
+            for key in ("field", "order")
+            if f"index.sort.{key}" in index_settings
+        ]
+
+        try:
+            cache.set(key=cache_key, timeout=INDEX_SORT_CACHE_TIMEOUT, value=index_sort)
+        except ConnectionError:
+            logger.warning("Redis connect failed, cannot cache index sort.")
+
+    if len(index_sort) != 2:
+        return None
+    return tuple(index_sort)
+
+
 def _get_result_and_page_count(
     response_obj: Response, results: list[Hit] | None, page_size: int, page: int
 ) -> tuple[int, int]:
@@ -597,6 +812,8 @@ def _get_result_and_page_count(
     if not results:
         return 0, 0
 
+    # If Elasticsearch stopped counting hits, the total is a lower bound, but it
+    # is at least the maximum result count, to which both counts are clamped.
     result_count = response_obj.hits.total.value
     page_count = ceil(result_count / page_size)
 
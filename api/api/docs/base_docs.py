@@ -281,4 +281,5 @@ NON_FILTER_FIELDS = [
     "unstable__sort_dir",
     "unstable__authority",
     "unstable__authority_boost",
+    "unstable__cursor",
 ]
@@ -0,0 +1,39 @@
+import django_redis
+from django_tqdm import BaseCommand
+
+
+# The moderators' soft-locks used to be kept in a ranked-set per moderator, under
+# this prefix, before they were all moved to ``moderation_lock.LOCKS_KEY``.
+LEGACY_LOCK_PATTERN = "moderation_lock:*"
+
+
+class Command(BaseCommand):
+    help = "Deletes the soft-locks left in the former per-moderator Redis keys."
+    """
+    The per-moderator keys had no expiry of their own, so they would otherwise stay
+    in Redis forever. The command only needs to run once, but deleting keys that are
+    already gone is harmless, so it can be run again safely.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            help="The number of keys to delete at once.",
+            type=int,
+            default=1000,
+        )
+
+    def handle(self, *args, **options):
+        redis = django_redis.get_redis_connection("default")
+        batch_size = options["batch_size"]
+
+        # There is one key per moderator, so all of them are collected before any
+        # is deleted, rather than changing the keys while scanning them.
+        keys = list(redis.scan_iter(match=LEGACY_LOCK_PATTERN, count=batch_size))
+        deleted_count = 0
+        for start in range(0, len(keys), batch_size):
+            deleted_count += redis.delete(*keys[start : start + batch_size])
+
+        self.info(
+            self.style.SUCCESS(f"Deleted {deleted_count:,} legacy moderation locks!")
+        )
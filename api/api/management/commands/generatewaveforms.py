@@ -1,5 +1,7 @@
 import subprocess
 
+from django.db.models import Q
+
 from django_tqdm import BaseCommand
 from limit import limit
 
@@ -86,7 +88,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         existing_waveform_audio_identifiers_query = AudioAddOn.objects.filter(
-            waveform_peaks__isnull=False
+            Q(waveform_peaks_packed__isnull=False) | Q(waveform_peaks__isnull=False)
         ).values_list("audio_identifier", flat=True)
         audios = Audio.objects.exclude(
             identifier__in=existing_waveform_audio_identifiers_query
@@ -0,0 +1,42 @@
+from django_tqdm import BaseCommand
+
+from api.models.audio import AudioAddOn
+
+
+class Command(BaseCommand):
+    help = "Packs the waveform peaks stored as float arrays into the compact format."
+    """
+    Each batch of add-ons is packed and saved in a single query, which also clears
+    their float arrays. The add-ons left to pack are therefore always the first
+    ones of the query, so the command can be interrupted and run again safely.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            help="The number of add-ons to pack per query.",
+            type=int,
+            default=1000,
+        )
+
+    def handle(self, *args, **options):
+        add_ons = AudioAddOn.objects.filter(waveform_peaks__isnull=False).order_by(
+            "audio_identifier"
+        )
+        batch_size = options["batch_size"]
+
+        count = add_ons.count()
+        self.info(self.style.NOTICE(f"Packing waveforms for {count:,} records"))
+
+        with self.tqdm(total=count) as progress:
+            while batch := list(
+                add_ons.only("audio_identifier", "waveform_peaks")[:batch_size]
+            ):
+                for add_on in batch:
+                    add_on.set_peaks(add_on.waveform_peaks)
+                AudioAddOn.objects.bulk_update(
+                    batch, ["waveform_peaks", "waveform_peaks_packed"]
+                )
+                progress.update(len(batch))
+
+        self.info(self.style.SUCCESS("Finished packing waveforms!"))
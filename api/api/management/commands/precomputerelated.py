@@ -0,0 +1,88 @@
+from django_tqdm import BaseCommand
+
+from api.constants.media_types import MEDIA_TYPES
+from api.controllers.elasticsearch.related import query_related_media
+from api.utils import related_media_cache
+from api.utils.search_context import get_filtered_index_name
+
+
+class Command(BaseCommand):
+    help = "Precomputes the related media of the most requested items."
+    """
+    Only the items whose related media are not yet precomputed against the current
+    filtered index are queried, so the command is meant to run after each data
+    refresh, to precompute them for the new index, and periodically in between, to
+    precompute them for the items that became popular since.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--media_type",
+            help="The media type of the items.",
+            choices=MEDIA_TYPES,
+            required=True,
+        )
+        parser.add_argument(
+            "--count",
+            help="The number of most requested items to precompute related media for.",
+            type=int,
+            default=1000,
+        )
+        parser.add_argument(
+            "--batch_size",
+            help="The number of items to store related media for at once.",
+            type=int,
+            default=100,
+        )
+
+    def handle(self, *args, **options):
+        media_type = options["media_type"]
+        batch_size = options["batch_size"]
+
+        if (index_name := get_filtered_index_name(media_type)) is None:
+            self.error(f"There is no filtered index for {media_type}.")
+            return
+
+        identifiers = related_media_cache.get_most_requested(
+            media_type, options["count"]
+        )
+        identifiers = related_media_cache.get_missing_identifiers(
+            media_type, index_name, identifiers
+        )
+        self.info(
+            self.style.NOTICE(
+                f"Precomputing related media for {len(identifiers):,} items"
+            )
+        )
+
+        related = {}
+        with self.tqdm(total=len(identifiers)) as progress:
+            for identifier in identifiers:
+                try:
+                    results = query_related_media(
+                        identifier, media_type, filter_dead=True
+                    )
+                except IndexError:
+                    # The item is not in the index anymore
+                    pass
+                else:
+                    related[identifier] = [
+                        {
+                            "identifier": result.identifier,
+                            "url": result.url,
+                            "provider": result.provider,
+                        }
+                        for result in results
+                    ]
+
+                if len(related) >= batch_size:
+                    related_media_cache.set_related_results(
+                        media_type, index_name, related
+                    )
+                    related = {}
+                progress.update(1)
+
+        if related:
+            related_media_cache.set_related_results(media_type, index_name, related)
+
+        self.info(self.style.SUCCESS("Finished precomputing related media!"))
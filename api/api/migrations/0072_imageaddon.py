@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-19 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0071_alter_audio_options_alter_deletedaudio_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageAddOn',
+            fields=[
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('updated_on', models.DateTimeField(auto_now=True)),
+                ('image_identifier', models.UUIDField(help_text='The identifier of the image object.', primary_key=True, serialize=False)),
+                ('width', models.IntegerField(blank=True, help_text='The width of the image in pixels, probed from the image file.', null=True)),
+                ('height', models.IntegerField(blank=True, help_text='The height of the image in pixels, probed from the image file.', null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-19 08:26
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0072_imageaddon'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audioaddon',
+            name='waveform_peaks_packed',
+            field=models.BinaryField(help_text='The waveform peaks, quantized to 16-bit integers and prefixed with the version of the format. See ``api.utils.waveform.pack_peaks``.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='audioaddon',
+            name='waveform_peaks',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), help_text='The waveform peaks. A list of floats in the range of 0 -> 1 inclusively. Superseded by the packed waveform peaks.', null=True, size=1500),
+        ),
+    ]
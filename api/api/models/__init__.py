@@ -13,6 +13,7 @@ from api.models.audio import (
 from api.models.image import (
     DeletedImage,
     Image,
+    ImageAddOn,
     ImageDecision,
     ImageDecisionThrough,
     ImageList,
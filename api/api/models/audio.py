@@ -19,7 +19,7 @@ from api.models.media import (
     AbstractSensitiveMedia,
 )
 from api.models.mixins import FileMixin, ForeignIdentifierMixin, MediaMixin
-from api.utils.waveform import generate_peaks
+from api.utils.waveform import generate_peaks, pack_peaks, unpack_peaks
 
 
 class AltAudioFile(AbstractAltFile):
@@ -133,10 +133,46 @@ class AudioAddOn(OpenLedgerModel):
         # https://github.com/WordPress/openverse-api/blob/a7955c86d43bff504e8d41454f68717d79dd3a44/api/catalog/api/utils/waveform.py#L71
         size=1500,
         help_text=(
-            "The waveform peaks. A list of floats in the range of 0 -> 1 inclusively."
+            "The waveform peaks. A list of floats in the range of 0 -> 1 inclusively. "
+            "Superseded by the packed waveform peaks."
         ),
         null=True,
     )
+    waveform_peaks_packed = models.BinaryField(
+        help_text=(
+            "The waveform peaks, quantized to 16-bit integers and prefixed with the "
+            "version of the format. See ``api.utils.waveform.pack_peaks``."
+        ),
+        null=True,
+    )
+    """
+    New peaks are only stored packed. Peaks stored as a float array before are
+    packed by the ``packwaveforms`` management command.
+    """
+
+    @property
+    def peaks(self) -> list[float] | None:
+        """Get the waveform peaks, from either storage format."""
+
+        if self.waveform_peaks_packed is not None:
+            return unpack_peaks(self.waveform_peaks_packed)
+        return self.waveform_peaks
+
+    @property
+    def packed_peaks(self) -> bytes | None:
+        """Get the waveform peaks in the packed format."""
+
+        if self.waveform_peaks_packed is not None:
+            return bytes(self.waveform_peaks_packed)
+        if self.waveform_peaks is not None:
+            return pack_peaks(self.waveform_peaks)
+        return None
+
+    def set_peaks(self, peaks: list[float]):
+        """Store the waveform peaks packed, replacing any float array."""
+
+        self.waveform_peaks_packed = pack_peaks(peaks)
+        self.waveform_peaks = None
 
 
 class Audio(AudioFileMixin, AbstractMedia):
@@ -226,13 +262,13 @@ class Audio(AudioFileMixin, AbstractMedia):
     def get_or_create_waveform(self):
         add_on, _ = AudioAddOn.objects.get_or_create(audio_identifier=self.identifier)
 
-        if add_on.waveform_peaks is not None:
-            return add_on.waveform_peaks
+        if (peaks := add_on.peaks) is not None:
+            return peaks
 
-        add_on.waveform_peaks = generate_peaks(self)
+        add_on.set_peaks(generate_peaks(self))
         add_on.save()
 
-        return add_on.waveform_peaks
+        return add_on.peaks
 
     class Meta(AbstractMedia.Meta):
         db_table = "audio"
@@ -4,6 +4,7 @@ from django.db import models
 from uuslug import uuslug
 
 from api.constants.media_types import IMAGE_TYPE
+from api.models.base import OpenLedgerModel
 from api.models.media import (
     AbstractDeletedMedia,
     AbstractMedia,
@@ -66,6 +67,28 @@ class Image(ImageFileMixin, AbstractMedia):
         return hasattr(self, "sensitive_image")
 
 
+class ImageAddOn(OpenLedgerModel):
+    image_identifier = models.UUIDField(
+        primary_key=True,
+        help_text="The identifier of the image object.",
+    )
+    """
+    This is not a foreign key for the same reason as ``AudioAddOn``: the data
+    refresh replaces the image table entirely, while add-ons must persist.
+    """
+
+    width = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="The width of the image in pixels, probed from the image file.",
+    )
+    height = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="The height of the image in pixels, probed from the image file.",
+    )
+
+
 class DeletedImage(AbstractDeletedMedia):
     """
     Images deleted from the upstream source.
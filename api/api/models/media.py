@@ -8,12 +8,16 @@ from django.urls import reverse
 from django.utils.html import format_html
 
 import structlog
-from elasticsearch import Elasticsearch, NotFoundError, helpers
+from elasticsearch import Elasticsearch, NotFoundError
+from openverse_attribution.attribution import get_attribution_text
 from openverse_attribution.license import License
 
 from api.constants.moderation import DecisionAction
 from api.models.base import OpenLedgerModel
 from api.models.mixins import ForeignIdentifierMixin, IdentifierMixin, MediaMixin
+from api.utils.index_update_queue import get_current_queue, index_update_queue
+from api.utils.search_context import evict_sensitivity
+from api.utils.search_response_cache import bump_content_epoch
 
 
 MATURE = "mature"
@@ -127,7 +131,7 @@ class AbstractMedia(
             identifier=self.identifier,
         )
         try:
-            return License(self.license.lower(), self.license_version).url
+            return License.interned(self.license.lower(), self.license_version).url
         except ValueError:
             return None
 
@@ -136,13 +140,12 @@ class AbstractMedia(
         """Legally valid attribution for the media item in plain-text English."""
 
         try:
-            return License(
+            return get_attribution_text(
                 self.license.lower(),
                 self.license_version,
-            ).get_attribution_text(
-                self.title,
-                self.creator,
-                self.license_url,
+                title=self.title,
+                creator=self.creator,
+                license_url=self.license_url,
             )
         except ValueError:
             return None
@@ -375,6 +378,9 @@ class PerformIndexUpdateMixin:
 
         Automatically handles ``DoesNotExist`` warnings, forces a refresh,
         and calls the method for origin and filtered indexes.
+
+        Within ``index_update_queue``, the update is queued instead, to be
+        sent in bulk and refreshed once when the queue exits.
         """
         es: Elasticsearch = settings.ES
 
@@ -387,6 +393,12 @@ class PerformIndexUpdateMixin:
                     f"with identifier {self.media_obj.identifier}."
                 )
 
+        evict_sensitivity(self.es_index, [self.media_obj_id])
+
+        if (queue := get_current_queue()) is not None:
+            queue.add(method, self.indexes(), [document_id], **es_method_args)
+            return
+
         for index in self.indexes():
             try:
                 getattr(es, method)(
@@ -403,6 +415,7 @@ class PerformIndexUpdateMixin:
                     f"in {index} index. No update performed."
                 )
                 continue
+        bump_content_epoch()
 
     @classmethod
     def _bulk_perform_index_update(
@@ -419,26 +432,15 @@ class PerformIndexUpdateMixin:
 
         Unlike the single-document behaviour, this function does not
         provide validation to check if the media objects exist.
-        """
 
-        es: Elasticsearch = settings.ES
-
-        actions = [
-            {
-                "_op_type": method,
-                "_index": index,
-                "_id": document_id,
-                **es_method_args,
-            }
-            for index in cls.indexes()
-            for document_id in document_ids
-        ]
+        Within ``index_update_queue``, the updates join the queue. Otherwise
+        they are sent immediately, with one bulk request per index.
+        """
 
-        # Perform all actions in bulk, while allowing for missing
-        # documents, similar to the single-document behaviour. In all
-        # other cases, this raises ``BulkIndexError``.
-        helpers.bulk(es, actions, ignore_status=(404,))
-        es.indices.refresh(index=cls.indexes())
+        # Missing documents are allowed, similar to the single-document
+        # behaviour. In all other cases, this raises ``BulkIndexError``.
+        with index_update_queue() as queue:
+            queue.add(method, cls.indexes(), document_ids, **es_method_args)
 
 
 class AbstractDeletedMedia(PerformIndexUpdateMixin, OpenLedgerModel):
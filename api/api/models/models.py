@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from api.constants.media_types import MEDIA_TYPE_CHOICES
 from api.models.base import OpenLedgerModel
+from api.utils.filtered_sources import invalidate_filtered_sources
+from api.utils.search_response_cache import bump_content_epoch
 
 
 class ContentSource(models.Model):
@@ -39,6 +43,13 @@ class ContentSource(models.Model):
         db_table = "content_provider"
 
 
+@receiver([post_save, post_delete], sender=ContentSource)
+def invalidate_content_source(sender, instance, **kwargs):
+    # Hiding or showing a source changes the results of searches
+    invalidate_filtered_sources()
+    bump_content_epoch()
+
+
 class Tag(OpenLedgerModel):
     foreign_identifier = models.CharField(max_length=255, blank=True, null=True)
     name = models.CharField(max_length=1000, blank=True, null=True)
@@ -1,10 +1,19 @@
+from base64 import b64encode
+
 from rest_framework import serializers
 
 from elasticsearch_dsl.response import Hit
 
 from api.constants.field_order import field_position_map
-from api.constants.field_values import AUDIO_CATEGORIES, LENGTHS
+from api.constants.field_values import (
+    AUDIO_CATEGORIES,
+    LENGTHS,
+    PEAKS_ENCODINGS,
+    PEAKS_LIST,
+    PEAKS_PACKED,
+)
 from api.models import Audio, AudioReport, AudioSet
+from api.serializers.docs import UNSTABLE_WARNING
 from api.serializers.fields import EnumCharField, SchemableHyperlinkedIdentityField
 from api.serializers.media_serializers import (
     MediaReportRequestSerializer,
@@ -47,6 +56,16 @@ class AudioSearchRequestSerializer(MediaSearchRequestSerializer):
         required=False,
         default=False,
     )
+    unstable__peaks_encoding = serializers.ChoiceField(
+        source="peaks_encoding",
+        help_text=f"{UNSTABLE_WARNING}The encoding of the waveform peaks. `list` "
+        "returns a list of numbers. `packed` returns a base64 string of one version "
+        "byte, `1`, followed by each peak multiplied by 50000, as a little-endian "
+        "16-bit unsigned integer.",
+        choices=PEAKS_ENCODINGS,
+        required=False,
+        default=PEAKS_LIST,
+    )
 
 
 class AudioReportRequestSerializer(MediaReportRequestSerializer):
@@ -178,10 +197,15 @@ class AudioSerializer(AudioHyperlinksSerializer, MediaSerializer):
             del self.fields["peaks"]
         super().__init__(*args, **kwargs)
 
-    def get_peaks(self, obj) -> list[int]:
+    def get_peaks(self, obj) -> list[float] | str:
         audio_addon = self.context.get("addons", {}).get(obj.identifier)
-        if audio_addon:
-            return audio_addon.waveform_peaks
+        if not audio_addon:
+            return None
+        encoding = self.context.get("validated_data", {}).get("peaks_encoding")
+        if encoding == PEAKS_PACKED:
+            packed = audio_addon.packed_peaks
+            return b64encode(packed).decode() if packed is not None else None
+        return audio_addon.peaks
 
     def to_representation(self, instance):
         # Get the original representation
@@ -1,4 +1,5 @@
 from collections import namedtuple
+from functools import cached_property
 from math import floor
 from typing import TypedDict
 
@@ -33,7 +34,9 @@ from api.serializers.docs import (
     UNSTABLE_WARNING,
 )
 from api.serializers.fields import SchemableHyperlinkedIdentityField
+from api.serializers.serialization_plan import SerializationPlan
 from api.utils.help_text import make_comma_separated_help_text
+from api.utils.search_cursor import SearchCursor
 from api.utils.url import add_protocol
 
 
@@ -186,6 +189,7 @@ class MediaSearchRequestSerializer(PaginatedRequestSerializer):
         "unstable__authority",
         "unstable__authority_boost",
         "unstable__include_sensitive_results",
+        "unstable__cursor",
     ]
     field_names.extend(PaginatedRequestSerializer.field_names)
     """
@@ -318,6 +322,17 @@ class MediaSearchRequestSerializer(PaginatedRequestSerializer):
         required=False,
         default=False,
     )
+    unstable__cursor = serializers.CharField(
+        source="cursor",
+        label="cursor",
+        help_text=f"{UNSTABLE_WARNING}The position from which to retrieve the next "
+        "page of results. Pass an empty value to get the first page with a cursor, "
+        "then pass the `next_cursor` of each response to get the following page. "
+        "Results stay consistent across the pages of a cursor. Cannot be used with "
+        "`page`.",
+        required=False,
+        allow_blank=True,
+    )
 
     # The ``internal__`` prefix is used in the query params.
     # If you rename these fields, update the following references:
@@ -427,7 +442,9 @@ class MediaSearchRequestSerializer(PaginatedRequestSerializer):
         This function validates the source and excluded_source fields, but `excluded_source`
         is ignored for collection requests.
         """
-        allowed_sources = list(search_controller.get_sources(self.media_type).keys())
+        allowed_sources = list(
+            search_controller.get_available_sources(self.media_type).keys()
+        )
         sources_list = ", ".join([f"'{s}'" for s in allowed_sources])
         collection = self.initial_data.get(COLLECTION)
 
@@ -511,6 +528,26 @@ class MediaSearchRequestSerializer(PaginatedRequestSerializer):
 
         return self.initial_data.get("mature") or value
 
+    def validate_unstable__cursor(self, value):
+        if "page" in self.initial_data:
+            raise serializers.ValidationError(
+                "`page` and `unstable__cursor` must not both be defined."
+            )
+
+        params_hash = SearchCursor.hash_params(self.initial_data, self.media_type)
+        if not value:
+            return SearchCursor(params_hash=params_hash)
+
+        try:
+            cursor = SearchCursor.decode(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+        if cursor.params_hash != params_hash:
+            raise serializers.ValidationError(
+                "The cursor was made for different query parameters."
+            )
+        return cursor
+
     def validate_internal__index(self, value):
         """
         Check whether the given index name is a valid index or alias. However,
@@ -536,6 +573,9 @@ class MediaSearchRequestSerializer(PaginatedRequestSerializer):
         return value.lower()
 
     def validate(self, data):
+        if cursor := data.get("cursor"):
+            # The pagination depth of a cursor is that of its page
+            data["page"] = cursor.page
         data = super().validate(data)
         errors = {}
         for param, successor in self.deprecated_params:
@@ -778,6 +818,18 @@ class MediaSerializer(BaseModelSerializer):
 
         return result
 
+    @cached_property
+    def serialization_plan(self) -> SerializationPlan:
+        """
+        Get the plan for serializing objects with the fields of this serializer.
+
+        The plan is built on first use, so that it reflects any fields removed
+        after the serializer was initialised, and is then reused for every
+        object rendered by this serializer, such as every result on a page.
+        """
+
+        return SerializationPlan(self)
+
     def to_representation(self, *args, **kwargs):
         # This serializer adapts both ES Hits *and* Media instances. Currently,
         # ES has a `mature` field on it which represents if maturity was present on
@@ -789,7 +841,10 @@ class MediaSerializer(BaseModelSerializer):
         if isinstance(obj, Hit):
             obj.sensitive = obj.mature
 
-        output = super().to_representation(*args, **kwargs)
+        if settings.USE_SERIALIZATION_PLAN:
+            output = self.serialization_plan.serialize(obj)
+        else:
+            output = super().to_representation(*args, **kwargs)
 
         # Ensure lists are ``[]`` instead of ``None``
         # TODO: These fields are still marked 'Nullable' in the API docs
@@ -803,7 +858,7 @@ class MediaSerializer(BaseModelSerializer):
 
         if output.get("license_url") is None:
             try:
-                lic = License(output["license"], output["license_version"])
+                lic = License.interned(output["license"], output["license_version"])
                 output["license_url"] = lic.url
             except ValueError:
                 pass
@@ -0,0 +1,235 @@
+"""
+Precompiled serialisation plans for response serializers.
+
+DRF's ``Serializer.to_representation`` resolves every field through generic
+machinery for every object: it walks the field mapping through a generator,
+resolves each source through ``get_attribute`` and reverses a URL for every
+hyperlink. For the media serializers, which render many objects with the same
+fields on every search request, most of this work is the same for every object.
+
+A ``SerializationPlan`` classifies the readable fields of a serializer once per
+serializer class and binds a small step function to each field. Hyperlinks are
+reversed once per serializer instance and reused as templates for every object.
+The output of a plan is identical to that of ``Serializer.to_representation``;
+wherever a step cannot guarantee that, it falls back to the generic behaviour of
+DRF for that field.
+"""
+
+import re
+from collections.abc import Callable, Mapping
+from types import SimpleNamespace
+from typing import Any
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.urls import NoReverseMatch
+from rest_framework.fields import Field, SkipField, is_simple_callable
+from rest_framework.relations import Hyperlink, HyperlinkedIdentityField, PKOnlyObject
+from rest_framework.serializers import Serializer
+
+
+SKIP = object()
+"""Sentinel returned by a step when the field must be omitted from the output."""
+
+PLACEHOLDER_IDENTIFIER = "ffffffff-ffff-4fff-bfff-ffffffffffff"
+"""A valid UUID, reversed in place of the identifier of every object."""
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+# Step kinds, see ``SerializationPlan._classify``
+ATTRIBUTE = "attribute"
+INSTANCE = "instance"
+HYPERLINK = "hyperlink"
+GENERIC = "generic"
+
+Step = Callable[[Any], Any]
+
+_compiled_kinds: dict[tuple[type, tuple[str, ...]], tuple[str, ...]] = {}
+"""Step kinds for the fields of each serializer class, keyed by field names."""
+
+
+def _generic_step(field: Field) -> Step:
+    """Serialize a field exactly as ``Serializer.to_representation`` does."""
+
+    def step(instance):
+        try:
+            attribute = field.get_attribute(instance)
+        except SkipField:
+            return SKIP
+
+        check_for_none = (
+            attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        )
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+
+    return step
+
+
+def _attribute_step(field: Field) -> Step:
+    """
+    Serialize a field backed by a single attribute of the object.
+
+    Any case that ``get_attribute`` treats specially, such as missing attributes
+    or callables, is delegated to the generic step.
+    """
+
+    attr = field.source_attrs[0]
+    to_representation = field.to_representation
+    generic = _generic_step(field)
+
+    def step(instance):
+        try:
+            value = getattr(instance, attr)
+        except (AttributeError, KeyError, ObjectDoesNotExist):
+            return generic(instance)
+        if is_simple_callable(value):
+            return generic(instance)
+        if value is None:
+            return None
+        return to_representation(value)
+
+    return step
+
+
+def _instance_step(field: Field) -> Step:
+    """Serialize a field with ``source="*"``, which receives the whole object."""
+
+    to_representation = field.to_representation
+
+    def step(instance):
+        return to_representation(instance)
+
+    return step
+
+
+def _hyperlink_step(field: HyperlinkedIdentityField) -> Step:
+    """
+    Serialize a hyperlink to the object using a URL template.
+
+    The URL is reversed once, for a placeholder identifier, the first time the
+    step runs. The identifier of each object is then substituted into the
+    template, which avoids resolving the URL and rewriting its scheme for every
+    object.
+    """
+
+    lookup_field = field.lookup_field
+    generic = _instance_step(field)
+    template: list[str | None] = []
+
+    def get_template() -> str | None:
+        if not template:
+            template.append(build_template())
+        return template[0]
+
+    def build_template() -> str | None:
+        # Errors are left for the generic step to report
+        if "request" not in field.context:
+            return None
+        request = field.context["request"]
+        format = field.context.get("format")
+        if format and field.format and field.format != format:
+            format = field.format
+        placeholder = SimpleNamespace(**{lookup_field: PLACEHOLDER_IDENTIFIER})
+        try:
+            url = field.get_url(placeholder, field.view_name, request, format)
+        except NoReverseMatch:
+            return None
+        # The template is only usable if the identifier appears exactly once
+        if url is None or url.count(PLACEHOLDER_IDENTIFIER) != 1:
+            return None
+        return url
+
+    def step(instance):
+        url_template = get_template()
+        if url_template is None:
+            return generic(instance)
+
+        pk = getattr(instance, "pk", SKIP)
+        if pk is not SKIP and pk in (None, ""):
+            return None
+
+        try:
+            lookup_value = str(getattr(instance, lookup_field))
+        except AttributeError:
+            return generic(instance)
+        if not UUID_PATTERN.fullmatch(lookup_value):
+            return generic(instance)
+
+        url = url_template.replace(PLACEHOLDER_IDENTIFIER, lookup_value)
+        return Hyperlink(url, instance)
+
+    return step
+
+
+_STEP_FACTORIES: dict[str, Callable[[Field], Step]] = {
+    ATTRIBUTE: _attribute_step,
+    INSTANCE: _instance_step,
+    HYPERLINK: _hyperlink_step,
+    GENERIC: _generic_step,
+}
+
+
+class SerializationPlan:
+    """
+    A list of steps that turns an object into the same ``dict`` as the
+    ``to_representation`` method of the serializer the plan was built for.
+    """
+
+    def __init__(self, serializer: Serializer):
+        fields = [field for field in serializer.fields.values() if not field.write_only]
+        key = (type(serializer), tuple(field.field_name for field in fields))
+        if (kinds := _compiled_kinds.get(key)) is None:
+            kinds = _compiled_kinds[key] = tuple(map(self._classify, fields))
+
+        self.generic_steps = [
+            (field.field_name, _generic_step(field)) for field in fields
+        ]
+        self.steps = [
+            (field.field_name, _STEP_FACTORIES[kind](field))
+            for field, kind in zip(fields, kinds)
+        ]
+
+    @staticmethod
+    def _classify(field: Field) -> str:
+        """
+        Determine the kind of step to use for a field.
+
+        Fields that customise how their value is looked up, other than the
+        hyperlinks to the object itself, always use the generic step.
+
+        :param field: the bound field to classify
+        :return: the kind of step to use for the field
+        """
+
+        if isinstance(field, HyperlinkedIdentityField):
+            if field.source == "*":
+                return HYPERLINK
+            return GENERIC
+        if type(field).get_attribute is not Field.get_attribute:
+            return GENERIC
+        if field.source == "*":
+            return INSTANCE
+        if len(field.source_attrs) == 1:
+            return ATTRIBUTE
+        return GENERIC
+
+    def serialize(self, instance) -> dict:
+        """
+        Serialize the object by running each step of the plan.
+
+        :param instance: the object to serialize
+        :return: the serialized representation of the object
+        """
+
+        # ``get_attribute`` looks up keys rather than attributes on mappings
+        steps = self.generic_steps if isinstance(instance, Mapping) else self.steps
+
+        output = {}
+        for field_name, step in steps:
+            value = step(instance)
+            if value is not SKIP:
+                output[field_name] = value
+        return output
@@ -133,7 +133,9 @@ async def _make_head_requests(
     return responses.result()
 
 
-def check_dead_links(query_hash: str, start_slice: int, results: list[Hit]) -> None:
+def check_dead_links(
+    query_hash: str | None, start_slice: int, results: list[Hit]
+) -> None:
     """
     Make sure images exist before we display them.
 
@@ -141,7 +143,8 @@ def check_dead_links(query_hash: str, start_slice: int, results: list[Hit]) -> N
     generic "not found" placeholder.
 
     Results are cached in redis and shared amongst all API servers in the
-    cluster.
+    cluster. The dead link mask of the query is updated, unless ``query_hash`` is
+    ``None``.
     """
     if not results:
         logger.info("link_validation_empty_results")
@@ -226,13 +229,14 @@ def check_dead_links(query_hash: str, start_slice: int, results: list[Hit]) -> N
             new_mask[del_idx] = 0
 
     # Merge and cache the new mask
-    mask = get_query_mask(query_hash)
-    if mask:
-        # skip the leading part of the mask that represents results that come before
-        # the results we've verified this time around. Overwrite everything after
-        # with our new results validation mask.
-        new_mask = mask[:start_slice] + new_mask
-    save_query_mask(query_hash, new_mask)
+    if query_hash is not None:
+        mask = get_query_mask(query_hash)
+        if mask:
+            # skip the leading part of the mask that represents results that come
+            # before the results we've verified this time around. Overwrite
+            # everything after with our new results validation mask.
+            new_mask = mask[:start_slice] + new_mask
+        save_query_mask(query_hash, new_mask)
 
     end_time = time.time()
     logger.debug(
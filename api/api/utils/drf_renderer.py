@@ -1,4 +1,9 @@
-from rest_framework.renderers import BrowsableAPIRenderer
+import re
+
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+import orjson
 
 
 class BrowsableAPIRendererWithoutForms(BrowsableAPIRenderer):
@@ -25,3 +30,56 @@ class BrowsableAPIRendererWithoutForms(BrowsableAPIRenderer):
         rendered HTML, so let's simply return an empty string.
         """
         return ""
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renders JSON with ``orjson``, producing the same bytes as ``JSONRenderer``.
+
+    ``orjson`` differs from the standard library in a few ways, each of which is
+    either accounted for or causes the renderer to fall back to ``JSONRenderer``:
+
+    - Objects that ``orjson`` cannot serialize natively, and datetimes, which it
+      formats differently, are passed to DRF's ``JSONEncoder``.
+    - The line and paragraph separators are escaped, as ``JSONRenderer`` does.
+    - Very small or very large floats are written without the exponent or with a
+      different exponent format, so any output that looks like it contains such
+      a float is rendered again with ``JSONRenderer``. Strings containing
+      similar text only cause an unnecessary fallback.
+    - Any error from ``orjson``, such as non-string keys or integers that are
+      too large, is handled by ``JSONRenderer``.
+    - ``NaN`` and infinite floats are written as ``null``, where ``JSONRenderer``
+      refuses to render them at all.
+
+    Indented output, as requested through the ``Accept`` header, is always
+    rendered with ``JSONRenderer``.
+    """
+
+    # Matches numbers that ``orjson`` may format differently from ``json``,
+    # as numbers only ever follow these characters in compact output
+    float_mismatch = re.compile(rb"[:,\[]-?(?:\d+(?:\.\d+)?[eE]|0\.0000)")
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.float_mismatch.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the line and paragraph separators so that the output is valid
+        # JavaScript, as ``JSONRenderer`` does
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
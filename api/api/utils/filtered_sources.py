@@ -0,0 +1,110 @@
+"""
+Keep the sources whose content is hidden in the memory of the process.
+
+To hide the content of a source, set ``filter_content`` to ``True`` on its
+``ContentSource`` in Django admin. Both the search queries and the database
+queries exclude the hidden sources, so they are read from memory rather than
+from the cache or a subquery on every request.
+
+Each process refreshes the hidden sources in the background once they are older
+than ``FILTERED_SOURCE_REGISTRY_TTL`` seconds. Saving or deleting a content source
+also bumps a version of the hidden sources in Redis. Each process compares its
+version with that one at most every ``FILTERED_SOURCES_VERSION_CHECK_INTERVAL``
+seconds, and loads the hidden sources again once the version has changed, so a
+change reaches every process within that time.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+import structlog
+from decouple import config
+from redis.exceptions import ConnectionError
+
+from api.utils.source_registry import SourceRegistry
+
+
+logger = structlog.get_logger(__name__)
+
+# The number of seconds after which each process refreshes the hidden sources
+FILTERED_SOURCE_REGISTRY_TTL = config(
+    "FILTERED_SOURCE_REGISTRY_TTL", cast=int, default=30
+)
+# The number of seconds after which each process checks whether the hidden
+# sources were changed by another process
+FILTERED_SOURCES_VERSION_CHECK_INTERVAL = config(
+    "FILTERED_SOURCES_VERSION_CHECK_INTERVAL", cast=float, default=1
+)
+# The hidden sources are shared by all indices, so they are kept under one key
+FILTERED_SOURCES_KEY = "filtered"
+FILTERED_SOURCES_VERSION_KEY = "filtered-sources-version"
+
+
+def load_filtered_sources(_key: str) -> frozenset[str]:
+    # Imported here because the models connect to ``invalidate_filtered_sources``
+    from api.models.models import ContentSource
+
+    return frozenset(
+        ContentSource.objects.filter(filter_content=True).values_list(
+            "source_identifier", flat=True
+        )
+    )
+
+
+filtered_source_registry: SourceRegistry[frozenset[str]] = SourceRegistry(
+    load_filtered_sources, ttl=FILTERED_SOURCE_REGISTRY_TTL
+)
+
+# The version of the hidden sources in the registry, and when it was last checked
+_version_lock = threading.Lock()
+_version: int | None = None
+_version_checked_at = float("-inf")
+
+
+def _check_version():
+    """Forget the hidden sources if another process has changed them."""
+
+    global _version, _version_checked_at
+
+    now = time.monotonic()
+    with _version_lock:
+        if now - _version_checked_at < FILTERED_SOURCES_VERSION_CHECK_INTERVAL:
+            return
+        _version_checked_at = now
+
+    try:
+        version = cache.get(FILTERED_SOURCES_VERSION_KEY, 0)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot get hidden sources version.")
+        return
+
+    with _version_lock:
+        if version != _version:
+            _version = version
+            filtered_source_registry.clear()
+
+
+def get_filtered_sources() -> frozenset[str]:
+    """
+    Get the sources whose content is hidden.
+
+    :return: the identifiers of the hidden sources
+    """
+
+    _check_version()
+    return filtered_source_registry.get(FILTERED_SOURCES_KEY)
+
+
+def invalidate_filtered_sources():
+    """
+    Load the hidden sources again on next use, e.g. after a source is changed, in
+    this process at once and in the others after their next version check.
+    """
+
+    filtered_source_registry.clear()
+    try:
+        cache.incr(FILTERED_SOURCES_VERSION_KEY, ignore_key_check=True)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot bump hidden sources version.")
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+
+import django_redis
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+
+class ServiceUnhealthy(Exception):
+    """Raised by a health check, with a message describing the problem."""
+
+
+def check_db() -> None:
+    """Check that the database is available."""
+
+    try:
+        # The monitor thread keeps its connection between checks, so it must be
+        # replaced if it has been lost
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+        connection.ensure_connection()
+    except Exception as err:
+        raise ServiceUnhealthy(f"postgres: {err}")
+
+
+def check_es() -> None:
+    """Check that the Elasticsearch cluster is healthy."""
+
+    es_health = settings.ES.cluster.health(timeout="5s")
+
+    if es_health["timed_out"]:
+        raise ServiceUnhealthy("elasticsearch: es_timed_out")
+
+    if (es_status := es_health["status"]) != "green":
+        raise ServiceUnhealthy(f"elasticsearch: es_status_{es_status}")
+
+
+def check_redis() -> None:
+    """Check that Redis is available."""
+
+    try:
+        django_redis.get_redis_connection("default").ping()
+    except Exception as err:
+        raise ServiceUnhealthy(f"redis: {err}")
+
+
+HEALTH_CHECKS: dict[str, Callable[[], None]] = {
+    "postgres": check_db,
+    "elasticsearch": check_es,
+    "redis": check_redis,
+}
+
+
+@dataclass(frozen=True)
+class ServiceHealth:
+    error: str | None
+    """the description of the problem with the service, ``None`` if healthy"""
+
+    checked_at: float
+    """the ``time.monotonic`` time of the check"""
+
+    @property
+    def age(self) -> float:
+        """Get the number of seconds since the check."""
+
+        return time.monotonic() - self.checked_at
+
+
+class HealthMonitor:
+    """
+    Check the health of the services used by the API at a fixed interval, in a
+    background thread, and keep the result of the last check of each service.
+
+    Health check requests are served this snapshot, so that they do not wait on the
+    services, and do not make a call to Elasticsearch each. The first request checks
+    every service, if they have not been checked yet, and starts the thread.
+
+    :param checks: the function checking each service, which raises
+    ``ServiceUnhealthy`` if the service is not healthy
+    :param interval: the number of seconds between the checks of all services
+    """
+
+    def __init__(self, checks: dict[str, Callable[[], None]], interval: float):
+        self.checks = checks
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._snapshot: dict[str, ServiceHealth] = {}
+
+    def snapshot(self) -> dict[str, ServiceHealth]:
+        """Get the result of the last check of each service."""
+
+        with self._lock:
+            if self._thread is None:
+                self.check()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self._snapshot
+
+    def check(self):
+        """Check each service, and update the snapshot with the results."""
+
+        for service, check in self.checks.items():
+            try:
+                check()
+                error = None
+            except ServiceUnhealthy as err:
+                error = str(err)
+            except Exception as err:
+                error = f"{service}: {err}"
+            if error:
+                logger.warning("Service is unhealthy.", service=service, error=error)
+            # Replace rather than update the snapshot, so that it can be read while
+            # the checks are running
+            self._snapshot = self._snapshot | {
+                service: ServiceHealth(error=error, checked_at=time.monotonic())
+            }
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+
+health_monitor = HealthMonitor(HEALTH_CHECKS, interval=settings.HEALTH_CHECK_INTERVAL)
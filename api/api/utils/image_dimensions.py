@@ -0,0 +1,187 @@
+"""
+Determine the dimensions of remote images without downloading them entirely.
+
+The width and height of JPEG, PNG, GIF and WebP images are stored in the first
+few bytes of the file, or, for JPEG, in the first frame header after the
+metadata segments. Only that prefix of the file is requested from upstream,
+using a range request, and the response stream is abandoned as soon as the
+dimensions can be parsed.
+"""
+
+import asyncio
+import io
+import struct
+
+import aiohttp
+import structlog
+from PIL import Image as PILImage
+
+
+logger = structlog.get_logger(__name__)
+
+PROBE_CHUNK_SIZE = 8 * 1024
+"""The number of bytes read from the response stream between parse attempts."""
+
+MAX_PROBE_BYTES = 256 * 1024
+"""
+The most bytes read from upstream. This is generous enough for JPEG files with
+large embedded EXIF thumbnails or ICC profiles before the frame header.
+"""
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+_VP8_START_CODE = b"\x9d\x01\x2a"
+
+# JPEG markers that are not followed by a length field
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xDA)})
+# Start-of-frame markers, excluding DHT (C4), JPG (C8) and DAC (CC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _png_dimensions(data: bytes) -> tuple[int, int] | None:
+    # The IHDR chunk is always the first chunk after the signature
+    if len(data) < 24 or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def _gif_dimensions(data: bytes) -> tuple[int, int] | None:
+    if len(data) < 10:
+        return None
+    return struct.unpack("<HH", data[6:10])
+
+
+def _webp_dimensions(data: bytes) -> tuple[int, int] | None:
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        # Lossy, the key frame header follows the 3-byte frame tag
+        if len(data) < 30 or data[23:26] != _VP8_START_CODE:
+            return None
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        # Lossless, 14-bit dimensions minus one packed after the signature byte
+        if len(data) < 25 or data[20] != 0x2F:
+            return None
+        (bits,) = struct.unpack("<I", data[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        # Extended, 24-bit canvas dimensions minus one
+        if len(data) < 30:
+            return None
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _jpeg_dimensions(data: bytes) -> tuple[int, int] | None:
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before the marker
+            offset += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+            continue
+        if marker == 0xDA:
+            # Start of scan without a preceding frame header
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+            return width, height
+        (length,) = struct.unpack(">H", data[offset + 2 : offset + 4])
+        offset += 2 + length
+    return None
+
+
+def parse_dimensions(data: bytes) -> tuple[int, int] | None:
+    """
+    Parse the width and height of an image from the leading bytes of its file.
+
+    :param data: the leading bytes of the image file
+    :return: the width and height of the image, or ``None`` if the format is not
+        recognised or more bytes are needed to find the dimensions
+    """
+
+    if data.startswith(_PNG_SIGNATURE):
+        dimensions = _png_dimensions(data)
+    elif data.startswith(_GIF_SIGNATURES):
+        dimensions = _gif_dimensions(data)
+    elif data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+        dimensions = _webp_dimensions(data)
+    elif data.startswith(b"\xff\xd8"):
+        dimensions = _jpeg_dimensions(data)
+    else:
+        dimensions = None
+
+    if dimensions is None or not all(dimensions):
+        return None
+    return dimensions
+
+
+def _pil_dimensions(data: bytes) -> tuple[int, int] | None:
+    """
+    Read the dimensions of formats that ``parse_dimensions`` does not support.
+
+    Pillow only reads the header of the file when opening it, so this works on
+    the truncated prefix of most images.
+    """
+
+    try:
+        with PILImage.open(io.BytesIO(data)) as image_file:
+            return image_file.size
+    except Exception:
+        return None
+
+
+async def probe_dimensions(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, int] | None:
+    """
+    Determine the dimensions of the image at the given URL.
+
+    The response is read in chunks until the dimensions can be parsed from the
+    bytes received so far. Upstreams that ignore the range request and respond
+    with the entire file are handled the same way, as the rest of the response
+    is never read.
+
+    :param session: the session with which to make the request
+    :param url: the URL of the image file
+    :param headers: additional headers to send with the request
+    :return: the width and height of the image, or ``None`` if they could not
+        be determined
+    """
+
+    headers = (headers or {}) | {"Range": f"bytes=0-{MAX_PROBE_BYTES - 1}"}
+    data = b""
+
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status >= 400:
+                logger.warning(
+                    "Could not probe image dimensions",
+                    url=url,
+                    status=response.status,
+                )
+                return None
+
+            async for chunk in response.content.iter_chunked(PROBE_CHUNK_SIZE):
+                data += chunk
+                if dimensions := parse_dimensions(data):
+                    return dimensions
+                if len(data) >= MAX_PROBE_BYTES:
+                    break
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        logger.warning("Could not probe image dimensions", url=url, exc=exc)
+        return None
+
+    return _pil_dimensions(data)
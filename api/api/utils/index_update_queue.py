@@ -0,0 +1,172 @@
+"""
+Coalesce the Elasticsearch updates made by moderation into bulk requests.
+
+Every sensitive or deleted media object that is saved updates its document in
+both the main and the filtered index. Outside of a queue, each update is sent
+and refreshed immediately. Within ``index_update_queue``, updates are collected
+instead and sent when the outermost queue exits, as one bulk request per index
+followed by at most one refresh of the updated indexes.
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+import structlog
+from elasticsearch import Elasticsearch, helpers
+
+from api.utils.search_response_cache import bump_content_epoch
+
+
+logger = structlog.get_logger(__name__)
+
+_current_queue: ContextVar["IndexUpdateQueue | None"] = ContextVar(
+    "index_update_queue", default=None
+)
+
+
+class IndexUpdateQueue:
+    """Collects Elasticsearch bulk actions, grouped by index."""
+
+    def __init__(self, refresh: bool = True):
+        self.refresh = refresh
+        self.failures: list[dict] = []
+        self._actions: dict[str, list[dict]] = {}
+
+    def __len__(self):
+        return sum(len(actions) for actions in self._actions.values())
+
+    def add(
+        self,
+        method: str,
+        indexes: Iterable[str],
+        document_ids: Iterable[str],
+        **es_method_args,
+    ):
+        """
+        Queue ``method`` for each of the documents in each of the indexes.
+
+        :param method: the bulk operation type, e.g. ``update`` or ``delete``
+        :param indexes: the indexes in which to update the documents
+        :param document_ids: the ``_id`` of each document to update
+        :param es_method_args: additional fields of the bulk actions
+        """
+
+        # Evaluate lazy iterables, like querysets, before the data changes
+        document_ids = list(document_ids)
+        for index in indexes:
+            self._actions.setdefault(index, []).extend(
+                {
+                    "_op_type": method,
+                    "_index": index,
+                    "_id": document_id,
+                    **es_method_args,
+                }
+                for document_id in document_ids
+            )
+
+    def flush(self) -> list[dict]:
+        """
+        Send the queued actions, as one bulk request per index.
+
+        Missing documents are logged and otherwise ignored, which is expected
+        for the filtered index. Any other failed action is recorded in
+        ``failures``.
+
+        :return: the bulk response items of the actions that failed
+        """
+
+        es: Elasticsearch = settings.ES
+        actions, self._actions = self._actions, {}
+        updated_indexes = []
+        failures = []
+
+        for index, index_actions in actions.items():
+            if not index_actions:
+                continue
+            updated = False
+            for ok, item in helpers.streaming_bulk(
+                es,
+                index_actions,
+                chunk_size=len(index_actions),
+                raise_on_error=False,
+            ):
+                if ok:
+                    updated = True
+                    continue
+                ((method, result),) = item.items()
+                if result.get("status") == 404:
+                    logger.warning(
+                        f"Document with _id {result.get('_id')} not found "
+                        f"in {index} index. No update performed."
+                    )
+                    continue
+                logger.error(
+                    "Failed to update document.",
+                    method=method,
+                    index=index,
+                    id=result.get("_id"),
+                    status=result.get("status"),
+                    error=result.get("error"),
+                )
+                failures.append(item)
+            if updated:
+                updated_indexes.append(index)
+
+        if self.refresh and updated_indexes:
+            es.indices.refresh(index=updated_indexes)
+        if updated_indexes:
+            bump_content_epoch()
+
+        self.failures.extend(failures)
+        return failures
+
+
+def get_current_queue() -> IndexUpdateQueue | None:
+    """Get the queue collecting updates in the current context, if any."""
+
+    return _current_queue.get()
+
+
+@contextmanager
+def index_update_queue(
+    refresh: bool = True,
+    raise_on_error: bool = True,
+) -> Iterator[IndexUpdateQueue]:
+    """
+    Collect the index updates made within the block and send them on exit.
+
+    Nested blocks share the outermost queue, which is the only one to send the
+    updates. The updates are sent even if the block raises, because database
+    changes made before the exception may already be committed.
+
+    :param refresh: whether to refresh the updated indexes after the updates
+    :param raise_on_error: whether to raise ``BulkIndexError`` if any update
+        fails; if not, failures are available in ``failures`` of the queue
+    :return: a context manager yielding the queue
+    """
+
+    if (queue := _current_queue.get()) is not None:
+        yield queue
+        return
+
+    queue = IndexUpdateQueue(refresh=refresh)
+    token = _current_queue.set(queue)
+    try:
+        yield queue
+    except BaseException:
+        _current_queue.reset(token)
+        try:
+            queue.flush()
+        except Exception as exc:
+            logger.error("Failed to send queued index updates.", exc=exc)
+        raise
+    _current_queue.reset(token)
+
+    failures = queue.flush()
+    if failures and raise_on_error:
+        raise helpers.BulkIndexError(
+            f"{len(failures)} document(s) failed to update.", failures
+        )
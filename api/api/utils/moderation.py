@@ -18,6 +18,8 @@ from api.models.image import (
     SensitiveImage,
 )
 from api.models.media import AbstractDeletedMedia, AbstractMedia, AbstractSensitiveMedia
+from api.utils.index_update_queue import index_update_queue
+from api.utils.search_context import evict_sensitivity
 
 
 logger = structlog.get_logger(__name__)
@@ -48,7 +50,7 @@ def perform_moderation(
     :param request: the request used to determine the moderator
     :param media_type: the type of media being bulk-moderated
     :param mod_objects: a ``QuerySet`` of media items to bulk-moderate
-    :para action: the action of the bulk moderation decision
+    :param action: the action of the bulk moderation decision
     """
 
     match media_type:
@@ -80,38 +82,52 @@ def perform_moderation(
         identifiers=identifiers,
     )
 
-    match action:
-        case DecisionAction.MARKED_SENSITIVE:
-            created = SensitiveMedia.objects.bulk_create(
-                [SensitiveMedia(media_obj_id=identifier) for identifier in identifiers]
-            )
-            logger.debug(f"Created sensitive-{media_type} items.", count=len(created))
-            SensitiveMedia.bulk_perform_action(True, mod_objects)
-
-        case DecisionAction.DEINDEXED_COPYRIGHT | DecisionAction.DEINDEXED_SENSITIVE:
-            created = DeletedMedia.objects.bulk_create(
-                [DeletedMedia(media_obj_id=identifier) for identifier in identifiers]
-            )
-            logger.debug(f"Created deleted-{media_type} items.", count=len(created))
-            DeletedMedia.bulk_perform_action(mod_objects)
-
-        case DecisionAction.REVERSED_MARK_SENSITIVE:
-            media_items = Media.objects.filter(identifier__in=identifiers)
-            SensitiveMedia.bulk_perform_action(False, media_items)
-            logger.debug(
-                f"Unmarked {media_type} items as sensitive.",
-                identifier_count=len(identifiers),
-                media_item_count=len(media_items),
-            )
-
-            count, _ = mod_objects.delete()
-            logger.debug(f"Deleted sensitive-{media_type} items.", count=count)
-
-        case DecisionAction.REVERSED_DEINDEX:
-            # There is no bulk action for reversed-deindex. The media
-            # item will eventually be reindexed through data refresh.
-            count, _ = mod_objects.delete()
-            logger.debug(f"Deleted deleted-{media_type} items.", count=count)
+    # Send the index updates of the whole operation in bulk, once it is done
+    with index_update_queue():
+        match action:
+            case DecisionAction.MARKED_SENSITIVE:
+                created = SensitiveMedia.objects.bulk_create(
+                    [
+                        SensitiveMedia(media_obj_id=identifier)
+                        for identifier in identifiers
+                    ]
+                )
+                logger.debug(
+                    f"Created sensitive-{media_type} items.", count=len(created)
+                )
+                SensitiveMedia.bulk_perform_action(True, mod_objects)
+
+            case (
+                DecisionAction.DEINDEXED_COPYRIGHT | DecisionAction.DEINDEXED_SENSITIVE
+            ):
+                created = DeletedMedia.objects.bulk_create(
+                    [
+                        DeletedMedia(media_obj_id=identifier)
+                        for identifier in identifiers
+                    ]
+                )
+                logger.debug(f"Created deleted-{media_type} items.", count=len(created))
+                DeletedMedia.bulk_perform_action(mod_objects)
+
+            case DecisionAction.REVERSED_MARK_SENSITIVE:
+                media_items = Media.objects.filter(identifier__in=identifiers)
+                SensitiveMedia.bulk_perform_action(False, media_items)
+                logger.debug(
+                    f"Unmarked {media_type} items as sensitive.",
+                    identifier_count=len(identifiers),
+                    media_item_count=len(media_items),
+                )
+
+                count, _ = mod_objects.delete()
+                logger.debug(f"Deleted sensitive-{media_type} items.", count=count)
+
+            case DecisionAction.REVERSED_DEINDEX:
+                # There is no bulk action for reversed-deindex. The media
+                # item will eventually be reindexed through data refresh.
+                count, _ = mod_objects.delete()
+                logger.debug(f"Deleted deleted-{media_type} items.", count=count)
+
+    evict_sensitivity(SensitiveMedia.es_index, identifiers)
 
     media_decision = MediaDecision.objects.create(
         action=action,
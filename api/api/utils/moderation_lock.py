@@ -5,10 +5,10 @@ import django_redis
 import structlog
 from redis.exceptions import ConnectionError
 
-from api.models.moderation import get_moderators
 
-
-LOCK_PREFIX = "moderation_lock"
+# Locks were formerly kept in a key per moderator, ``moderation_lock:<username>``,
+# which the ``deletelegacymoderationlocks`` command deletes.
+LOCKS_KEY = "moderation_locks"
 TTL = 10  # seconds
 
 logger = structlog.get_logger(__name__)
@@ -27,7 +27,13 @@ def handle_redis_exception(func):
 
 class LockManager:
     """
-    Kudos to this Google Group discussion for the solution using a
+    Keep the soft-locks of all moderators in a single ranked-set, where each
+    member is a moderator and a media item, ranked by the expiration time of the
+    lock.
+
+    Expired locks are deleted with a single range removal before each read, so
+    every operation takes one round-trip to Redis, however many moderators there
+    are. Kudos to this Google Group discussion for the solution using a
     ranked-set:
     https://web.archive.org/web/20211205091916/https://groups.google.com/g/redis-db/c/rXXMCLNkNSs
     """
@@ -35,6 +41,10 @@ class LockManager:
     def __init__(self, media_type):
         self.media_type = media_type
 
+    def _member(self, username, object_id) -> str:
+        # Usernames cannot contain colons, so the first one ends the username.
+        return f"{username}:{self.media_type}:{object_id}"
+
     @handle_redis_exception
     def prune(self) -> dict[str, set[str]]:
         """
@@ -45,21 +55,19 @@ class LockManager:
         """
 
         redis = django_redis.get_redis_connection("default")
-        valid_locks = {}
 
         now = int(time.time())
-        pipe = redis.pipeline()
-        for username in get_moderators().values_list("username", flat=True):
-            key = f"{LOCK_PREFIX}:{username}"
-            for value, score in redis.zrange(key, 0, -1, withscores=True):
-                if score <= now:
-                    logger.info("Deleting expired lock", key=key, value=value)
-                    pipe.zrem(key, value)
-                else:
-                    logger.info("Keeping valid lock", key=key, value=value)
-                    valid_locks.setdefault(username, set()).add(value.decode())
-        pipe.execute()
+        with redis.pipeline() as pipe:
+            pipe.zremrangebyscore(LOCKS_KEY, "-inf", now)
+            pipe.zrange(LOCKS_KEY, 0, -1)
+            expired_count, members = pipe.execute()
+        if expired_count:
+            logger.info("Deleted expired locks", count=expired_count)
 
+        valid_locks = {}
+        for member in members:
+            username, object = member.decode().split(":", 1)
+            valid_locks.setdefault(username, set()).add(object)
         return valid_locks
 
     @handle_redis_exception
@@ -77,7 +85,7 @@ class LockManager:
 
         expiration = int(time.time()) + TTL
         logger.info("Adding lock", object=object, user=username, expiration=expiration)
-        redis.zadd(f"{LOCK_PREFIX}:{username}", {object: expiration})
+        redis.zadd(LOCKS_KEY, {self._member(username, object_id): expiration})
         return expiration
 
     @handle_redis_exception
@@ -94,7 +102,7 @@ class LockManager:
         object = f"{self.media_type}:{object_id}"
 
         logger.info("Removing lock", object=object, user=username)
-        redis.zrem(f"{LOCK_PREFIX}:{username}", object)
+        redis.zrem(LOCKS_KEY, self._member(username, object_id))
 
     def moderator_set(self, object_id) -> set[str]:
         """
@@ -111,6 +119,20 @@ class LockManager:
         logger.info("Retrieved moderators", object=object, mods=mods)
         return mods
 
+    def object_set(self, username) -> set[str]:
+        """
+        Get the list of media items a particular moderator is viewing.
+
+        :param username: the username of the moderator
+        :return: the list of media items, of any media type, the moderator is on
+        """
+
+        valid_locks = self.prune() or {}
+
+        objects = valid_locks.get(username, set())
+        logger.info("Retrieved objects", user=username, objects=objects)
+        return objects
+
     @handle_redis_exception
     def score(self, username, object_id) -> int:
         """
@@ -124,6 +146,6 @@ class LockManager:
         redis = django_redis.get_redis_connection("default")
 
         object = f"{self.media_type}:{object_id}"
-        score = redis.zscore(f"{LOCK_PREFIX}:{username}", object)
+        score = redis.zscore(LOCKS_KEY, self._member(username, object_id))
         logger.info("Retrieved score", object=object, user=username, score=score)
         return score
@@ -0,0 +1,150 @@
+"""
+Keep the related media of the most requested items precomputed.
+
+Related media are requested on every detail page, but the related media of an
+item only change when the index is rebuilt. The ``precomputerelated`` management
+command computes them for the items with the most related requests in the
+current and previous weeks, and stores the identifier, URL and provider of each
+result keyed by the item and the concrete filtered index they were computed
+against. Promoting a new index therefore makes all the stored lists unreachable,
+and the related media of any item without a stored list are queried live. The
+stored results are checked for dead links again whenever they are served.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+import django_redis
+import structlog
+from django_redis.client.default import Redis
+from redis.exceptions import ConnectionError
+
+from api.constants.media_types import OriginIndex
+from api.utils.search_context import get_filtered_index_name
+from api.utils.tallies import get_weekly_timestamp
+
+
+logger = structlog.get_logger(__name__)
+
+REQUESTS_TIMEOUT = 60 * 60 * 24 * 14  # 2 weeks
+
+
+def _get_requests_key(origin_index: OriginIndex, week: str) -> str:
+    return f"related_media_requests:{origin_index}:{week}"
+
+
+def _get_related_key(
+    origin_index: OriginIndex, index_name: str, identifier: str
+) -> str:
+    return f"related-media:{origin_index}:{index_name}:{identifier}"
+
+
+def record_request(origin_index: OriginIndex, identifier: str):
+    """
+    Count a request for the related media of an item.
+
+    :param origin_index: the origin index of the item, such as ``'image'``
+    :param identifier: the identifier of the item
+    """
+
+    tallies: Redis = django_redis.get_redis_connection("tallies")
+    key = _get_requests_key(origin_index, get_weekly_timestamp())
+    with tallies.pipeline() as pipe:
+        pipe.zincrby(key, 1, identifier)
+        pipe.expire(key, REQUESTS_TIMEOUT)
+        try:
+            pipe.execute()
+        except ConnectionError:
+            logger.warning("Redis connect failed, cannot count related request.")
+
+
+def get_most_requested(origin_index: OriginIndex, count: int) -> list[str]:
+    """
+    Get the items with the most related requests in the current and previous
+    weeks, so that the ranking does not reset at the start of each week.
+
+    :param origin_index: the origin index of the items, such as ``'image'``
+    :param count: the maximum number of items to get
+    :return: the identifiers of the items, the most requested first
+    """
+
+    tallies: Redis = django_redis.get_redis_connection("tallies")
+    week = get_weekly_timestamp()
+    previous_week = get_weekly_timestamp(weeks_ago=1)
+    keys = [
+        _get_requests_key(origin_index, week),
+        _get_requests_key(origin_index, previous_week),
+    ]
+    union_key = f"{keys[0]}:union"
+    with tallies.pipeline() as pipe:
+        pipe.zunionstore(union_key, keys)
+        pipe.zrevrange(union_key, 0, count - 1)
+        pipe.delete(union_key)
+        _, identifiers, _ = pipe.execute()
+    return [identifier.decode() for identifier in identifiers]
+
+
+def get_related_results(
+    origin_index: OriginIndex, identifier: str
+) -> list[dict[str, str]] | None:
+    """
+    Get the precomputed related media of an item.
+
+    :param origin_index: the origin index of the item, such as ``'image'``
+    :param identifier: the identifier of the item
+    :return: the ``identifier``, ``url`` and ``provider`` of the related media,
+    ``None`` if they must be queried live
+    """
+
+    if (index_name := get_filtered_index_name(origin_index)) is None:
+        return None
+
+    try:
+        return cache.get(_get_related_key(origin_index, index_name, identifier))
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot get precomputed related media.")
+        return None
+
+
+def set_related_results(
+    origin_index: OriginIndex,
+    index_name: str,
+    related: dict[str, list[dict[str, str]]],
+):
+    """
+    Store the precomputed related media of several items.
+
+    :param origin_index: the origin index of the items, such as ``'image'``
+    :param index_name: the concrete filtered index the related media were
+    computed against
+    :param related: the ``identifier``, ``url`` and ``provider`` of the related
+    media of each item
+    """
+
+    cache.set_many(
+        {
+            _get_related_key(origin_index, index_name, identifier): related_results
+            for identifier, related_results in related.items()
+        },
+        timeout=settings.RELATED_MEDIA_CACHE_TTL,
+    )
+
+
+def get_missing_identifiers(
+    origin_index: OriginIndex, index_name: str, identifiers: list[str]
+) -> list[str]:
+    """
+    Get the items whose related media are not yet precomputed for the index.
+
+    :param origin_index: the origin index of the items, such as ``'image'``
+    :param index_name: the concrete filtered index
+    :param identifiers: the identifiers of the items
+    :return: the identifiers of the items without precomputed related media
+    """
+
+    keys = {
+        _get_related_key(origin_index, index_name, identifier): identifier
+        for identifier in identifiers
+    }
+    existing = cache.get_many(list(keys))
+    return [identifier for key, identifier in keys.items() if key not in existing]
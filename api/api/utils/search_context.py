@@ -1,14 +1,90 @@
+import time
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
 from typing import Self
 
 from django.conf import settings
+from django.core.cache import cache
 
+import structlog
+from elasticsearch import NotFoundError
 from elasticsearch_dsl import Q, Search
+from redis.exceptions import ConnectionError
 
 from api.constants.media_types import OriginIndex
 from api.controllers.elasticsearch.helpers import get_es_response
 
 
+logger = structlog.get_logger(__name__)
+
+SENSITIVITY_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+INDEX_NAME_TTL = 60  # 1 minute
+
+# The concrete indices behind each alias, with the ``time.monotonic`` time at which
+# they were resolved
+_index_names: dict[str, tuple[float, str]] = {}
+
+
+def get_index_name(alias: str) -> str | None:
+    """
+    Get the name of the concrete index, or indices, behind an index alias.
+
+    The name is kept in the memory of the process for ``INDEX_NAME_TTL`` seconds,
+    so that a new index is noticed soon after it is promoted.
+
+    :param alias: the index alias, such as ``'image'``
+    :return: the names of the indices, joined by commas, or ``None`` if there is
+    no index with the given name
+    """
+
+    entry = _index_names.get(alias)
+    if entry is not None and time.monotonic() - entry[0] < INDEX_NAME_TTL:
+        return entry[1]
+
+    try:
+        resolved = settings.ES.indices.resolve_index(name=alias)
+    except NotFoundError:
+        return None
+    name = ",".join(sorted(index["name"] for index in resolved["indices"]))
+    _index_names[alias] = (time.monotonic(), name)
+    return name
+
+
+def get_filtered_index_name(origin_index: OriginIndex) -> str | None:
+    """
+    Get the name of the index behind the filtered alias of the origin index.
+
+    :param origin_index: the origin index, such as ``'image'``
+    :return: the name of the filtered index, or ``None`` if there is none
+    """
+
+    return get_index_name(f"{origin_index}-filtered")
+
+
+def _get_sensitivity_cache_key(origin_index: OriginIndex, identifier: str) -> str:
+    return f"sensitive-text:{origin_index}:{identifier}"
+
+
+def evict_sensitivity(origin_index: OriginIndex, identifiers: Iterable[str]):
+    """
+    Remove the cached sensitivity of the given results, e.g. after moderation.
+
+    :param origin_index: the origin index of the results, such as ``'image'``
+    :param identifiers: the identifiers of the results
+    """
+
+    keys = [
+        _get_sensitivity_cache_key(origin_index, str(identifier))
+        for identifier in identifiers
+    ]
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot evict cached sensitivity.")
+
+
 @dataclass
 class SearchContext:
     # Note: These sets use "identifiers" very explicitly
@@ -60,6 +136,49 @@ class SearchContext:
             sensitive_text_result_identifiers=sensitive_text_result_identifiers,
         )
 
+    @classmethod
+    def build_for_result(cls, identifier: str, origin_index: OriginIndex) -> Self:
+        """
+        Build the context of a single result, e.g. for a detail view.
+
+        Whether the result has sensitive text only changes when the filtered index is
+        rebuilt or the result is moderated, so it is cached per result. The cached
+        value is bound to the name of the filtered index, so it is ignored once a new
+        filtered index is promoted, and moderation evicts the cached values of its
+        results with ``evict_sensitivity``.
+
+        :param identifier: the identifier of the result
+        :param origin_index: the origin index of the result, such as ``'image'``
+        """
+
+        if not settings.ENABLE_FILTERED_INDEX_QUERIES:
+            return cls([identifier], set())
+
+        if (filtered_index := get_filtered_index_name(origin_index)) is None:
+            return cls.build([identifier], origin_index)
+
+        cache_key = _get_sensitivity_cache_key(origin_index, identifier)
+        try:
+            cached = cache.get(cache_key)
+        except ConnectionError:
+            logger.warning("Redis connect failed, cannot get cached sensitivity.")
+            return cls.build([identifier], origin_index)
+
+        if cached is not None and cached[0] == filtered_index:
+            return cls([identifier], {identifier} if cached[1] else set())
+
+        search_context = cls.build([identifier], origin_index)
+        is_sensitive = identifier in search_context.sensitive_text_result_identifiers
+        try:
+            cache.set(
+                cache_key,
+                (filtered_index, is_sensitive),
+                timeout=SENSITIVITY_CACHE_TIMEOUT,
+            )
+        except ConnectionError:
+            logger.warning("Redis connect failed, cannot cache sensitivity.")
+        return search_context
+
     def asdict(self):
         """
         Cast the object to a dict.
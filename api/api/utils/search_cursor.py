@@ -0,0 +1,85 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, replace
+from typing import Self
+
+from django.core import signing
+
+
+# The query params which may change between the pages of a cursor
+CURSOR_PARAMS = {"unstable__cursor", "page", "page_size"}
+CURSOR_SALT = "api.utils.search_cursor"
+
+
+class ExpiredCursorError(Exception):
+    """The point in time of a cursor has expired, or does not exist."""
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    The position of a client in a sequence of search result pages.
+
+    Cursors are given to clients as opaque, signed tokens, so that they cannot be
+    altered to skip the pagination depth limits or to read another point in time.
+    """
+
+    params_hash: str
+    """the hash of the query params of the search, see ``hash_params``"""
+
+    page: int = 1
+    """the number of the page at the position of the cursor"""
+
+    pit_id: str | None = None
+    """the ID of the Elasticsearch point in time, ``None`` for the first page"""
+
+    search_after: list | None = None
+    """the sort values of the last hit examined, ``None`` for the first page"""
+
+    @staticmethod
+    def hash_params(query_params, media_type: str) -> str:
+        """
+        Hash the query params of a search, except for those of the pagination.
+
+        :param query_params: the query params of the request
+        :param media_type: the media type of the search
+        :return: the hash of the params
+        """
+
+        # ``QueryDict`` can have several values per param
+        getlist = getattr(query_params, "getlist", lambda key: [query_params[key]])
+        params = sorted(
+            (key, getlist(key)) for key in query_params if key not in CURSOR_PARAMS
+        )
+        serialized = json.dumps([media_type, params], sort_keys=True)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    @classmethod
+    def decode(cls, token: str) -> Self:
+        """
+        Get the cursor from a token made by ``encode``.
+
+        :param token: the token given to the client
+        :return: the cursor
+        :raise: ``ValueError`` if the token is not a valid cursor
+        """
+
+        try:
+            return cls(**signing.loads(token, salt=CURSOR_SALT))
+        except (signing.BadSignature, TypeError) as err:
+            raise ValueError(f"Invalid cursor: {err}")
+
+    def encode(self) -> str:
+        """Get the token to give to the client."""
+
+        return signing.dumps(asdict(self), salt=CURSOR_SALT, compress=True)
+
+    def advance(self, pit_id: str, search_after: list) -> Self:
+        """Get the cursor to the next page."""
+
+        return replace(
+            self, page=self.page + 1, pit_id=pit_id, search_after=search_after
+        )
+
+    def __str__(self):
+        return self.encode()
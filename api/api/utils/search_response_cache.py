@@ -0,0 +1,124 @@
+"""
+Cache the responses to anonymous search requests.
+
+Anonymous searches are mostly for a small set of popular queries, so their
+responses are shared for ``SEARCH_RESPONSE_CACHE_TTL`` seconds. Once a response
+is older than that, one request refreshes it while the others are served the
+stale response, for at most ``SEARCH_RESPONSE_CACHE_STALE_TTL`` more seconds.
+
+The cache keys include the content epoch, which is bumped whenever documents are
+updated in Elasticsearch, e.g. by moderation, and the concrete indices behind the
+searched aliases, which change when a new index is promoted. Either change makes
+all the cached responses unreachable at once.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+import structlog
+from redis.exceptions import ConnectionError
+
+from api.constants.media_types import OriginIndex
+from api.utils.search_context import get_filtered_index_name, get_index_name
+
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_EPOCH_KEY = "search-content-epoch"
+# The number of seconds for which a request may refresh a stale response before
+# another request takes over
+REFRESH_LOCK_TIMEOUT = 10
+
+
+def get_content_epoch() -> int | None:
+    """Get the content epoch, ``None`` if it cannot be read."""
+
+    try:
+        return cache.get(CONTENT_EPOCH_KEY, 0)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot get the content epoch.")
+        return None
+
+
+def bump_content_epoch():
+    """Invalidate all the cached search responses, e.g. after moderation."""
+
+    try:
+        cache.incr(CONTENT_EPOCH_KEY, ignore_key_check=True)
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot bump the content epoch.")
+
+
+def get_response_cache_key(
+    base_url: str, origin_index: OriginIndex, params: dict
+) -> str | None:
+    """
+    Get the cache key of the response to a search.
+
+    :param base_url: the URL of the API, which is part of the links in responses
+    :param origin_index: the origin index of the search, such as ``'image'``
+    :param params: the validated search params
+    :return: the cache key, ``None`` if responses must not be cached
+    """
+
+    if settings.SEARCH_RESPONSE_CACHE_TTL <= 0:
+        return None
+    if (epoch := get_content_epoch()) is None:
+        return None
+
+    # Searches use either the origin or the filtered index, depending on the params
+    index_names = [get_index_name(origin_index), get_filtered_index_name(origin_index)]
+    fingerprint = json.dumps(
+        [base_url, index_names, params], sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return f"search-response:{origin_index}:{epoch}:{digest}"
+
+
+def get_cached_response(key: str) -> dict | None:
+    """
+    Get the cached response data for the key.
+
+    :param key: the key from ``get_response_cache_key``
+    :return: the response data, ``None`` if the response must be made, either
+    because it is not cached or to refresh it
+    """
+
+    try:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if time.time() < entry["fresh_until"]:
+            return entry["data"]
+        # Only the request acquiring the lock refreshes the stale response
+        is_refreshing = not cache.add(
+            f"{key}:refresh", True, timeout=REFRESH_LOCK_TIMEOUT
+        )
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot get cached search response.")
+        return None
+
+    return entry["data"] if is_refreshing else None
+
+
+def cache_response(key: str, data: dict):
+    """
+    Cache the response data for the key.
+
+    :param key: the key from ``get_response_cache_key``
+    :param data: the response data
+    """
+
+    ttl = settings.SEARCH_RESPONSE_CACHE_TTL
+    try:
+        cache.set(
+            key,
+            {"data": data, "fresh_until": time.time() + ttl},
+            timeout=ttl + settings.SEARCH_RESPONSE_CACHE_STALE_TTL,
+        )
+    except ConnectionError:
+        logger.warning("Redis connect failed, cannot cache search response.")
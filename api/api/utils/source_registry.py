@@ -0,0 +1,88 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from django.db import connection
+
+import structlog
+
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SourceRegistry(Generic[T]):
+    """
+    Keep the sources of each index in the memory of the process.
+
+    The sources of an index are loaded on first use, and then served from memory.
+    Once they are older than ``ttl``, the next use starts a refresh in a background
+    thread and is served the current sources, so that requests never wait for a
+    refresh. Only one refresh per index runs at a time, and the current sources
+    are kept if a refresh fails. Sources loaded before the registry was cleared
+    are not kept, as they may predate the change that cleared it.
+
+    :param load: the function that gets the sources of an index, such as their counts
+    :param ttl: the number of seconds after which the sources of an index are
+    refreshed
+    """
+
+    def __init__(self, load: Callable[[str], T], ttl: float):
+        self.load = load
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sources: dict[str, tuple[float, T]] = {}
+        self._refreshing: set[str] = set()
+        # Bumped on every clear, to discard the sources of refreshes started before
+        self._generation = 0
+
+    def get(self, index: str) -> T:
+        """
+        Get the sources of the index.
+
+        :param index: the index whose sources to get
+        :return: the sources of the index, as returned by ``load``
+        """
+
+        if (entry := self._sources.get(index)) is None:
+            return self._refresh(index)
+
+        loaded_at, sources = entry
+        if time.monotonic() - loaded_at >= self.ttl:
+            with self._lock:
+                is_refreshing = index in self._refreshing
+                self._refreshing.add(index)
+            if not is_refreshing:
+                threading.Thread(
+                    target=self._refresh_in_background, args=(index,), daemon=True
+                ).start()
+        return sources
+
+    def clear(self):
+        """Forget the sources of all indices, so they are loaded on next use."""
+
+        with self._lock:
+            self._generation += 1
+            self._sources.clear()
+
+    def _refresh(self, index: str) -> T:
+        generation = self._generation
+        sources = self.load(index)
+        with self._lock:
+            if generation == self._generation:
+                self._sources[index] = (time.monotonic(), sources)
+        return sources
+
+    def _refresh_in_background(self, index: str):
+        try:
+            self._refresh(index)
+        except Exception as err:
+            logger.warning("Failed to refresh sources.", index=index, error=str(err))
+        finally:
+            with self._lock:
+                self._refreshing.discard(index)
+            # Django opens a database connection per thread, which is never closed
+            # once the thread ends unless it is closed here
+            connection.close()
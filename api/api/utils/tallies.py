@@ -10,9 +10,9 @@ from redis.exceptions import ConnectionError
 logger = structlog.get_logger(__name__)
 
 
-def get_weekly_timestamp() -> str:
-    """Get a timestamp for the Monday of any given week."""
-    now = datetime.now()
+def get_weekly_timestamp(weeks_ago: int = 0) -> str:
+    """Get a timestamp for the Monday of the current week, or of an earlier one."""
+    now = datetime.now() - timedelta(weeks=weeks_ago)
     monday = now - timedelta(days=now.weekday())
     return monday.strftime("%Y-%m-%d")
 
@@ -1,7 +1,9 @@
 import abc
+import math
 
 from rest_framework.throttling import SimpleRateThrottle as BaseSimpleRateThrottle
 
+import django_redis
 import structlog
 from redis.exceptions import ConnectionError
 
@@ -9,20 +11,155 @@ from redis.exceptions import ConnectionError
 logger = structlog.get_logger(__name__)
 
 
+# Applies every throttle of a request at once with the generic cell rate algorithm
+# (GCRA). Each key stores the theoretical arrival time (TAT) of the next request
+# in microseconds, which is pushed back by ``period / limit`` for every request.
+# A request is allowed if no TAT would end up more than ``period`` in the future,
+# in which case the TATs of all the throttles are updated, and otherwise none are.
+#
+# KEYS: the key of each throttle
+# ARGV: the limit and period, in seconds, of each throttle, in the order of KEYS
+# Returns whether the request is allowed, followed by the number of requests left
+# and the milliseconds until the next request is allowed for each throttle.
+GCRA_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local allowed = 1
+local throttles = {}
+for i, key in ipairs(KEYS) do
+    local period = tonumber(ARGV[2 * i]) * 1000000
+    local interval = period / tonumber(ARGV[2 * i - 1])
+    local tat = math.max(tonumber(redis.call("GET", key)) or now, now)
+    local new_tat = tat + interval
+    if new_tat - period > now then
+        allowed = 0
+    end
+    throttles[i] = {period, interval, tat, new_tat}
+end
+
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+    local period, interval = throttles[i][1], throttles[i][2]
+    local tat, new_tat = throttles[i][3], throttles[i][4]
+    if allowed == 1 then
+        tat = new_tat
+        local ttl = math.ceil((tat - now) / 1000)
+        redis.call("SET", key, string.format("%.0f", tat), "PX", ttl)
+    end
+    table.insert(result, math.floor((period - (tat - now)) / interval))
+    table.insert(result, math.ceil(math.max(0, new_tat - period - now) / 1000))
+end
+return result
+"""
+
+
+def apply_throttles(throttles: list["SimpleRateThrottle"]) -> dict[str, tuple]:
+    """
+    Count a request against all of its throttles in a single call to Redis.
+
+    The request is only counted if it is allowed by every throttle, so requests
+    that are throttled do not use up the limits of the other throttles.
+
+    :param throttles: the throttles that apply to the request, with their keys set
+    :return: a mapping of each key to whether the request is allowed by all the
+    throttles, the number of requests left and the seconds until the next request
+    """
+
+    if not throttles:
+        return {}
+
+    redis = django_redis.get_redis_connection("default")
+    script = redis.register_script(GCRA_SCRIPT)
+    allowed, *result = script(
+        keys=[throttle.key for throttle in throttles],
+        args=[
+            arg
+            for throttle in throttles
+            for arg in (throttle.num_requests, throttle.duration)
+        ],
+    )
+    return {
+        throttle.key: (bool(allowed), remaining, wait / 1000)
+        for throttle, remaining, wait in zip(
+            throttles, result[::2], result[1::2], strict=True
+        )
+    }
+
+
 class SimpleRateThrottle(BaseSimpleRateThrottle, metaclass=abc.ABCMeta):
     """
     Extends the ``SimpleRateThrottle`` class to provide additional functionality such as
     rate-limit headers in the response.
+
+    Rather than keeping the history of requests for each throttle, every throttle of a
+    view is applied by the first one to be checked, with one atomic call to Redis (see
+    ``apply_throttles``). The results are kept on the view, which is created anew for
+    each request, for the remaining throttles to read.
     """
 
+    @property
+    def name(self) -> str:
+        """The scope of the throttle, or the name of its class if it has no scope."""
+        return self.scope or self.__class__.__name__.lower()
+
     def allow_request(self, request, view):
-        try:
-            is_allowed = super().allow_request(request, view)
-        except ConnectionError:
-            logger.warning("Redis connect failed, allowing request.")
-            is_allowed = True
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        if (results := getattr(view, "throttle_results", None)) is None:
+            try:
+                results = apply_throttles(self.get_applicable_throttles(request, view))
+            except ConnectionError:
+                logger.warning("Redis connect failed, allowing request.")
+                results = {}
+            view.throttle_results = results
+
+        if self.key not in results:
+            return True
+
+        is_allowed, self.remaining, self.retry_after = results[self.key]
         view.headers |= self.headers()
-        return is_allowed
+        # A throttle within its own limit does not block a throttled request
+        return is_allowed or self.remaining > 0
+
+    @staticmethod
+    def get_applicable_throttles(request, view) -> list["SimpleRateThrottle"]:
+        throttles = []
+        for throttle in view.get_throttles():
+            if not isinstance(throttle, SimpleRateThrottle) or throttle.rate is None:
+                continue
+            throttle.key = throttle.get_cache_key(request, view)
+            if throttle.key is not None:
+                throttles.append(throttle)
+        return throttles
+
+    def wait(self):
+        return self.retry_after
+
+    def get_requests_used(self, ident: str) -> int | None:
+        """
+        Get the number of requests counted against this throttle for the given
+        identity, within the period of the throttle.
+
+        :param ident: the identity of the client, e.g. its client ID
+        :return: the number of requests, or ``None`` if there have been none
+        """
+
+        key = self.cache_format % {"scope": self.name, "ident": ident}
+        pipe = django_redis.get_redis_connection("default").pipeline()
+        pipe.get(key)
+        pipe.time()
+        tat, (seconds, microseconds) = pipe.execute()
+        if tat is None or self.rate is None:
+            return None
+
+        now = seconds * 1_000_000 + microseconds
+        interval = self.duration * 1_000_000 / self.num_requests
+        return max(0, math.ceil((int(tat) - now) / interval)) or None
 
     def headers(self):
         """
@@ -31,11 +168,11 @@ class SimpleRateThrottle(BaseSimpleRateThrottle, metaclass=abc.ABCMeta):
         rate limits can apply concurrently, the suffix identifies each pair uniquely.
         """
         prefix = "X-RateLimit"
-        suffix = self.scope or self.__class__.__name__.lower()
-        if hasattr(self, "history"):
+        suffix = self.name
+        if hasattr(self, "remaining"):
             return {
                 f"{prefix}-Limit-{suffix}": self.rate,
-                f"{prefix}-Available-{suffix}": self.num_requests - len(self.history),
+                f"{prefix}-Available-{suffix}": max(0, self.remaining),
             }
         else:
             return {}
@@ -52,7 +189,7 @@ class SimpleRateThrottle(BaseSimpleRateThrottle, metaclass=abc.ABCMeta):
 
     def get_cache_key(self, request, view):
         return self.cache_format % {
-            "scope": self.scope,
+            "scope": self.name,
             "ident": self.get_ident(request),
         }
 
@@ -5,6 +5,8 @@ import os
 import pathlib
 import shutil
 import subprocess
+import sys
+from array import array
 
 from django.conf import settings
 from rest_framework import status
@@ -19,6 +21,13 @@ logger = structlog.get_logger(__name__)
 TMP_DIR = pathlib.Path("/tmp").resolve()
 UA_STRING = settings.OUTBOUND_USER_AGENT_TEMPLATE.format(purpose="Waveform")
 
+# The format of packed peaks, stored in their first byte
+PEAKS_FORMAT_VERSION = 1
+# Packed peaks are 16-bit unsigned integers in units of ``1 / PEAKS_SCALE``. This
+# scale is below the integer limit, and each unpacked peak has at most 5 decimals,
+# like the generated peaks.
+PEAKS_SCALE = 50_000
+
 
 class WaveformGenerationFailure(APIException):
     status_code = status.HTTP_424_FAILED_DEPENDENCY
@@ -204,3 +213,38 @@ def generate_peaks(audio) -> list[float]:
     finally:
         if file_name is not None:
             cleanup(file_name)
+
+
+def pack_peaks(peaks: list[float]) -> bytes:
+    """
+    Pack the waveform peaks into their compact, versioned storage format.
+
+    The first byte is the version of the format. It is followed by each peak,
+    quantized to a little-endian 16-bit unsigned integer.
+
+    :param peaks: the peaks, in the range [0, 1]
+    :returns: the packed peaks
+    """
+
+    values = array("H", [round(peak * PEAKS_SCALE) for peak in peaks])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return bytes([PEAKS_FORMAT_VERSION]) + values.tobytes()
+
+
+def unpack_peaks(packed: bytes | memoryview) -> list[float]:
+    """
+    Unpack the waveform peaks packed by ``pack_peaks``.
+
+    :param packed: the packed peaks
+    :returns: the peaks
+    :raises ValueError: if the peaks are packed in an unknown format
+    """
+
+    if (version := packed[0]) != PEAKS_FORMAT_VERSION:
+        raise ValueError(f"Unknown waveform peaks format version {version}.")
+    values = array("H")
+    values.frombytes(packed[1:])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return [value / PEAKS_SCALE for value in values]
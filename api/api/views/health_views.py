@@ -1,12 +1,11 @@
 from django.conf import settings
-from django.db import connection
-from django.db.utils import OperationalError
 from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.utils.health_monitor import health_monitor
 from api.utils.throttle import ExemptOAuth2IdRateThrottle, HealthcheckAnonRateThrottle
 
 
@@ -21,41 +20,35 @@ class HealthCheck(APIView):
     This endpoint is used in production to ensure that the server should receive
     traffic. If no response is provided, the server is deregistered from the
     load balancer and destroyed.
+
+    The services are not checked on each request, but in the background by
+    ``health_monitor``, and the response reports the last check of each service
+    and its age in seconds. Postgres is always required to be healthy, and
+    Elasticsearch and Redis only with the ``check_es`` and ``check_redis`` query
+    params. A required service that has not been checked for more than
+    ``HEALTH_CHECK_MAX_AGE`` seconds is considered unhealthy.
     """
 
     throttle_classes = [HealthcheckAnonRateThrottle, ExemptOAuth2IdRateThrottle]
     schema = None  # Hide this view from the OpenAPI schema.
 
-    @staticmethod
-    def _check_db() -> None:
-        """
-        Check that the database is available.
-
-        Returns nothing if everything is OK, throws error otherwise.
-        """
-        try:
-            connection.ensure_connection()
-        except OperationalError as err:
-            raise HealthCheckException(f"postgres: {err}")
-
-    @staticmethod
-    def _check_es() -> None:
-        """
-        Check Elasticsearch cluster health.
-
-        Raises an exception if ES is not healthy.
-        """
-        es_health = settings.ES.cluster.health(timeout="5s")
-
-        if es_health["timed_out"]:
-            raise HealthCheckException("elasticsearch: es_timed_out")
-
-        if (es_status := es_health["status"]) != "green":
-            raise HealthCheckException(f"elasticsearch: es_status_{es_status}")
-
     def get(self, request: Request):
+        required_services = ["postgres"]
         if "check_es" in request.query_params:
-            self._check_es()
-        self._check_db()
-
-        return Response({"status": "200 OK"}, status=200)
+            required_services.insert(0, "elasticsearch")
+        if "check_redis" in request.query_params:
+            required_services.append("redis")
+
+        snapshot = health_monitor.snapshot()
+        for service in required_services:
+            health = snapshot[service]
+            if (age := health.age) > settings.HEALTH_CHECK_MAX_AGE:
+                raise HealthCheckException(f"{service}: last checked {age:.0f}s ago")
+            if health.error:
+                raise HealthCheckException(health.error)
+
+        checks = {
+            service: {"healthy": health.error is None, "age": round(health.age, 1)}
+            for service, health in snapshot.items()
+        }
+        return Response({"status": "200 OK", "checks": checks}, status=200)
@@ -1,12 +1,9 @@
-import io
-
 from django.conf import settings
 from django.shortcuts import aget_object_or_404
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from PIL import Image as PILImage
 
 from api.constants.media_types import IMAGE_TYPE
 from api.docs.image_docs import (
@@ -18,7 +15,7 @@ from api.docs.image_docs import (
     stats,
 )
 from api.docs.image_docs import thumbnail as thumbnail_docs
-from api.models import Image
+from api.models import Image, ImageAddOn
 from api.serializers.image_serializers import (
     ImageReportRequestSerializer,
     ImageSearchRequestSerializer,
@@ -28,6 +25,7 @@ from api.serializers.image_serializers import (
 )
 from api.utils import image_proxy
 from api.utils.aiohttp import get_aiohttp_session
+from api.utils.image_dimensions import probe_dimensions
 from api.views.media_views import MediaViewSet
 
 
@@ -81,23 +79,42 @@ class ImageViewSet(MediaViewSet):
         image = await aget_object_or_404(Image, identifier=identifier)
 
         if not (image.height and image.width):
-            session = await get_aiohttp_session()
+            context |= await self.get_image_dimensions(image)
 
-            async with session.get(
-                image.url, headers=self.OEMBED_HEADERS
-            ) as image_file:
-                image_content = await image_file.content.read()
+        serializer = self.get_serializer(image, context=context)
+        return Response(data=await serializer.adata)
 
-            with PILImage.open(io.BytesIO(image_content)) as image_file:
-                width, height = image_file.size
+    async def get_image_dimensions(self, image: Image) -> dict[str, int]:
+        """
+        Get the dimensions of an image for which they are not known.
 
-            context |= {
-                "width": width,
-                "height": height,
-            }
+        The dimensions are probed from the leading bytes of the image file and
+        stored in the image's add-on, so that each image is probed at most once.
 
-        serializer = self.get_serializer(image, context=context)
-        return Response(data=await serializer.adata)
+        :param image: the image for which to get the dimensions
+        :return: the width and height of the image, or nothing if they could
+            not be determined
+        """
+
+        add_on = await ImageAddOn.objects.filter(
+            image_identifier=image.identifier
+        ).afirst()
+        if add_on and add_on.width and add_on.height:
+            return {"width": add_on.width, "height": add_on.height}
+
+        session = await get_aiohttp_session()
+        dimensions = await probe_dimensions(
+            session, image.url, headers=self.OEMBED_HEADERS
+        )
+        if dimensions is None:
+            return {}
+
+        width, height = dimensions
+        await ImageAddOn.objects.aupdate_or_create(
+            image_identifier=image.identifier,
+            defaults={"width": width, "height": height},
+        )
+        return {"width": width, "height": height}
 
     async def get_image_proxy_media_info(self) -> image_proxy.MediaInfo:
         image = await self.aget_object()
@@ -1,14 +1,17 @@
 from typing import Union
 
+from django.conf import settings
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.exceptions import APIException, NotFound
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 import structlog
 from adrf.generics import GenericAPIView as AsyncAPIView
 from adrf.viewsets import ViewSetMixin as AsyncViewSetMixin
+from asgiref.sync import sync_to_async
 
 from api.constants.media_types import MediaType
 from api.controllers import search_controller
@@ -18,9 +21,12 @@ from api.models.base import OpenLedgerModel
 from api.models.media import AbstractMedia
 from api.serializers import media_serializers
 from api.serializers.source_serializers import SourceSerializer
-from api.utils import image_proxy
+from api.utils import image_proxy, search_response_cache
+from api.utils.drf_renderer import FastJSONRenderer
+from api.utils.filtered_sources import get_filtered_sources
 from api.utils.pagination import StandardPagination
 from api.utils.search_context import SearchContext
+from api.utils.search_cursor import ExpiredCursorError
 from api.utils.throttle import (
     AnonThumbnailRateThrottle,
     OAuth2IdThumbnailRateThrottle,
@@ -68,22 +74,34 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
         if any(val is None for val in required_fields):
             msg = "Viewset fields are not completely populated."
             raise ValueError(msg)
+        self._request_serializer = None
 
     def get_queryset(self):
-        # The alternative to a sub-query would be using `extra` to do a join
-        # to the content source table and filtering `filter_content`. However,
-        # that assumes that a content source entry exists, which is not necessarily
-        # the case. We often don't add a content source until after works from
-        # new source are available in the API, and sometimes not even then.
-        # Search returns results with sources that do not have a ContentSource
-        # table entry. Therefore, to maintain that assumption, a subquery is the only
-        # workable approach, as Django's `extra` does not provide any facility for
-        # handling null relations on the join.
-        return self.model_class.objects.exclude(
-            source__in=ContentSource.objects.filter(filter_content=True).values_list(
-                "source_identifier"
-            )
-        )
+        # Works from sources without a content source entry are not excluded,
+        # because we often don't add a content source until after works from a new
+        # source are available in the API. Excluding the hidden sources by their
+        # identifiers, kept in memory, matches how search excludes them and saves
+        # a subquery on the content source table for every request.
+        queryset = self.model_class.objects.all()
+        if filtered_sources := get_filtered_sources():
+            queryset = queryset.exclude(source__in=filtered_sources)
+        return queryset
+
+    async def aget_object(self):
+        # ``get_queryset`` may have to load the hidden sources from the database,
+        # which cannot be done from the event loop, so they are loaded beforehand
+        await sync_to_async(get_filtered_sources)()
+        return await super().aget_object()
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        # Search and detail responses are the bulk of our traffic
+        if settings.USE_FAST_JSON_RENDERER and self.action in {"list", "retrieve"}:
+            renderers = [
+                FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+                for renderer in renderers
+            ]
+        return renderers
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -92,12 +110,17 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
         return context
 
     def _get_request_serializer(self, request):
-        req_serializer = self.query_serializer_class(
-            data=request.query_params,
-            context={"request": request, "media_type": self.media_type},
-        )
-        req_serializer.is_valid(raise_exception=True)
-        return req_serializer
+        # A viewset is instantiated for each request, so the query params are only
+        # validated once, and the result is shared by the action and the context of
+        # the response serializers.
+        if self._request_serializer is None:
+            req_serializer = self.query_serializer_class(
+                data=request.query_params,
+                context={"request": request, "media_type": self.media_type},
+            )
+            req_serializer.is_valid(raise_exception=True)
+            self._request_serializer = req_serializer
+        return self._request_serializer
 
     def get_db_results(
         self,
@@ -139,8 +162,8 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
 
     def retrieve(self, request, *_, **__):
         instance = self.get_object()
-        search_context = SearchContext.build(
-            [str(instance.identifier)], self.default_index
+        search_context = SearchContext.build_for_result(
+            str(instance.identifier), self.default_index
         ).asdict()
         serializer_context = search_context | self.get_serializer_context()
         serializer = self.get_serializer(instance, context=serializer_context)
@@ -152,7 +175,7 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
         return self.get_media_results(request, params)
 
     def _validate_source(self, source):
-        valid_sources = search_controller.get_sources(self.media_type)
+        valid_sources = search_controller.get_available_sources(self.media_type)
         if source not in valid_sources:
             valid_string = ", ".join([f"'{k}'" for k in valid_sources.keys()])
             raise InvalidSource(
@@ -194,23 +217,66 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
             search_index = self.default_index
             exact_index = False
 
-        try:
-            (
-                results,
-                num_pages,
-                num_results,
-                search_context,
-            ) = search_controller.query_media(
-                params,
-                search_index,
-                exact_index,
-                page_size,
-                hashed_ip,
-                filter_dead,
+        # Responses to anonymous requests are shared, except for cursor pages
+        cursor = params.validated_data.get("cursor")
+        cache_key = None
+        if request.auth is None and cursor is None:
+            cache_key = search_response_cache.get_response_cache_key(
+                request.build_absolute_uri("/"), search_index, params.data
+            )
+        if (
+            cache_key
+            and (data := search_response_cache.get_cached_response(cache_key))
+            is not None
+        ):
+            # The search is not executed again, so its results are tallied here
+            search_controller.tally_results(
+                search_controller.get_index(exact_index, search_index, params),
+                data["results"],
                 page,
+                page_size,
             )
+            return Response(data)
+
+        try:
+            if cursor:
+                (
+                    results,
+                    num_pages,
+                    num_results,
+                    search_context,
+                    next_cursor,
+                ) = search_controller.query_media_by_cursor(
+                    params,
+                    search_index,
+                    exact_index,
+                    page_size,
+                    filter_dead,
+                    cursor,
+                )
+                self.paginator.uses_cursor = True
+                self.paginator.next_cursor = next_cursor and next_cursor.encode()
+            else:
+                (
+                    results,
+                    num_pages,
+                    num_results,
+                    search_context,
+                ) = search_controller.query_media(
+                    params,
+                    search_index,
+                    exact_index,
+                    page_size,
+                    hashed_ip,
+                    filter_dead,
+                    page,
+                )
             self.paginator.page_count = params.clamp_page_count(num_pages)
             self.paginator.result_count = params.clamp_result_count(num_results)
+        except ExpiredCursorError:
+            raise ValidationError(
+                {"unstable__cursor": ["The cursor has expired, start a new search."]}
+            )
         except ValueError as e:
             raise APIException(getattr(e, "message", str(e)))
 
@@ -223,7 +289,10 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
         )
 
         serializer = self.get_serializer(results, many=True, context=serializer_context)
-        return self.get_paginated_response(serializer.data)
+        response = self.get_paginated_response(serializer.data)
+        if cache_key:
+            search_response_cache.cache_response(cache_key, response.data)
+        return response
 
     # Extra actions
 
@@ -262,6 +331,8 @@ class MediaViewSet(AsyncViewSetMixin, AsyncAPIView, ReadOnlyModelViewSet):
         serializer_context = self.get_serializer_context()
 
         results, _ = self.get_db_results(results)
+        # Precomputed related results may have been marked sensitive since
+        results = [result for result in results if not result.sensitive]
 
         serializer = self.get_serializer(results, many=True, context=serializer_context)
         return self.get_paginated_response(serializer.data)
@@ -4,7 +4,6 @@ import smtplib
 from textwrap import dedent
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.mail import send_mail
 from django.db import DataError
 from rest_framework.exceptions import APIException
@@ -28,11 +27,29 @@ from api.serializers.oauth2_serializers import (
     OAuth2KeyInfoSerializer,
     OAuth2RegistrationSerializer,
 )
-from api.utils.throttle import OnePerSecond, TenPerDay
+from api.utils.throttle import (
+    EnhancedOAuth2IdBurstRateThrottle,
+    EnhancedOAuth2IdSustainedRateThrottle,
+    ExemptOAuth2IdRateThrottle,
+    OAuth2IdBurstRateThrottle,
+    OAuth2IdSustainedRateThrottle,
+    OnePerSecond,
+    TenPerDay,
+)
 
 
 logger = structlog.get_logger(__name__)
 
+# The burst and sustained throttles of each ``ThrottledApplication.rate_limit_model``
+RATE_LIMIT_MODEL_THROTTLES = {
+    "standard": (OAuth2IdBurstRateThrottle, OAuth2IdSustainedRateThrottle),
+    "enhanced": (
+        EnhancedOAuth2IdBurstRateThrottle,
+        EnhancedOAuth2IdSustainedRateThrottle,
+    ),
+    "exempt": (ExemptOAuth2IdRateThrottle, ExemptOAuth2IdRateThrottle),
+}
+
 
 class InvalidCredentials(APIException):
     status_code = 400
@@ -216,36 +233,16 @@ class CheckRates(APIView):
         client_id = application.client_id
 
         throttle_type = application.rate_limit_model
-        throttle_key = "throttle_{scope}_{client_id}"
-        if throttle_type == "standard":
-            sustained_throttle_key = throttle_key.format(
-                scope="oauth2_client_credentials_sustained", client_id=client_id
-            )
-            burst_throttle_key = throttle_key.format(
-                scope="oauth2_client_credentials_burst", client_id=client_id
-            )
-        elif throttle_type == "enhanced":
-            sustained_throttle_key = throttle_key.format(
-                scope="enhanced_oauth2_client_credentials_sustained",
-                client_id=client_id,
-            )
-            burst_throttle_key = throttle_key.format(
-                scope="enhanced_oauth2_client_credentials_burst", client_id=client_id
-            )
-        elif throttle_type == "exempt":
-            burst_throttle_key = sustained_throttle_key = throttle_key.format(
-                scope="exempt_oauth2_client_credentials_burst", client_id=client_id
-            )
-        else:
+        if throttle_type not in RATE_LIMIT_MODEL_THROTTLES:
             return APIException("Unknown API key rate limit type")
+        burst_throttle, sustained_throttle = (
+            throttle_class()
+            for throttle_class in RATE_LIMIT_MODEL_THROTTLES[throttle_type]
+        )
 
         try:
-            sustained_requests_list = cache.get(sustained_throttle_key)
-            sustained_requests = (
-                len(sustained_requests_list) if sustained_requests_list else None
-            )
-            burst_requests_list = cache.get(burst_throttle_key)
-            burst_requests = len(burst_requests_list) if burst_requests_list else None
+            sustained_requests = sustained_throttle.get_requests_used(client_id)
+            burst_requests = burst_throttle.get_requests_used(client_id)
             status = 200
         except ConnectionError:
             logger.warning("Redis connect failed, cannot get key usage.")
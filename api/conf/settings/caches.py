@@ -27,3 +27,19 @@ CACHES = {
     # for a given week), allowing historical data analysis.
     "tallies": _make_cache_config(3, TIMEOUT=None),
 }
+
+# The number of seconds for which the responses to anonymous searches are shared,
+# 0 to disable the cache of search responses
+SEARCH_RESPONSE_CACHE_TTL = config("SEARCH_RESPONSE_CACHE_TTL", default=30, cast=int)
+
+# The number of seconds after their TTL for which stale search responses are served
+# while they are refreshed
+SEARCH_RESPONSE_CACHE_STALE_TTL = config(
+    "SEARCH_RESPONSE_CACHE_STALE_TTL", default=300, cast=int
+)
+
+# The number of seconds for which the precomputed related media of an item are kept,
+# they also stop being used as soon as a new index is promoted
+RELATED_MEDIA_CACHE_TTL = config(
+    "RELATED_MEDIA_CACHE_TTL", default=60 * 60 * 24 * 7, cast=int
+)
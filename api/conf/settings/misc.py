@@ -19,6 +19,19 @@ VERBOSE_ES_RESPONSE = config("DEBUG_SCORES", default=False, cast=bool)
 # Whether to boost results by authority and popularity
 USE_RANK_FEATURES = config("USE_RANK_FEATURES", default=True, cast=bool)
 
+# Whether to serialize media through precompiled serialization plans
+USE_SERIALIZATION_PLAN = config("USE_SERIALIZATION_PLAN", default=True, cast=bool)
+
+# Whether to render search and detail responses with ``orjson``, if installed
+USE_FAST_JSON_RENDERER = config("USE_FAST_JSON_RENDERER", default=False, cast=bool)
+
+# The number of seconds between the background checks of the services used by the API
+HEALTH_CHECK_INTERVAL = config("HEALTH_CHECK_INTERVAL", default=10, cast=float)
+
+# The number of seconds after which the last check of a service is too old for the
+# health check endpoint to report the service as healthy
+HEALTH_CHECK_MAX_AGE = config("HEALTH_CHECK_MAX_AGE", default=60, cast=float)
+
 # The scheme to use for the hyperlinks in the API responses
 API_LINK_SCHEME = config("API_LINK_SCHEME", default=None)
 
@@ -2,6 +2,7 @@
 
 from test.fixtures.asynchronous import ensure_asgi_lifecycle, get_new_loop, session_loop
 from test.fixtures.cache import (
+    clear_source_registry,
     django_cache,
     redis,
     unreachable_django_cache,
@@ -26,6 +27,7 @@ __all__ = [
     "ensure_asgi_lifecycle",
     "get_new_loop",
     "session_loop",
+    "clear_source_registry",
     "django_cache",
     "redis",
     "unreachable_django_cache",
@@ -8,7 +8,8 @@ from api.models.audio import (
     DeletedAudio,
     SensitiveAudio,
 )
-from test.factory.faker import Faker
+from api.utils.waveform import pack_peaks
+from test.factory.faker import WaveformProvider
 from test.factory.models.media import (
     IdentifierFactory,
     MediaFactory,
@@ -43,7 +44,9 @@ class AudioAddOnFactory(DjangoModelFactory):
 
     audio_identifier = IdentifierFactory(AudioFactory)
 
-    waveform_peaks = Faker("waveform")
+    waveform_peaks_packed = factory.LazyFunction(
+        lambda: pack_peaks(WaveformProvider.generate_waveform())
+    )
 
 
 class AudioReportFactory(MediaReportFactory):
@@ -4,6 +4,9 @@ import pytest
 from django_redis.cache import RedisCache
 from fakeredis import FakeRedis, FakeServer
 
+from api.controllers import search_controller
+from api.utils.filtered_sources import filtered_source_registry
+
 
 @pytest.fixture(autouse=True)
 def redis(monkeypatch) -> FakeRedis:
@@ -72,3 +75,14 @@ def unreachable_django_cache(unreachable_redis) -> RedisCache:
     caches["default"] = unreachable_redis
     yield cache
     caches["default"] = original_default_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_source_registry():
+    """Prevent the sources kept in memory by one test from leaking into others."""
+
+    search_controller.source_registry.clear()
+    filtered_source_registry.clear()
+    yield
+    search_controller.source_registry.clear()
+    filtered_source_registry.clear()
@@ -31,10 +31,8 @@ def oauth_cache(django_cache, monkeypatch):
 
 
 @pytest.fixture
-def unreachable_oauth_cache(unreachable_django_cache, monkeypatch):
-    cache = unreachable_django_cache
-    monkeypatch.setattr("api.views.oauth2_views.cache", cache)
-    yield cache
+def unreachable_oauth_cache(unreachable_django_cache):
+    yield unreachable_django_cache
 
 
 @pytest.fixture
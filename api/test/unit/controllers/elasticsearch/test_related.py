@@ -1,41 +1,43 @@
+from datetime import datetime, timezone
 from unittest import mock
 
 import pook
 import pytest
 
 from api.controllers.elasticsearch import related
-from api.controllers.search_controller import (
-    FILTERED_SOURCES_CACHE_KEY,
-    FILTERED_SOURCES_CACHE_VERSION,
-)
+from api.utils import related_media_cache
 from test.factory.es_http import (
     MOCK_LIVE_RESULT_URL_PREFIX,
     create_mock_es_http_image_response_with_identifier,
     create_mock_es_http_image_search_response,
 )
 from test.factory.models import ImageFactory
+from test.factory.models.content_source import ContentSourceFactory
 
 
 pytestmark = pytest.mark.django_db
 
 
-@pytest.fixture
-def excluded_sources_cache(django_cache, monkeypatch):
-    cache = django_cache
-    monkeypatch.setattr("api.controllers.search_controller.cache", cache)
+@pytest.fixture(autouse=True)
+def filtered_index_name():
+    with mock.patch(
+        "api.utils.related_media_cache.get_filtered_index_name",
+        return_value="image-1-filtered",
+    ):
+        yield
 
+
+@pytest.fixture
+def excluded_source():
     excluded_source = "excluded_source"
-    cache_value = [excluded_source]
-    cache.set(
-        key=FILTERED_SOURCES_CACHE_KEY,
-        version=FILTERED_SOURCES_CACHE_VERSION,
-        value=cache_value,
-        timeout=1,
+    ContentSourceFactory.create(
+        created_on=datetime.now(tz=timezone.utc),
+        source_identifier=excluded_source,
+        source_name="Excluded Source",
+        filter_content=True,
     )
 
-    yield excluded_source
-
-    cache.delete(FILTERED_SOURCES_CACHE_KEY, version=FILTERED_SOURCES_CACHE_VERSION)
+    return excluded_source
 
 
 @mock.patch(
@@ -47,7 +49,7 @@ def test_related_media(
     wrapped_related_results,
     image_media_type_config,
     settings,
-    excluded_sources_cache,
+    excluded_source,
 ):
     image = ImageFactory.create()
 
@@ -83,7 +85,7 @@ def test_related_media(
         "query": {
             "bool": {
                 "must_not": [
-                    {"terms": {"source": [excluded_sources_cache]}},
+                    {"terms": {"source": [excluded_source]}},
                     {"term": {"mature": True}},
                     {"term": {"identifier": image.identifier}},
                 ],
@@ -113,3 +115,86 @@ def test_related_media(
     assert len(results) == 10
     assert wrapped_related_results.call_count == 1
     assert mock_related.total_matches == 1
+
+
+def mock_item_search(settings, image_media_type_config, identifier=None):
+    es_original_index_endpoint = (
+        f"{settings.ES_ENDPOINT}/{image_media_type_config.origin_index}/_search"
+    )
+    if identifier is None:
+        mock_es_response = create_mock_es_http_image_search_response(
+            index=image_media_type_config.origin_index, total_hits=0, hit_count=0
+        )
+    else:
+        mock_es_response = create_mock_es_http_image_response_with_identifier(
+            index=image_media_type_config.origin_index, identifier=identifier
+        )
+    pook.post(es_original_index_endpoint).times(1).reply(200).header(
+        "x-elastic-product", "Elasticsearch"
+    ).json(mock_es_response)
+
+
+@pook.on
+def test_related_media_uses_precomputed_results(image_media_type_config, settings):
+    image = ImageFactory.create()
+    related_results = [
+        {
+            "identifier": str(related.identifier),
+            "url": f"{MOCK_LIVE_RESULT_URL_PREFIX}/{idx}",
+            "provider": related.provider,
+        }
+        for idx, related in enumerate(ImageFactory.create_batch(3))
+    ]
+    related_media_cache.set_related_results(
+        image_media_type_config.origin_index,
+        "image-1-filtered",
+        {str(image.identifier): related_results},
+    )
+
+    # Only the item itself is searched, so any other query would fail the test
+    mock_item_search(settings, image_media_type_config, str(image.identifier))
+    # The precomputed results are still checked for dead links
+    pook.head(f"{MOCK_LIVE_RESULT_URL_PREFIX}/0").reply(200)
+    pook.head(f"{MOCK_LIVE_RESULT_URL_PREFIX}/1").reply(404)
+    pook.head(f"{MOCK_LIVE_RESULT_URL_PREFIX}/2").reply(200)
+
+    results = related.related_media(
+        uuid=str(image.identifier),
+        index=image_media_type_config.origin_index,
+        filter_dead=True,
+    )
+    assert [result.identifier for result in results] == [
+        related_results[0]["identifier"],
+        related_results[2]["identifier"],
+    ]
+    assert related_media_cache.get_most_requested(
+        image_media_type_config.origin_index, 1
+    ) == [str(image.identifier)]
+
+
+@pook.on
+def test_related_media_of_deindexed_item_ignores_precomputed_results(
+    image_media_type_config, settings
+):
+    related_media_cache.set_related_results(
+        image_media_type_config.origin_index,
+        "image-1-filtered",
+        {
+            "deindexed": [
+                {
+                    "identifier": "related",
+                    "url": f"{MOCK_LIVE_RESULT_URL_PREFIX}/0",
+                    "provider": "flickr",
+                }
+            ]
+        },
+    )
+
+    mock_item_search(settings, image_media_type_config)
+
+    with pytest.raises(IndexError):
+        related.related_media(
+            uuid="deindexed",
+            index=image_media_type_config.origin_index,
+            filter_dead=True,
+        )
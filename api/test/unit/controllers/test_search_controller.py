@@ -14,18 +14,17 @@ from elasticsearch_dsl import Search
 from elasticsearch_dsl.query import Terms
 from structlog.testing import capture_logs
 
+from api.constants.restricted_features import MAX_RESULT_COUNT
 from api.controllers import search_controller
 from api.controllers.elasticsearch import helpers as es_helpers
-from api.controllers.search_controller import (
-    FILTERED_SOURCES_CACHE_KEY,
-    FILTERED_SOURCES_CACHE_VERSION,
-)
 from api.utils import tallies
 from api.utils.dead_link_mask import get_query_hash, save_query_mask
 from api.utils.search_context import SearchContext
+from api.utils.search_cursor import ExpiredCursorError
 from test.factory.es_http import (
     MOCK_DEAD_RESULT_URL_PREFIX,
     MOCK_LIVE_RESULT_URL_PREFIX,
+    create_mock_es_http_image_hit,
     create_mock_es_http_image_search_response,
 )
 from test.factory.models.content_source import ContentSourceFactory
@@ -801,6 +800,74 @@ def test_post_process_results_recurses_as_needed(
     assert wrapped_post_process_results.call_count == 2
 
 
+@mock.patch("api.controllers.search_controller.SearchContext")
+@pook.on
+def test_post_process_results_recurses_past_lower_bound_of_total_hits(
+    mock_search_context, image_media_type_config, settings, redis
+):
+    mock_search_context.build.return_value = SearchContext(set(), set())
+    page_size = 5
+
+    # Elasticsearch stopped counting hits at 12, so there may be more
+    mock_es_response_1 = create_mock_es_http_image_search_response(
+        index=image_media_type_config.origin_index,
+        total_hits=12,
+        hit_count=10,
+        live_hit_count=2,
+    )
+    mock_es_response_1["hits"]["total"]["relation"] = "gte"
+    mock_es_response_2 = create_mock_es_http_image_search_response(
+        index=image_media_type_config.origin_index,
+        total_hits=12,
+        hit_count=5,
+        live_hit_count=3,
+        base_hits=mock_es_response_1["hits"]["hits"],
+    )
+    mock_es_response_2["hits"]["total"]["relation"] = "gte"
+
+    es_endpoint = (
+        f"{settings.ES_ENDPOINT}/{image_media_type_config.origin_index}/_search"
+    )
+    (
+        pook.post(es_endpoint)
+        .body(re.compile('size":10'))
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json(mock_es_response_1)
+    )
+    # The size is not clamped to the lower bound of the total
+    mock_second_es_request = (
+        pook.post(es_endpoint)
+        .body(re.compile('size":15'))
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json(mock_es_response_2)
+        .mock
+    )
+    pook.head(pook.regex(rf"{MOCK_LIVE_RESULT_URL_PREFIX}/\d")).times(5).reply(200)
+    pook.head(pook.regex(rf"{MOCK_DEAD_RESULT_URL_PREFIX}/\d")).times(10).reply(400)
+
+    serializer = image_media_type_config.search_request_serializer(
+        data={"q": "bird perched"},
+        context={"media_type": image_media_type_config.media_type},
+    )
+    serializer.is_valid()
+    results, _, _, _ = search_controller.query_media(
+        search_params=serializer,
+        ip=0,
+        origin_index=image_media_type_config.origin_index,
+        exact_index=True,
+        page=1,
+        page_size=page_size,
+        filter_dead=True,
+    )
+
+    assert mock_second_es_request.total_matches == 1
+    assert len(results) == page_size
+
+
 @mock.patch(
     "api.controllers.search_controller.check_dead_links",
 )
@@ -839,44 +906,35 @@ def test_excessive_recursion_in_post_process(
 
 
 @pytest.mark.django_db
-@cache_availability_params
 @pytest.mark.parametrize(
     "excluded_count, result",
     [(2, Terms(source=["source1", "source2"])), (0, None)],
 )
-def test_get_excluded_sources_query_returns_excluded(
-    excluded_count, result, is_cache_reachable, cache_name, request
-):
-    cache = request.getfixturevalue(cache_name)
-
-    if is_cache_reachable:
-        cache.set(
-            key=FILTERED_SOURCES_CACHE_KEY,
-            version=FILTERED_SOURCES_CACHE_VERSION,
-            timeout=30,
-            value=[f"source{i + 1}" for i in range(excluded_count)],
+def test_get_excluded_sources_query_returns_excluded(excluded_count, result):
+    for i in range(excluded_count):
+        ContentSourceFactory.create(
+            created_on=datetime.now(tz=timezone.utc),
+            source_identifier=f"source{i + 1}",
+            source_name=f"Source {i + 1}",
+            filter_content=True,
         )
-    else:
-        for i in range(excluded_count):
-            ContentSourceFactory.create(
-                created_on=datetime.now(tz=timezone.utc),
-                source_identifier=f"source{i + 1}",
-                source_name=f"Source {i + 1}",
-                filter_content=True,
-            )
 
-    with capture_logs() as cap_logs:
-        assert search_controller.get_excluded_sources_query() == result
+    assert search_controller.get_excluded_sources_query() == result
 
-    if not is_cache_reachable:
-        messages = [record["event"] for record in cap_logs]
-        assert all(
-            message in messages
-            for message in [
-                "Redis connect failed, cannot get cached filtered sources.",
-                "Redis connect failed, cannot cache filtered sources.",
-            ]
-        )
+
+@pytest.mark.django_db
+def test_get_excluded_sources_query_follows_content_source_changes():
+    content_source = ContentSourceFactory.create(
+        created_on=datetime.now(tz=timezone.utc),
+        source_identifier="source1",
+        source_name="Source 1",
+        filter_content=False,
+    )
+    assert search_controller.get_excluded_sources_query() is None
+
+    content_source.filter_content = True
+    content_source.save()
+    assert search_controller.get_excluded_sources_query() == Terms(source=["source1"])
 
 
 @cache_availability_params
@@ -916,3 +974,253 @@ def test_get_sources_returns_stats(is_cache_reachable, cache_name, request, capl
                 "Redis connect failed, cannot cache sources.",
             ]
         )
+
+
+@cache_availability_params
+@pytest.mark.parametrize(
+    "index_settings, expected",
+    [
+        (
+            {"index.sort.field": "created_on", "index.sort.order": "desc"},
+            ("created_on", "desc"),
+        ),
+        ({}, None),
+    ],
+)
+def test_get_index_sort(
+    index_settings, expected, is_cache_reachable, cache_name, request, settings
+):
+    request.getfixturevalue(cache_name)
+    settings.ES = mock.MagicMock()
+    settings.ES.indices.get_settings.return_value = {
+        "image-abc": {"settings": index_settings}
+    }
+
+    assert search_controller.get_index_sort("image") == expected
+    assert search_controller.get_index_sort("image") == expected
+
+    # The sort is only requested once if it can be cached
+    expected_calls = 1 if is_cache_reachable else 2
+    assert settings.ES.indices.get_settings.call_count == expected_calls
+
+
+@pytest.mark.parametrize(
+    "index_sort, sort_dir, tracks_total_hits",
+    [
+        (("created_on", "desc"), "desc", True),
+        (("created_on", "desc"), "asc", False),
+        (("popularity", "desc"), "desc", False),
+        (None, "desc", False),
+    ],
+)
+@mock.patch("api.controllers.search_controller.execute_search")
+def test_query_media_limits_total_hits_for_index_sorted_queries(
+    mock_execute_search, index_sort, sort_dir, tracks_total_hits, media_type_config
+):
+    mock_execute_search.return_value = (0, 0, [])
+    serializer = media_type_config.search_request_serializer(
+        data={
+            "q": "dogs",
+            "unstable__sort_by": "indexed_on",
+            "unstable__sort_dir": sort_dir,
+        },
+        context={"media_type": media_type_config.media_type},
+    )
+    # Sorting is only available to authenticated requests
+    with patch.object(serializer, "is_request_anonymous", return_value=False):
+        serializer.is_valid()
+
+    with patch(
+        "api.controllers.search_controller.get_index_sort", return_value=index_sort
+    ):
+        search_controller.query_media(
+            search_params=serializer,
+            ip=0,
+            origin_index=media_type_config.origin_index,
+            exact_index=True,
+            page=1,
+            page_size=20,
+            filter_dead=False,
+        )
+
+    s = mock_execute_search.call_args.args[0].to_dict()
+    assert s["sort"] == [{"created_on": {"order": sort_dir}}]
+    if tracks_total_hits:
+        # Only the hits that can be reported to the request are counted
+        assert s["track_total_hits"] == MAX_RESULT_COUNT.anonymous
+    else:
+        assert "track_total_hits" not in s
+
+
+@mock.patch("api.controllers.search_controller.SearchContext")
+@pook.on
+def test_query_media_by_cursor_continues_after_last_examined_hit(
+    mock_search_context, image_media_type_config, settings, redis
+):
+    mock_search_context.build.return_value = SearchContext(set(), set())
+    origin_index = image_media_type_config.origin_index
+
+    def search_response(pit_id, hit_liveness):
+        hits = [
+            create_mock_es_http_image_hit(_id=str(idx), index=origin_index, live=live)
+            | {"sort": [7.5, idx]}
+            for idx, live in enumerate(hit_liveness)
+        ]
+        return {
+            "took": 3,
+            "pit_id": pit_id,
+            "timed_out": False,
+            "hits": {"total": {"value": 40, "relation": "eq"}, "hits": hits},
+        }
+
+    mock_open_pit = (
+        pook.post(f"{settings.ES_ENDPOINT}/{origin_index}/_pit")
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json({"id": "pit_1"})
+        .mock
+    )
+    # With a page size of 2, 4 hits are fetched to allow for dead links
+    first_response = search_response("pit_2", [True, False, True, True])
+    mock_search = (
+        pook.post(f"{settings.ES_ENDPOINT}/_search")
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json(first_response)
+        .mock
+    )
+    pook.head(pook.regex(rf"{MOCK_LIVE_RESULT_URL_PREFIX}/\d")).times(3).reply(200)
+    pook.head(pook.regex(rf"{MOCK_DEAD_RESULT_URL_PREFIX}/\d")).times(1).reply(404)
+
+    serializer = image_media_type_config.search_request_serializer(
+        data={"q": "bird perched", "unstable__cursor": ""},
+        context={"media_type": image_media_type_config.media_type},
+    )
+    serializer.is_valid()
+    cursor = serializer.validated_data["cursor"]
+    results, _, _, _, next_cursor = search_controller.query_media_by_cursor(
+        search_params=serializer,
+        origin_index=origin_index,
+        exact_index=True,
+        page_size=2,
+        filter_dead=True,
+        cursor=cursor,
+    )
+
+    hits = first_response["hits"]["hits"]
+    assert [r.identifier for r in results] == [
+        hits[0]["_source"]["identifier"],
+        hits[2]["_source"]["identifier"],
+    ]
+    # The next page continues after the last result, from the latest point in time
+    assert next_cursor == cursor.advance("pit_2", [7.5, 2])
+    assert mock_open_pit.total_matches == 1
+    body = mock_search.matches[0].json
+    assert body["pit"] == {"id": "pit_1", "keep_alive": "5m"}
+    assert body["sort"] == ["_score", {"_shard_doc": "asc"}]
+    assert body["size"] == 4
+    assert "search_after" not in body
+
+
+@mock.patch("api.controllers.search_controller.SearchContext")
+@pook.on
+def test_query_media_by_cursor_closes_exhausted_point_in_time(
+    mock_search_context, image_media_type_config, settings, redis
+):
+    mock_search_context.build.return_value = SearchContext(set(), set())
+    origin_index = image_media_type_config.origin_index
+
+    hit = create_mock_es_http_image_hit(_id="3", index=origin_index) | {
+        "sort": [7.5, 3]
+    }
+    mock_search = (
+        pook.post(f"{settings.ES_ENDPOINT}/_search")
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json(
+            {
+                "took": 3,
+                "pit_id": "pit_3",
+                "timed_out": False,
+                "hits": {"total": {"value": 4, "relation": "eq"}, "hits": [hit]},
+            }
+        )
+        .mock
+    )
+    mock_close_pit = (
+        pook.delete(f"{settings.ES_ENDPOINT}/_pit")
+        .times(1)
+        .reply(200)
+        .header("x-elastic-product", "Elasticsearch")
+        .json({"succeeded": True, "num_freed": 1})
+        .mock
+    )
+
+    serializer = image_media_type_config.search_request_serializer(
+        data={"q": "bird perched", "unstable__cursor": ""},
+        context={"media_type": image_media_type_config.media_type},
+    )
+    serializer.is_valid()
+    cursor = serializer.validated_data["cursor"].advance("pit_2", [7.5, 2])
+    results, _, _, _, next_cursor = search_controller.query_media_by_cursor(
+        search_params=serializer,
+        origin_index=origin_index,
+        exact_index=True,
+        page_size=2,
+        filter_dead=False,
+        cursor=cursor,
+    )
+
+    assert [r.identifier for r in results] == [hit["_source"]["identifier"]]
+    assert next_cursor is None
+    assert mock_search.matches[0].json["search_after"] == [7.5, 2]
+    assert mock_close_pit.total_matches == 1
+
+
+@pook.on
+def test_query_media_by_cursor_raises_for_expired_point_in_time(
+    image_media_type_config, settings, redis
+):
+    mock_search = (
+        pook.post(f"{settings.ES_ENDPOINT}/_search")
+        .times(1)
+        .reply(404)
+        .header("x-elastic-product", "Elasticsearch")
+        .json(
+            {
+                "error": {
+                    "root_cause": [
+                        {
+                            "type": "search_context_missing_exception",
+                            "reason": "No search context found for id [1]",
+                        }
+                    ],
+                    "type": "search_phase_execution_exception",
+                    "reason": "all shards failed",
+                },
+                "status": 404,
+            }
+        )
+        .mock
+    )
+
+    serializer = image_media_type_config.search_request_serializer(
+        data={"q": "bird perched", "unstable__cursor": ""},
+        context={"media_type": image_media_type_config.media_type},
+    )
+    serializer.is_valid()
+    cursor = serializer.validated_data["cursor"].advance("pit_2", [7.5, 2])
+    with pytest.raises(ExpiredCursorError):
+        search_controller.query_media_by_cursor(
+            search_params=serializer,
+            origin_index=image_media_type_config.origin_index,
+            exact_index=True,
+            page_size=2,
+            filter_dead=False,
+            cursor=cursor,
+        )
+
+    assert mock_search.matches[0].json["pit"] == {"id": "pit_2", "keep_alive": "5m"}
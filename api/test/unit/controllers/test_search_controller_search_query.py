@@ -1,35 +1,28 @@
+from datetime import datetime, timezone
+
 import pytest
 from elasticsearch_dsl import Q
 
 from api.constants.parameters import COLLECTION, TAG
 from api.controllers import search_controller
-from api.controllers.search_controller import (
-    DEFAULT_SQS_FLAGS,
-    FILTERED_SOURCES_CACHE_KEY,
-    FILTERED_SOURCES_CACHE_VERSION,
-)
+from api.controllers.search_controller import DEFAULT_SQS_FLAGS
+from test.factory.models.content_source import ContentSourceFactory
 
 
 pytestmark = pytest.mark.django_db
 
 
 @pytest.fixture
-def excluded_sources_cache(django_cache, monkeypatch):
-    cache = django_cache
-    monkeypatch.setattr("api.controllers.search_controller.cache", cache)
-
+def excluded_source():
     excluded_source = "excluded_source"
-    cache_value = [excluded_source]
-    cache.set(
-        key=FILTERED_SOURCES_CACHE_KEY,
-        version=FILTERED_SOURCES_CACHE_VERSION,
-        value=cache_value,
-        timeout=1,
+    ContentSourceFactory.create(
+        created_on=datetime.now(tz=timezone.utc),
+        source_identifier=excluded_source,
+        source_name="Excluded Source",
+        filter_content=True,
     )
 
-    yield excluded_source
-
-    cache.delete(FILTERED_SOURCES_CACHE_KEY, version=FILTERED_SOURCES_CACHE_VERSION)
+    return excluded_source
 
 
 def test_create_search_query_empty(media_type_config, anon_request):
@@ -289,7 +282,7 @@ def test_create_search_query_q_search_license_license_type_creates_2_terms_filte
 
 def test_create_search_query_empty_with_dynamically_excluded_sources(
     image_media_type_config,
-    excluded_sources_cache,
+    excluded_source,
     anon_request,
 ):
     serializer = image_media_type_config.search_request_serializer(
@@ -307,7 +300,7 @@ def test_create_search_query_empty_with_dynamically_excluded_sources(
     assert actual_query_clauses == {
         "must_not": [
             {"term": {"mature": True}},
-            {"terms": {"source": [excluded_sources_cache]}},
+            {"terms": {"source": [excluded_source]}},
         ],
         "must": [{"match_all": {}}],
         "should": [
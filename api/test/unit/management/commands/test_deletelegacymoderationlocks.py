@@ -0,0 +1,21 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from api.utils.moderation_lock import LOCKS_KEY, LockManager
+
+
+def test_deletes_only_legacy_locks(redis):
+    for username in ["one", "two", "three"]:
+        redis.zadd(f"moderation_lock:{username}", {"image:abc": 1})
+    LockManager("image").add_locks("one", "abc")
+
+    out = StringIO()
+    call_command(
+        "deletelegacymoderationlocks", batch_size=2, stdout=out, stderr=StringIO()
+    )
+
+    assert "Deleted 3 legacy moderation locks!" in out.getvalue()
+    assert redis.keys("moderation_lock:*") == []
+    # The current locks are left as they are
+    assert redis.zrange(LOCKS_KEY, 0, -1) == [b"one:image:abc"]
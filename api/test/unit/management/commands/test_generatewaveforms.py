@@ -30,7 +30,7 @@ def call_generatewaveforms(mock_generate_peaks: mock.MagicMock) -> tuple[str, st
 def assert_all_audio_have_waveforms():
     assert (
         list(
-            AudioAddOn.objects.filter(waveform_peaks__isnull=False).values_list(
+            AudioAddOn.objects.filter(waveform_peaks_packed__isnull=False).values_list(
                 "audio_identifier"
             )
         ).sort()
@@ -56,7 +56,7 @@ def test_does_not_reprocess_existing_waveforms():
     AudioAddOnFactory.create_batch(3)
 
     # Create an add on that doesn't have a waveform, this one should get processed as well
-    null_waveform_addon = AudioAddOnFactory.create(waveform_peaks=None)
+    null_waveform_addon = AudioAddOnFactory.create(waveform_peaks_packed=None)
     waveformless_audio.append(
         Audio.objects.get(identifier=null_waveform_addon.audio_identifier)
     )
@@ -136,7 +136,7 @@ def test_logs_and_continues_if_waveform_generation_fails(
 
     failed_audio = Audio.objects.exclude(
         identifier__in=AudioAddOn.objects.filter(
-            waveform_peaks__isnull=False
+            waveform_peaks_packed__isnull=False
         ).values_list("audio_identifier", flat=True)
     )
 
@@ -144,7 +144,7 @@ def test_logs_and_continues_if_waveform_generation_fails(
     assert f"Unable to process {failed_audio.first().identifier}" in err.getvalue()
 
     assert (
-        AudioAddOn.objects.filter(waveform_peaks__isnull=False).count()
+        AudioAddOn.objects.filter(waveform_peaks_packed__isnull=False).count()
         == audio_count - 1
     )
 
@@ -169,12 +169,13 @@ def test_keyboard_interrupt_should_halt_processing(mock_generate_peaks):
 
     failed_audio = Audio.objects.exclude(
         identifier__in=AudioAddOn.objects.filter(
-            waveform_peaks__isnull=False
+            waveform_peaks_packed__isnull=False
         ).values_list("audio_identifier", flat=True)
     )
 
     assert failed_audio.count() == audio_count - interrupt_at
 
     assert (
-        AudioAddOn.objects.filter(waveform_peaks__isnull=False).count() == interrupt_at
+        AudioAddOn.objects.filter(waveform_peaks_packed__isnull=False).count()
+        == interrupt_at
     )
@@ -0,0 +1,37 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+import factory
+import pytest
+
+from api.models.audio import AudioAddOn
+from test.factory.faker import WaveformProvider
+from test.factory.models.audio import AudioAddOnFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_packs_float_array_peaks():
+    waveforms = {
+        add_on.audio_identifier: add_on.waveform_peaks
+        for add_on in AudioAddOnFactory.create_batch(
+            5,
+            waveform_peaks=factory.LazyFunction(WaveformProvider.generate_waveform),
+            waveform_peaks_packed=None,
+        )
+    }
+    packed_add_on = AudioAddOnFactory.create()
+    packed_peaks = bytes(packed_add_on.waveform_peaks_packed)
+
+    out = StringIO()
+    call_command("packwaveforms", batch_size=2, stdout=out, stderr=StringIO())
+
+    assert "Packing waveforms for 5 records" in out.getvalue()
+    assert not AudioAddOn.objects.filter(waveform_peaks__isnull=False).exists()
+    for identifier, peaks in waveforms.items():
+        assert AudioAddOn.objects.get(audio_identifier=identifier).peaks == peaks
+    # Peaks which are already packed are left as they are
+    packed_add_on.refresh_from_db()
+    assert bytes(packed_add_on.waveform_peaks_packed) == packed_peaks
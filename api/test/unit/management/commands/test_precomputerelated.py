@@ -0,0 +1,70 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+import pytest
+from elasticsearch_dsl.response import Hit
+
+from api.utils import related_media_cache
+
+
+@pytest.fixture(autouse=True)
+def filtered_index_name():
+    with (
+        mock.patch(
+            "api.management.commands.precomputerelated.get_filtered_index_name",
+            return_value="image-1-filtered",
+        ),
+        mock.patch(
+            "api.utils.related_media_cache.get_filtered_index_name",
+            return_value="image-1-filtered",
+        ),
+    ):
+        yield
+
+
+def get_related(identifier, index, filter_dead):
+    if identifier == "deindexed":
+        raise IndexError
+    return [
+        Hit(
+            {
+                "_source": {
+                    "identifier": f"{identifier}-related",
+                    "url": f"https://example.com/{identifier}-related.jpg",
+                    "provider": "flickr",
+                }
+            }
+        )
+    ]
+
+
+def test_precomputes_related_media_of_missing_items():
+    for identifier in ["a", "b", "deindexed"]:
+        related_media_cache.record_request("image", identifier)
+    precomputed = [{"identifier": "precomputed", "url": "", "provider": "flickr"}]
+    related_media_cache.set_related_results(
+        "image", "image-1-filtered", {"a": precomputed}
+    )
+
+    with mock.patch(
+        "api.management.commands.precomputerelated.query_related_media",
+        side_effect=get_related,
+    ) as query_related_media:
+        out = StringIO()
+        call_command(
+            "precomputerelated", media_type="image", stdout=out, stderr=StringIO()
+        )
+
+    assert "Precomputing related media for 2 items" in out.getvalue()
+    assert query_related_media.call_count == 2
+    assert related_media_cache.get_related_results("image", "a") == precomputed
+    assert related_media_cache.get_related_results("image", "b") == [
+        {
+            "identifier": "b-related",
+            "url": "https://example.com/b-related.jpg",
+            "provider": "flickr",
+        }
+    ]
+    assert related_media_cache.get_related_results("image", "deindexed") is None
@@ -28,11 +28,10 @@ def test_audio_waveform_caches(generate_peaks_mock, audio_fixture):
     assert AudioAddOn.objects.count() == 0
     assert audio_fixture.get_or_create_waveform() == mock_waveform
     assert AudioAddOn.objects.count() == 1
-    # Ensure the waveform was saved
-    assert (
-        AudioAddOn.objects.get(audio_identifier=audio_fixture.identifier).waveform_peaks
-        == mock_waveform
-    )
+    # Ensure the waveform was saved, in the packed format
+    add_on = AudioAddOn.objects.get(audio_identifier=audio_fixture.identifier)
+    assert add_on.waveform_peaks is None
+    assert add_on.peaks == mock_waveform
     assert audio_fixture.get_or_create_waveform() == mock_waveform
     # Should only be called once if Audio.get_or_create_waveform is using the DB value on subsequent calls
     generate_peaks_mock.assert_called_once()
@@ -41,3 +40,13 @@ def test_audio_waveform_caches(generate_peaks_mock, audio_fixture):
     audio_fixture.delete()
 
     assert AudioAddOn.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_audio_waveform_reads_float_array_peaks(audio_fixture):
+    mock_waveform = WaveformProvider.generate_waveform()
+    AudioAddOn.objects.create(
+        audio_identifier=audio_fixture.identifier, waveform_peaks=mock_waveform
+    )
+
+    assert audio_fixture.get_or_create_waveform() == mock_waveform
@@ -1,9 +1,11 @@
 import uuid
+from base64 import b64decode
 
 import pytest
 
-from api.models.audio import Audio
+from api.models.audio import Audio, AudioAddOn
 from api.serializers.audio_serializers import AudioSerializer
+from api.utils.waveform import unpack_peaks
 
 
 @pytest.fixture
@@ -34,6 +36,27 @@ def test_audio_serializer_with_peaks_param(audio_fixture, anon_request, include_
     assert ("peaks" in audio_serializer.data) is include_peaks
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("peaks_encoding", ["list", "packed"])
+def test_audio_serializer_peaks_encoding(audio_fixture, anon_request, peaks_encoding):
+    peaks = [0.25, 0.5, 1]
+    add_on = AudioAddOn(audio_identifier=audio_fixture.identifier)
+    add_on.set_peaks(peaks)
+    mock_ctx = {
+        "request": anon_request,
+        "validated_data": {"peaks": True, "peaks_encoding": peaks_encoding},
+        "addons": {audio_fixture.identifier: add_on},
+    }
+
+    audio_serializer = AudioSerializer(instance=audio_fixture, context=mock_ctx)
+
+    if peaks_encoding == "packed":
+        packed = b64decode(audio_serializer.data["peaks"])
+        assert unpack_peaks(packed) == peaks
+    else:
+        assert audio_serializer.data["peaks"] == peaks
+
+
 # https://github.com/WordPress/openverse/issues/3930
 @pytest.mark.django_db
 def test_audio_serializer_with_non_required_alt_audio_fields_missing(anon_request):
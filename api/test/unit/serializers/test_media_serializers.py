@@ -136,6 +136,49 @@ def test_search_request_serializer_include_sensitive_results_malformed_request(d
     assert not serializer.is_valid()
 
 
+@pytest.mark.parametrize(
+    "data, is_valid",
+    (
+        ({"q": "cat"}, True),
+        ({"q": "cat", "page_size": 10}, True),
+        ({"q": "dog"}, False),
+        ({"q": "cat", "page": 2}, False),
+    ),
+)
+def test_search_request_serializer_cursor_validation(data: dict, is_valid):
+    serializer = MediaSearchRequestSerializer(
+        data={"q": "cat", "unstable__cursor": ""}, context={"media_type": "image"}
+    )
+    assert serializer.is_valid()
+    cursor = serializer.validated_data["cursor"]
+    assert (cursor.page, cursor.pit_id, cursor.search_after) == (1, None, None)
+
+    next_cursor = cursor.advance("pit_id", [7.5, 3])
+    serializer = MediaSearchRequestSerializer(
+        data=data | {"unstable__cursor": next_cursor.encode()},
+        context={"media_type": "image"},
+    )
+    assert serializer.is_valid() == is_valid
+    if is_valid:
+        assert serializer.validated_data["cursor"] == next_cursor
+        assert serializer.validated_data["page"] == 2
+
+
+def test_search_request_serializer_rejects_altered_cursor():
+    serializer = MediaSearchRequestSerializer(
+        data={"q": "cat", "unstable__cursor": ""}, context={"media_type": "image"}
+    )
+    assert serializer.is_valid()
+    token = serializer.validated_data["cursor"].advance("pit_id", [7.5, 3]).encode()
+    payload, signature = token.rsplit(":", 1)
+
+    serializer = MediaSearchRequestSerializer(
+        data={"q": "cat", "unstable__cursor": f"{payload}:{signature[::-1]}"},
+        context={"media_type": "image"},
+    )
+    assert not serializer.is_valid()
+
+
 @pytest.mark.django_db
 @patch("django.conf.settings.ES")
 @pytest.mark.parametrize(
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from rest_framework.renderers import JSONRenderer
+
+import pytest
+
+from api.serializers.fields import SchemableHyperlinkedIdentityField
+
+
+def _render(media_type_config, instance, context, use_plan, **kwargs):
+    with mock.patch("django.conf.settings.USE_SERIALIZATION_PLAN", use_plan):
+        serializer = media_type_config.model_serializer(
+            instance, context=context, **kwargs
+        )
+        return JSONRenderer().render(serializer.data)
+
+
+@pytest.mark.django_db
+def test_plan_output_matches_drf(media_type_config, anon_request):
+    model = media_type_config.model_factory.create(sensitive_text=True)
+    context = {
+        "request": anon_request,
+        "sensitive_text_result_identifiers": {str(model.identifier)},
+        "validated_data": {"peaks": True},
+    }
+
+    expected = _render(media_type_config, model, context, use_plan=False)
+    actual = _render(media_type_config, model, context, use_plan=True)
+
+    assert actual == expected
+
+
+@pytest.mark.django_db
+def test_plan_output_matches_drf_for_many(media_type_config, anon_request):
+    models = media_type_config.model_factory.create_batch(size=5)
+    # Missing metadata exercises the fallback for the license URL
+    models[0].meta_data = None
+    models[1].creator_url = "example.com/creator"
+    context = {"request": anon_request}
+
+    expected = _render(media_type_config, models, context, use_plan=False, many=True)
+    actual = _render(media_type_config, models, context, use_plan=True, many=True)
+
+    assert actual == expected
+
+
+@pytest.mark.django_db
+def test_plan_reverses_hyperlinks_once_per_page(media_type_config, anon_request):
+    models = media_type_config.model_factory.create_batch(size=5)
+    serializer = media_type_config.model_serializer(
+        models, many=True, context={"request": anon_request}
+    )
+    hyperlink_count = sum(
+        isinstance(field, SchemableHyperlinkedIdentityField)
+        for field in serializer.child.fields.values()
+    )
+
+    with mock.patch.object(
+        SchemableHyperlinkedIdentityField,
+        "get_url",
+        autospec=True,
+        side_effect=SchemableHyperlinkedIdentityField.get_url,
+    ) as mock_get_url:
+        data = serializer.data
+
+    assert mock_get_url.call_count == hyperlink_count
+    for model, item in zip(models, data):
+        assert item["detail_url"].endswith(f"/{model.identifier}/")
@@ -1,9 +1,14 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
 import pytest
 
-from api.utils.drf_renderer import BrowsableAPIRendererWithoutForms
+from api.utils.drf_renderer import BrowsableAPIRendererWithoutForms, FastJSONRenderer
 
 
 @pytest.fixture
@@ -62,3 +67,29 @@ def test_without_forms_renderer_get_rendered_html_form_empty(method, api_request
     data = {}
 
     assert cls.get_rendered_html_form(data, view, method, api_request) == ""
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"title": "A photo", "tags": [{"name": "cat", "accuracy": 0.998}]},
+        {"title": "Non-ASCII: é 中文 🐈", "separators": "\u2028 \u2029"},
+        {"small": 1e-05, "large": 1e16, "fine": [0.0001, 123.5, -0.0]},
+        {"id": uuid.UUID(int=1), "date": datetime.datetime(2024, 1, 1, 12, 30)},
+        {"decimal": Decimal("1.50"), "set": {1}, "none": None},
+        {1: "non-string key"},
+        [],
+        None,
+    ),
+)
+def test_fast_json_renderer_matches_json_renderer(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_json_renderer_falls_back_for_indented_output():
+    data = {"title": "A photo"}
+
+    actual = FastJSONRenderer().render(data, "application/json; indent=2")
+
+    assert actual == JSONRenderer().render(data, "application/json; indent=2")
+    assert b"\n" in actual
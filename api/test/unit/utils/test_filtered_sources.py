@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+import pytest
+
+from api.models import ContentSource
+from api.utils import filtered_sources
+
+
+@pytest.fixture
+def content_source():
+    return ContentSource.objects.create(
+        created_on=datetime.now(tz=timezone.utc),
+        source_identifier="test_filtered_sources_source",
+        source_name="Test Source",
+        domain_name="https://example.com",
+        filter_content=False,
+    )
+
+
+@pytest.fixture
+def check_version_on_every_use(monkeypatch):
+    monkeypatch.setattr(filtered_sources, "FILTERED_SOURCES_VERSION_CHECK_INTERVAL", 0)
+
+
+@pytest.mark.django_db
+def test_filtered_sources_follow_changes_in_this_process(content_source):
+    assert filtered_sources.get_filtered_sources() == frozenset()
+
+    content_source.filter_content = True
+    content_source.save()
+    assert filtered_sources.get_filtered_sources() == {content_source.source_identifier}
+
+
+@pytest.mark.django_db
+def test_filtered_sources_follow_changes_in_other_processes(
+    content_source, check_version_on_every_use
+):
+    assert filtered_sources.get_filtered_sources() == frozenset()
+
+    # Another process hides the source, which does not send signals to this one
+    ContentSource.objects.filter(pk=content_source.pk).update(filter_content=True)
+    assert filtered_sources.get_filtered_sources() == frozenset()
+
+    cache.incr(filtered_sources.FILTERED_SOURCES_VERSION_KEY, ignore_key_check=True)
+    assert filtered_sources.get_filtered_sources() == {content_source.source_identifier}
+
+
+@pytest.mark.django_db
+def test_filtered_sources_are_kept_without_redis(
+    content_source, check_version_on_every_use, unreachable_django_cache, monkeypatch
+):
+    monkeypatch.setattr("api.utils.filtered_sources.cache", unreachable_django_cache)
+    monkeypatch.setattr(
+        "api.utils.search_response_cache.cache", unreachable_django_cache
+    )
+    content_source.filter_content = True
+    content_source.save()
+
+    assert filtered_sources.get_filtered_sources() == {content_source.source_identifier}
+    assert filtered_sources.get_filtered_sources() == {content_source.source_identifier}
@@ -0,0 +1,116 @@
+import struct
+from pathlib import Path
+
+import pook
+import pytest
+from asgiref.sync import async_to_sync
+
+from api.utils.aiohttp import get_aiohttp_session
+from api.utils.image_dimensions import (
+    MAX_PROBE_BYTES,
+    parse_dimensions,
+    probe_dimensions,
+)
+
+
+_MOCK_IMAGE_PATH = Path(__file__).parent / ".." / ".." / "factory"
+_MOCK_IMAGE_BYTES = (_MOCK_IMAGE_PATH / "sample-image.jpg").read_bytes()
+_MOCK_IMAGE_DIMENSIONS = (2687, 2687)
+
+TEST_IMAGE_URL = "https://example.com/path/to/image"
+
+PNG_HEADER = (
+    b"\x89PNG\r\n\x1a\n"
+    + b"\x00\x00\x00\x0dIHDR"
+    + struct.pack(">II", 640, 480)
+    + b"\x08\x02\x00\x00\x00"
+)
+GIF_HEADER = b"GIF89a" + struct.pack("<HH", 640, 480) + b"\xf7\x00\x00"
+
+
+def _webp(chunk: bytes, payload: bytes) -> bytes:
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+WEBP_LOSSY_HEADER = _webp(
+    b"VP8 ", b"\x30\x01\x00" + b"\x9d\x01\x2a" + struct.pack("<HH", 640, 480)
+)
+WEBP_LOSSLESS_HEADER = _webp(
+    b"VP8L", b"\x2f" + struct.pack("<I", (640 - 1) | ((480 - 1) << 14))
+)
+WEBP_EXTENDED_HEADER = _webp(
+    b"VP8X",
+    b"\x10\x00\x00\x00"
+    + (640 - 1).to_bytes(3, "little")
+    + (480 - 1).to_bytes(3, "little"),
+)
+
+
+async def _probe(url):
+    session = await get_aiohttp_session()
+    return await probe_dimensions(session, url)
+
+
+# See ``test_image_proxy.py`` for why these tests are not async
+probe = async_to_sync(_probe)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(PNG_HEADER, id="png"),
+        pytest.param(GIF_HEADER, id="gif"),
+        pytest.param(WEBP_LOSSY_HEADER, id="webp_lossy"),
+        pytest.param(WEBP_LOSSLESS_HEADER, id="webp_lossless"),
+        pytest.param(WEBP_EXTENDED_HEADER, id="webp_extended"),
+    ],
+)
+def test_parse_dimensions(data):
+    assert parse_dimensions(data) == (640, 480)
+
+
+def test_parse_dimensions_jpeg():
+    assert parse_dimensions(_MOCK_IMAGE_BYTES) == _MOCK_IMAGE_DIMENSIONS
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(PNG_HEADER[:20], id="truncated_png"),
+        pytest.param(WEBP_LOSSY_HEADER[:26], id="truncated_webp"),
+        pytest.param(_MOCK_IMAGE_BYTES[:20], id="truncated_jpeg"),
+        pytest.param(b"<svg></svg>", id="unsupported"),
+        pytest.param(b"", id="empty"),
+    ],
+)
+def test_parse_dimensions_returns_none_when_undetermined(data):
+    assert parse_dimensions(data) is None
+
+
+@pytest.mark.pook
+def test_probe_dimensions_requests_leading_bytes():
+    mock = (
+        pook.get(TEST_IMAGE_URL)
+        .header("Range", f"bytes=0-{MAX_PROBE_BYTES - 1}")
+        .reply(206)
+        .body(_MOCK_IMAGE_BYTES[:MAX_PROBE_BYTES])
+        .mock
+    )
+
+    assert probe(TEST_IMAGE_URL) == _MOCK_IMAGE_DIMENSIONS
+    assert mock.matched
+
+
+@pytest.mark.pook
+def test_probe_dimensions_handles_ignored_range():
+    pook.get(TEST_IMAGE_URL).reply(200).body(_MOCK_IMAGE_BYTES)
+
+    assert probe(TEST_IMAGE_URL) == _MOCK_IMAGE_DIMENSIONS
+
+
+@pytest.mark.pook
+def test_probe_dimensions_returns_none_on_upstream_error():
+    pook.get(TEST_IMAGE_URL).reply(404)
+
+    assert probe(TEST_IMAGE_URL) is None
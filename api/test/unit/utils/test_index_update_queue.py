@@ -0,0 +1,116 @@
+from unittest import mock
+
+import pytest
+from elasticsearch.helpers import BulkIndexError
+
+from api.utils.index_update_queue import get_current_queue, index_update_queue
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _bulk_result(statuses: dict[str, int] | None = None):
+    """Mock ``streaming_bulk`` to respond with the given status for each ``_id``."""
+
+    statuses = statuses or {}
+
+    def streaming_bulk(client, actions, **kwargs):
+        for action in actions:
+            status = statuses.get(str(action["_id"]), 200)
+            item = {
+                action["_op_type"]: {
+                    "_index": action["_index"],
+                    "_id": action["_id"],
+                    "status": status,
+                }
+            }
+            yield status < 300, item
+
+    return streaming_bulk
+
+
+@pytest.fixture
+def es(settings):
+    settings.ES = mock.MagicMock()
+    return settings.ES
+
+
+@pytest.fixture
+def streaming_bulk():
+    with mock.patch(
+        "api.utils.index_update_queue.helpers.streaming_bulk",
+        side_effect=_bulk_result(),
+    ) as mock_bulk:
+        yield mock_bulk
+
+
+def test_queue_sends_one_bulk_request_per_index(es, streaming_bulk, media_type_config):
+    media = media_type_config.model_factory.create_batch(size=3)
+
+    with index_update_queue() as queue:
+        for item in media:
+            media_type_config.sensitive_class(media_obj=item).save()
+        assert len(queue) == 6
+        streaming_bulk.assert_not_called()
+
+    assert streaming_bulk.call_count == 2
+    for call, index in zip(streaming_bulk.call_args_list, media_type_config.indexes):
+        actions = call.args[1]
+        assert {action["_index"] for action in actions} == {index}
+        assert [action["_id"] for action in actions] == [item.id for item in media]
+        assert all(action["doc"] == {"mature": True} for action in actions)
+
+    es.indices.refresh.assert_called_once_with(index=list(media_type_config.indexes))
+
+
+def test_queue_can_skip_refresh(es, streaming_bulk, media_type_config):
+    media_ids = [media_type_config.model_factory.create().id for _ in range(2)]
+
+    with index_update_queue(refresh=False):
+        media_type_config.sensitive_class._bulk_update_es(True, media_ids)
+
+    assert streaming_bulk.call_count == 2
+    es.indices.refresh.assert_not_called()
+
+
+def test_nested_queues_share_the_outermost_queue(es, streaming_bulk, media_type_config):
+    media_ids = [media_type_config.model_factory.create().id for _ in range(2)]
+
+    with index_update_queue() as outer:
+        with index_update_queue() as inner:
+            assert inner is outer
+            media_type_config.deleted_class._bulk_update_es(media_ids)
+        streaming_bulk.assert_not_called()
+        assert get_current_queue() is outer
+
+    assert get_current_queue() is None
+    assert streaming_bulk.call_count == 2
+    es.indices.refresh.assert_called_once()
+
+
+def test_queue_ignores_missing_documents_and_reports_failures(es, media_type_config):
+    missing, failing, updated = (
+        media_type_config.model_factory.create().id for _ in range(3)
+    )
+    side_effect = _bulk_result({str(missing): 404, str(failing): 400})
+
+    with mock.patch(
+        "api.utils.index_update_queue.helpers.streaming_bulk",
+        side_effect=side_effect,
+    ):
+        with pytest.raises(BulkIndexError) as exc_info, index_update_queue():
+            media_type_config.sensitive_class._bulk_update_es(
+                True, [missing, failing, updated]
+            )
+
+        assert [item["update"]["_id"] for item in exc_info.value.errors] == [
+            failing,
+            failing,
+        ]
+
+        with index_update_queue(raise_on_error=False) as queue:
+            media_type_config.sensitive_class._bulk_update_es(
+                True, [missing, failing, updated]
+            )
+
+        assert len(queue.failures) == 2
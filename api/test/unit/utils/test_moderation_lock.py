@@ -5,7 +5,7 @@ from django.contrib.auth.models import Group
 import pytest
 from freezegun import freeze_time
 
-from api.utils.moderation_lock import TTL, LockManager
+from api.utils.moderation_lock import LOCKS_KEY, TTL, LockManager
 
 
 pytestmark = pytest.mark.django_db
@@ -79,3 +79,25 @@ def test_lock_manager_prunes_after_timeout():
 
     with freeze_time(now + timedelta(seconds=TTL + 1)):
         assert lm.moderator_set(10) == set()
+
+
+def test_lock_manager_tracks_locks_of_all_media_types(redis):
+    image_lm = LockManager("image")
+    audio_lm = LockManager("audio")
+    now = datetime.now()
+
+    with freeze_time(now):
+        image_lm.add_locks("one", 10)
+        audio_lm.add_locks("one", 10)
+        image_lm.add_locks("two", 10)
+
+    with freeze_time(now + timedelta(seconds=TTL / 2)):
+        image_lm.add_locks("two", 20)
+        assert image_lm.object_set("one") == {"image:10", "audio:10"}
+        assert image_lm.moderator_set(10) == {"one", "two"}
+        assert audio_lm.moderator_set(10) == {"one"}
+
+    with freeze_time(now + timedelta(seconds=TTL + 1)):
+        assert image_lm.prune() == {"two": {"image:20"}}
+        # Expired locks are deleted with a single range removal
+        assert redis.zcard(LOCKS_KEY) == 1
@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+
+from api.utils import related_media_cache
+
+
+@pytest.fixture(autouse=True)
+def filtered_index_name():
+    with mock.patch(
+        "api.utils.related_media_cache.get_filtered_index_name",
+        return_value="image-1-filtered",
+    ) as get_filtered_index_name:
+        yield get_filtered_index_name
+
+
+def test_most_requested_items_span_two_weeks():
+    with mock.patch(
+        "api.utils.related_media_cache.get_weekly_timestamp",
+        side_effect=lambda weeks_ago=0: f"week-{weeks_ago}",
+    ):
+        for identifier in ["a", "b", "b", "c", "c", "c"]:
+            related_media_cache.record_request("image", identifier)
+
+    with mock.patch(
+        "api.utils.related_media_cache.get_weekly_timestamp",
+        side_effect=lambda weeks_ago=0: f"week-{weeks_ago - 1}",
+    ):
+        for identifier in ["a", "a", "a"]:
+            related_media_cache.record_request("image", identifier)
+
+        assert related_media_cache.get_most_requested("image", 2) == ["a", "c"]
+
+
+def test_related_results_are_not_used_across_index_promotions(
+    filtered_index_name,
+):
+    related = [{"identifier": "b", "url": "https://example.com/b", "provider": "x"}]
+    assert related_media_cache.get_related_results("image", "a") is None
+    assert related_media_cache.get_missing_identifiers(
+        "image", "image-1-filtered", ["a", "b"]
+    ) == ["a", "b"]
+
+    related_media_cache.set_related_results("image", "image-1-filtered", {"a": related})
+    assert related_media_cache.get_related_results("image", "a") == related
+    assert related_media_cache.get_missing_identifiers(
+        "image", "image-1-filtered", ["a", "b"]
+    ) == ["b"]
+
+    filtered_index_name.return_value = "image-2-filtered"
+    assert related_media_cache.get_related_results("image", "a") is None
+
+
+def test_related_results_are_not_used_without_redis(
+    unreachable_django_cache, monkeypatch
+):
+    monkeypatch.setattr("api.utils.related_media_cache.cache", unreachable_django_cache)
+
+    assert related_media_cache.get_related_results("image", "a") is None
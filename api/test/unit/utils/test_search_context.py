@@ -1,7 +1,9 @@
+from unittest import mock
+
 import pook
 import pytest
 
-from api.utils.search_context import SearchContext
+from api.utils.search_context import SearchContext, evict_sensitivity
 
 
 pytestmark = pytest.mark.django_db
@@ -71,3 +73,51 @@ def test_sensitive_text(
         if has_sensitive_text and setting_enabled
         else set(),
     )
+
+
+@pytest.mark.parametrize(
+    "has_sensitive_text",
+    (True, False),
+    ids=lambda x: "has_sensitive_text" if x else "no_sensitive_text",
+)
+def test_build_for_result_caches_sensitivity(
+    media_type_config, has_sensitive_text, settings, django_cache
+):
+    settings.ENABLE_FILTERED_INDEX_QUERIES = True
+    origin_index = media_type_config.origin_index
+    _, hit = media_type_config.model_factory.create(
+        mature_reported=False,
+        provider_marked_mature=False,
+        sensitive_text=has_sensitive_text,
+        with_hit=True,
+    )
+    identifier = hit.identifier
+    expected = SearchContext(
+        [identifier], {identifier} if has_sensitive_text else set()
+    )
+
+    with mock.patch(
+        "api.utils.search_context.get_filtered_index_name", return_value="filtered-1"
+    ):
+        assert SearchContext.build_for_result(identifier, origin_index) == expected
+
+        with mock.patch.object(SearchContext, "build", return_value=expected) as build:
+            # The sensitivity is cached
+            assert SearchContext.build_for_result(identifier, origin_index) == expected
+            build.assert_not_called()
+
+            # Until it is evicted, e.g. by moderation
+            evict_sensitivity(origin_index, [identifier])
+            assert SearchContext.build_for_result(identifier, origin_index) == expected
+            build.assert_called_once()
+
+    # The cached sensitivity is not used with a new filtered index
+    with (
+        mock.patch(
+            "api.utils.search_context.get_filtered_index_name",
+            return_value="filtered-2",
+        ),
+        mock.patch.object(SearchContext, "build", return_value=expected) as build,
+    ):
+        assert SearchContext.build_for_result(identifier, origin_index) == expected
+        build.assert_called_once()
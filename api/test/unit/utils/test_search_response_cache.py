@@ -0,0 +1,63 @@
+from unittest import mock
+
+import pytest
+
+from api.utils import search_response_cache
+
+
+@pytest.fixture(autouse=True)
+def index_names():
+    with mock.patch.multiple(
+        "api.utils.search_response_cache",
+        get_index_name=mock.DEFAULT,
+        get_filtered_index_name=mock.DEFAULT,
+    ) as mocks:
+        mocks["get_index_name"].return_value = "image-1"
+        mocks["get_filtered_index_name"].return_value = "image-1-filtered"
+        yield mocks
+
+
+def get_key(params=None):
+    return search_response_cache.get_response_cache_key(
+        "https://api.example.com/", "image", params or {"q": "cat"}
+    )
+
+
+def test_response_is_cached_until_content_changes():
+    key = get_key()
+    assert search_response_cache.get_cached_response(key) is None
+
+    search_response_cache.cache_response(key, {"results": []})
+    assert search_response_cache.get_cached_response(key) == {"results": []}
+    assert get_key({"q": "dog"}) != key
+
+    search_response_cache.bump_content_epoch()
+    assert get_key() != key
+    assert search_response_cache.get_cached_response(get_key()) is None
+
+
+def test_response_is_not_cached_across_index_promotions(index_names):
+    key = get_key()
+
+    index_names["get_filtered_index_name"].return_value = "image-2-filtered"
+
+    assert get_key() != key
+
+
+def test_stale_response_is_refreshed_by_one_request(settings):
+    settings.SEARCH_RESPONSE_CACHE_TTL = 30
+    key = get_key()
+    search_response_cache.cache_response(key, {"results": []})
+
+    with mock.patch("time.time", return_value=search_response_cache.time.time() + 31):
+        # The first request refreshes the response, the others are served it
+        assert search_response_cache.get_cached_response(key) is None
+        assert search_response_cache.get_cached_response(key) == {"results": []}
+
+
+def test_responses_are_not_cached_without_redis(unreachable_django_cache, monkeypatch):
+    monkeypatch.setattr(
+        "api.utils.search_response_cache.cache", unreachable_django_cache
+    )
+
+    assert get_key() is None
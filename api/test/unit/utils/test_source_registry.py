@@ -0,0 +1,92 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from api.utils.source_registry import SourceRegistry
+
+
+@pytest.fixture
+def refresh_threads():
+    """Record the refresh threads started by the registry, so tests can join them."""
+
+    threads = []
+    thread_class = threading.Thread
+
+    def start_thread(*args, **kwargs):
+        thread = thread_class(*args, **kwargs)
+        threads.append(thread)
+        return thread
+
+    with mock.patch("api.utils.source_registry.threading.Thread", start_thread):
+        yield threads
+
+
+def test_sources_are_loaded_once_while_fresh():
+    load = mock.Mock(return_value={"flickr": 10})
+    registry = SourceRegistry(load, ttl=60)
+
+    assert registry.get("image") == {"flickr": 10}
+    assert registry.get("image") == {"flickr": 10}
+    load.assert_called_once_with("image")
+
+
+def test_stale_sources_are_served_while_refreshed_in_background(refresh_threads):
+    release = threading.Event()
+    load = mock.Mock(side_effect=[{"flickr": 1}, {"flickr": 2}])
+    registry = SourceRegistry(load, ttl=0)
+    assert registry.get("image") == {"flickr": 1}
+
+    load.side_effect = lambda index: release.wait(timeout=5) and {"flickr": 2}
+    # Both requests get the stale sources, and only one refresh is started
+    assert registry.get("image") == {"flickr": 1}
+    assert registry.get("image") == {"flickr": 1}
+    release.set()
+    assert len(refresh_threads) == 1
+    refresh_threads[0].join(timeout=5)
+
+    registry.ttl = 60
+    assert registry.get("image") == {"flickr": 2}
+
+
+def test_failed_refresh_keeps_sources(refresh_threads):
+    load = mock.Mock(side_effect=[{"flickr": 10}, ValueError("ES is down")])
+    registry = SourceRegistry(load, ttl=0)
+    registry.get("image")
+
+    assert registry.get("image") == {"flickr": 10}
+    refresh_threads[0].join(timeout=5)
+
+    registry.ttl = 60
+    assert registry.get("image") == {"flickr": 10}
+    assert load.call_count == 2
+
+
+def test_refresh_started_before_clear_is_discarded(refresh_threads):
+    release = threading.Event()
+    load = mock.Mock(return_value={"flickr": 1})
+    registry = SourceRegistry(load, ttl=0)
+    registry.get("image")
+
+    load.side_effect = lambda index: release.wait(timeout=5) and {"flickr": 1}
+    registry.get("image")
+    # The sources change while the refresh is loading the previous ones
+    registry.clear()
+    release.set()
+    refresh_threads[0].join(timeout=5)
+
+    load.side_effect = None
+    load.return_value = {"flickr": 2}
+    registry.ttl = 60
+    assert registry.get("image") == {"flickr": 2}
+
+
+def test_refresh_closes_database_connection(refresh_threads):
+    registry = SourceRegistry(mock.Mock(return_value={"flickr": 1}), ttl=0)
+    registry.get("image")
+
+    with mock.patch("api.utils.source_registry.connection") as connection:
+        registry.get("image")
+        refresh_threads[0].join(timeout=5)
+
+    connection.close.assert_called_once_with()
@@ -294,3 +294,50 @@ def test_rate_limit_headers_when_no_scope(
             assert response.status_code == 200
             # Headers are not set if Redis cannot cache request history.
             assert not headers
+
+
+@pytest.mark.django_db
+def test_throttled_requests_are_not_counted_by_other_throttles(request_factory):
+    class DummyBurstThrottle(throttle.BurstRateThrottle):
+        THROTTLE_RATES = {"anon_burst": "2/hour"}
+
+    class DummySustainedThrottle(throttle.SustainedRateThrottle):
+        THROTTLE_RATES = {"anon_sustained": "5/day"}
+
+    class ThrottledView(APIView):
+        throttle_classes = [DummyBurstThrottle, DummySustainedThrottle]
+
+        def get(self, request):
+            return HttpResponse("ok")
+
+    view = ThrottledView().as_view()
+    request = request_factory.get("/")
+
+    responses = [view(request) for _ in range(4)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429, 429]
+    # Only the allowed requests count against the sustained limit
+    assert [
+        response.headers["X-RateLimit-Available-anon_sustained"]
+        for response in responses
+    ] == ["4", "3", "3", "3"]
+    # The burst limit of 2/hour allows one request every 30 minutes
+    assert 1795 < int(responses[-1].headers["Retry-After"]) <= 1800
+
+
+@pytest.mark.django_db
+def test_get_requests_used(request_factory):
+    class ThrottledView(APIView):
+        throttle_classes = [throttle.TenPerDay]
+
+        def get(self, request):
+            return HttpResponse("ok")
+
+    view = ThrottledView().as_view()
+    request = request_factory.get("/")
+    for _ in range(3):
+        view(request)
+
+    ident = throttle.TenPerDay().get_ident(request)
+    assert throttle.TenPerDay().get_requests_used(ident) == 3
+    assert throttle.OnePerSecond().get_requests_used(ident) is None
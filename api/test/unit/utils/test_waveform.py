@@ -4,7 +4,13 @@ from pathlib import Path
 import pook
 import pytest
 
-from api.utils.waveform import UA_STRING, download_audio, generate_waveform
+from api.utils.waveform import (
+    UA_STRING,
+    download_audio,
+    generate_waveform,
+    pack_peaks,
+    unpack_peaks,
+)
 
 
 _MOCK_AUDIO_PATH = Path(__file__).parent / ".." / ".." / "factory"
@@ -44,3 +50,20 @@ def test_generate_waveform(audio, duration):
 
     json_out = generate_waveform(file_name, duration)
     assert len(json_out) > 0
+
+
+def test_packed_peaks_keep_five_decimals():
+    peaks = [0, 0.00002, 0.12346, 0.5, 0.99998, 1]
+
+    packed = pack_peaks(peaks)
+
+    # One byte for the version, then two bytes per peak
+    assert len(packed) == 1 + 2 * len(peaks)
+    assert unpack_peaks(memoryview(packed)) == peaks
+
+
+def test_unpack_peaks_rejects_unknown_versions():
+    packed = pack_peaks([0.5])
+
+    with pytest.raises(ValueError):
+        unpack_peaks(b"\x02" + packed[1:])
@@ -5,6 +5,17 @@ from django.db.utils import OperationalError
 import pook
 import pytest
 
+from api.utils.health_monitor import HEALTH_CHECKS, HealthMonitor
+
+
+@pytest.fixture(autouse=True)
+def health_monitor(redis):
+    # A new monitor checks the services on the first request, and its background
+    # thread does not check them again during the test
+    monitor = HealthMonitor(HEALTH_CHECKS, interval=3600)
+    with mock.patch("api.views.health_views.health_monitor", monitor):
+        yield monitor
+
 
 def mock_health_response(status="green", timed_out=False):
     return (
@@ -22,28 +33,54 @@ def mock_health_response(status="green", timed_out=False):
 
 @pytest.mark.django_db
 def test_health_check_plain(api_client):
-    res = api_client.get("/healthcheck/")
+    with pook.use():
+        mock_health_response(status="green")
+        res = api_client.get("/healthcheck/")
+
     assert res.status_code == 200
+    checks = res.json()["checks"]
+    assert checks.keys() == {"postgres", "elasticsearch", "redis"}
+    assert all(check["healthy"] for check in checks.values())
 
 
-def test_health_check_calls__check_db(api_client):
-    with mock.patch("api.views.health_views.HealthCheck._check_db") as mock_check_db:
-        res = api_client.get("/healthcheck/")
+@pytest.mark.django_db
+def test_health_check_serves_snapshot(api_client):
+    with mock.patch.dict(HEALTH_CHECKS, {"elasticsearch": mock.Mock()}):
+        with mock.patch(
+            "api.utils.health_monitor.connection.ensure_connection"
+        ) as mock_ensure_connection:
+            api_client.get("/healthcheck/", data={"check_es": True})
+            res = api_client.get("/healthcheck/", data={"check_es": True})
+
         assert res.status_code == 200
-        mock_check_db.assert_called_once()
+        mock_ensure_connection.assert_called_once()
+        HEALTH_CHECKS["elasticsearch"].assert_called_once()
 
 
-def test_health_check_calls__check_db_with_failure(api_client):
+def test_health_check_db_failure(api_client):
     with mock.patch(
-        "api.views.health_views.connection.ensure_connection"
+        "api.utils.health_monitor.connection.ensure_connection"
     ) as mock_ensure_connection:
         mock_ensure_connection.side_effect = OperationalError("Database has gone away")
-        res = api_client.get("/healthcheck/")
+        with pook.use():
+            mock_health_response(status="green")
+            res = api_client.get("/healthcheck/")
         assert res.status_code == 503
         assert res.json() == {"detail": "postgres: Database has gone away"}
         mock_ensure_connection.assert_called_once()
 
 
+@pytest.mark.django_db
+def test_health_check_stale_snapshot(api_client, settings):
+    settings.HEALTH_CHECK_MAX_AGE = 0
+    with pook.use():
+        mock_health_response(status="green")
+        res = api_client.get("/healthcheck/")
+
+    assert res.status_code == 503
+    assert res.json() == {"detail": "postgres: last checked 0s ago"}
+
+
 def test_health_check_es_timed_out(api_client):
     with pook.use():
         mock_health_response(timed_out=True)
@@ -70,3 +107,16 @@ def test_health_check_es_all_good(api_client):
         res = api_client.get("/healthcheck/", data={"check_es": True})
 
     assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_health_check_redis_unavailable(api_client, unreachable_redis):
+    with pook.use():
+        mock_health_response(status="green")
+        res = api_client.get("/healthcheck/")
+    assert res.status_code == 200
+    assert res.json()["checks"]["redis"]["healthy"] is False
+
+    res = api_client.get("/healthcheck/", data={"check_redis": True})
+    assert res.status_code == 503
+    assert res.json()["detail"].startswith("redis: ")
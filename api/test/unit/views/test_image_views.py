@@ -4,6 +4,7 @@ from pathlib import Path
 import pook
 import pytest
 
+from api.models import ImageAddOn
 from api.views.image_views import ImageViewSet
 from test.factory.models.image import ImageFactory
 
@@ -31,6 +32,52 @@ def test_oembed_sends_ua_header(api_client):
     assert res.status_code == 200
 
 
+@pytest.mark.django_db
+def test_oembed_probes_and_stores_missing_dimensions(api_client):
+    image = ImageFactory.create(width=None, height=None)
+    image.url = f"https://any.domain/any/path/{image.identifier}"
+    image.save()
+
+    with pook.use():
+        mock = (
+            pook.get(image.url)
+            .header("Range", "bytes=0-262143")
+            .reply(206)
+            .body(_MOCK_IMAGE_BYTES)
+            .mock
+        )
+        res = api_client.get("/v1/images/oembed/", data={"url": image.url})
+
+    assert mock.matched
+    assert res.status_code == 200
+    assert (res.json()["width"], res.json()["height"]) == (2687, 2687)
+
+    add_on = ImageAddOn.objects.get(image_identifier=image.identifier)
+    assert (add_on.width, add_on.height) == (2687, 2687)
+
+    # The stored dimensions are used without probing the image again
+    with pook.use():
+        res = api_client.get("/v1/images/oembed/", data={"url": image.url})
+
+    assert res.status_code == 200
+    assert (res.json()["width"], res.json()["height"]) == (2687, 2687)
+
+
+@pytest.mark.django_db
+def test_oembed_does_not_store_failed_probe(api_client):
+    image = ImageFactory.create(width=None, height=None)
+    image.url = f"https://any.domain/any/path/{image.identifier}"
+    image.save()
+
+    with pook.use():
+        pook.get(image.url).reply(404)
+        res = api_client.get("/v1/images/oembed/", data={"url": image.url})
+
+    assert res.status_code == 200
+    assert res.json()["width"] is None
+    assert not ImageAddOn.objects.filter(image_identifier=image.identifier).exists()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "smk_has_thumb, expected_thumb_url",
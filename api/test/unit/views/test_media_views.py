@@ -6,6 +6,8 @@ import pytest
 import pytest_django.asserts
 
 from api.models.models import ContentSource
+from api.utils.filtered_sources import get_filtered_sources
+from api.utils.search_cursor import ExpiredCursorError
 
 
 @pytest.mark.django_db
@@ -17,6 +19,8 @@ def test_list_query_count(api_client, media_type_config):
     results = media_type_config.model_factory.create_batch(size=num_results)
     for result in results:
         result.meta = None
+    # The hidden sources are loaded once per process, not for every request
+    get_filtered_sources()
 
     controller_ret = (
         results,
@@ -31,7 +35,7 @@ def test_list_query_count(api_client, media_type_config):
         ),
         patch(
             "api.serializers.media_serializers.search_controller",
-            get_sources=MagicMock(return_value={}),
+            get_available_sources=MagicMock(return_value={}),
         ),
         pytest_django.asserts.assertNumQueries(1),
     ):
@@ -40,9 +44,73 @@ def test_list_query_count(api_client, media_type_config):
     assert res.status_code == 200
 
 
+@pytest.mark.django_db
+def test_list_validates_query_params_once(api_client, media_type_config):
+    controller_ret = ([], 0, 0, {})
+    with (
+        patch(
+            "api.views.media_views.search_controller",
+            query_media=MagicMock(return_value=controller_ret),
+        ),
+        patch(
+            "api.serializers.media_serializers.search_controller",
+            get_available_sources=MagicMock(return_value={"flickr": 1}),
+        ) as serializer_controller,
+    ):
+        res = api_client.get(
+            f"/v1/{media_type_config.url_prefix}/", {"source": "flickr"}
+        )
+
+    assert res.status_code == 200
+    serializer_controller.get_available_sources.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_list_shares_responses_to_anonymous_requests(api_client, media_type_config):
+    controller_ret = ([], 0, 0, {})
+    with (
+        patch(
+            "api.views.media_views.search_controller",
+            query_media=MagicMock(return_value=controller_ret),
+        ) as controller,
+        patch.multiple(
+            "api.utils.search_response_cache",
+            get_index_name=MagicMock(return_value="index"),
+            get_filtered_index_name=MagicMock(return_value="index-filtered"),
+        ),
+    ):
+        responses = [
+            api_client.get(f"/v1/{media_type_config.url_prefix}/", {"q": "cat"})
+            for _ in range(2)
+        ]
+
+    assert [res.status_code for res in responses] == [200, 200]
+    assert responses[0].json() == responses[1].json()
+    controller.query_media.assert_called_once()
+    # The cached response is tallied like the search it replaces
+    controller.tally_results.assert_called_once_with(
+        controller.get_index.return_value, [], 1, 20
+    )
+
+
+@pytest.mark.django_db
+def test_list_rejects_expired_cursor(api_client, media_type_config):
+    with patch(
+        "api.views.media_views.search_controller",
+        query_media_by_cursor=MagicMock(side_effect=ExpiredCursorError("pit_1")),
+    ):
+        res = api_client.get(
+            f"/v1/{media_type_config.url_prefix}/", {"q": "cat", "unstable__cursor": ""}
+        )
+
+    assert res.status_code == 400
+    assert "expired" in res.json()["detail"]["unstable__cursor"][0]
+
+
 @pytest.mark.django_db
 def test_retrieve_query_count(api_client, media_type_config):
     media = media_type_config.model_factory.create()
+    get_filtered_sources()
 
     # This number goes up without `select_related` in the viewset queryset.
     with pytest_django.asserts.assertNumQueries(1):
@@ -72,6 +140,31 @@ def test_get_queryset_source_filtering(api_client, media_type_config, filter_con
     assert res.status_code == (404 if filter_content else 200)
 
 
+@pytest.mark.django_db
+def test_get_queryset_source_filtering_follows_content_source_changes(
+    api_client, media_type_config
+):
+    test_source = "test_source_filtering_source"
+    media = media_type_config.model_factory.create(source=test_source)
+    url = f"/v1/{media_type_config.url_prefix}/{media.identifier}/"
+
+    content_source = ContentSource.objects.create(
+        created_on=datetime.now(tz=timezone.utc),
+        source_identifier=test_source,
+        source_name="Test Source",
+        domain_name="https://example.com",
+        filter_content=False,
+    )
+    assert api_client.get(url).status_code == 200
+
+    content_source.filter_content = True
+    content_source.save()
+    assert api_client.get(url).status_code == 404
+
+    content_source.delete()
+    assert api_client.get(url).status_code == 200
+
+
 @pytest.mark.django_db
 def test_get_queryset_does_not_exclude_works_without_contentsource_entry(
     api_client, media_type_config
@@ -0,0 +1,141 @@
+r"""
+Stream files into Postgres with COPY, without extracting or buffering them.
+
+Provider data which arrives as large delimited files, possibly inside a zip
+archive or gzip-compressed, can be piped straight into ``COPY ... FROM STDIN``.
+Lines are decompressed as Postgres consumes them, so neither the decompressed
+file nor all of its contents are ever held on disk or in memory at once. Rows can
+be filtered out on the way, and the rows passed on to Postgres are counted.
+
+The delimited files are assumed to hold one row per line, which is the case for
+files copied with quoting disabled, e.g. with ``QUOTE E'\b'``.
+"""
+
+import logging
+import zipfile
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+from typing import IO
+
+from common.constants import POSTGRES_CONN_ID
+from common.sql import PostgresHook
+
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+"""The number of bytes passed to Postgres in each read during a COPY."""
+
+RowFilter = Callable[[bytes], bool]
+
+
+class CopyStream:
+    """
+    A file-like object which passes the lines of a binary stream on to COPY.
+
+    Lines for which ``row_filter`` returns False are dropped, and the rows which
+    are passed on are counted in ``row_count``. The header line is always passed
+    on, and is not counted or filtered.
+
+    Required Arguments:
+    source:     binary stream of the delimited file
+
+    Optional Arguments:
+    row_filter: function of the raw bytes of each line, including the line ending,
+                returning whether to copy the row
+    header:     whether the first line of the source is a header
+    """
+
+    def __init__(
+        self,
+        source: IO[bytes],
+        row_filter: RowFilter | None = None,
+        header: bool = True,
+    ):
+        self.row_filter = row_filter
+        self.row_count = 0
+        self.filtered_count = 0
+        self._lines = iter(source)
+        self._header_pending = header
+        self._buffer = bytearray()
+
+    def _next_line(self) -> bytes | None:
+        for line in self._lines:
+            if self._header_pending:
+                self._header_pending = False
+                return line
+            if self.row_filter is not None and not self.row_filter(line):
+                self.filtered_count += 1
+                continue
+            self.row_count += 1
+            return line
+        return None
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            if (line := self._next_line()) is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def copy_stream(
+    copy_sql: str,
+    source: IO[bytes],
+    row_filter: RowFilter | None = None,
+    header: bool = True,
+    postgres_conn_id: str = POSTGRES_CONN_ID,
+    statement_timeout: float | None = None,
+) -> int:
+    """
+    Copy the rows of a binary stream into Postgres, returning the number of rows.
+
+    The statement timeout is set on the same connection as the COPY, so it applies
+    to the COPY itself.
+
+    Required Arguments:
+    copy_sql:  a ``COPY ... FROM STDIN`` statement
+    source:    binary stream of the delimited file, e.g. from ``gzip.open``
+
+    Optional Arguments:
+    row_filter:        see ``CopyStream``
+    header:            whether the first line of the source is a header
+    postgres_conn_id:  the connection to copy the rows through
+    statement_timeout: seconds after which to cancel the COPY, defaults to the
+                       default statement timeout of ``PostgresHook``
+    """
+    pg = PostgresHook(
+        postgres_conn_id=postgres_conn_id,
+        default_statement_timeout=statement_timeout,
+    )
+    stream = CopyStream(source, row_filter=row_filter, header=header)
+    with closing(pg.get_conn()) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(pg.get_pg_timeout_sql(pg.default_statement_timeout))
+            cursor.copy_expert(copy_sql, stream, size=COPY_BUFFER_SIZE)
+        conn.commit()
+    if stream.filtered_count:
+        logger.info(f"Filtered out {stream.filtered_count} rows.")
+    return stream.row_count
+
+
+def copy_zip_member(
+    copy_sql: str,
+    zip_path: str | Path,
+    member: str,
+    **kwargs,
+) -> int:
+    """
+    Copy the rows of a file inside a zip archive into Postgres, without extracting
+    it, returning the number of rows.
+
+    Accepts the optional arguments of ``copy_stream``.
+    """
+    with zipfile.ZipFile(zip_path) as archive, archive.open(member) as source:
+        logger.info(f"Copying {member} from {zip_path}.")
+        return copy_stream(copy_sql, source, **kwargs)
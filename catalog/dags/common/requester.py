@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 from collections.abc import Callable
 
@@ -32,6 +33,8 @@ class DelayedRequester:
     arguments it receives).  The difference is that when this class is initialized
     with a non-zero `delay` parameter, it waits for at least that number of seconds
     between consecutive requests. This is to avoid hitting rate limits of APIs.
+    The delay is shared by all threads using the requester, so requests made
+    concurrently are still spaced out by at least the delay.
 
     Optional Arguments:
     delay:   an integer giving the minimum number of seconds to wait
@@ -45,6 +48,7 @@ class DelayedRequester:
         self._DELAY = delay
         self.headers = {"User-Agent": prov.UA_STRING} | headers
         self._last_request = 0
+        self._delay_lock = threading.Lock()
         self.session = requests.Session()
 
     def _make_request(
@@ -61,7 +65,6 @@ class DelayedRequester:
                   module request.
         """
         self._delay_processing()
-        self._last_request = time.time()
         request_kwargs = kwargs or {}
         if "headers" not in kwargs:
             request_kwargs["headers"] = self.headers
@@ -126,7 +129,12 @@ class DelayedRequester:
         return self._make_request(self.session.post, url, params=params, **kwargs)
 
     def _delay_processing(self):
-        wait = self._DELAY - (time.time() - self._last_request)
+        # Reserve the next request slot before waiting for it, so that
+        # concurrent callers are given consecutive slots
+        with self._delay_lock:
+            now = time.time()
+            wait = self._DELAY - (now - self._last_request)
+            self._last_request = now + max(wait, 0)
         if wait >= 0:
             logging.debug(f"Waiting {wait} second(s)")
             time.sleep(wait)
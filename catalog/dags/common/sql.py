@@ -1,4 +1,5 @@
 import logging
+from contextlib import contextmanager
 from datetime import timedelta
 
 from airflow.decorators import task
@@ -24,8 +25,9 @@ from common.constants import DAG_DEFAULT_ARGS, POSTGRES_CONN_ID
 logger = logging.getLogger(__name__)
 
 
-# Some functions, like inaturalist, use "copy_expert" to bulk load data to a table.
-# Right now, that is not using the timeout automagically.
+# The upstream "copy_expert" used to bulk load data to a table does not use the
+# timeout automagically. Use common.loader.copy_stream instead, which sets the timeout
+# on the connection used for the COPY.
 # https://airflow.apache.org/docs/apache-airflow-providers-postgres/stable/_api/airflow/providers/postgres/hooks/postgres/index.html#airflow.providers.postgres.hooks.postgres.PostgresHook.copy_expert # noqa
 
 
@@ -154,6 +156,26 @@ class PostgresHook(UpstreamPostgresHook):
         """
         self.run("")
 
+    @contextmanager
+    def advisory_lock(self, lock_name: str):
+        """
+        Hold a session-level Postgres advisory lock for the duration of the block.
+
+        The lock is taken on a dedicated connection, so the statements in the block
+        may run on any connection, including those of other hooks. Waiting for the
+        lock is subject to the default statement timeout. The lock is released when
+        the block exits, or if the connection is lost.
+        """
+        conn = self.get_conn()
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(self.get_pg_timeout_sql(self.default_statement_timeout))
+                cursor.execute("SELECT pg_advisory_lock(hashtext(%s));", (lock_name,))
+            yield
+        finally:
+            conn.close()
+
 
 class PGExecuteQueryOperator(SQLExecuteQueryOperator):
     """
@@ -1,6 +1,8 @@
 import json
 import logging
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from json import JSONDecodeError
 
 from common.licenses import get_license_info
@@ -19,12 +21,54 @@ class ImageStoreDict(dict):
         return ret
 
 
-_image_store_dict = ImageStoreDict()
+class ShardImageStoreDict(ImageStoreDict):
+    """Image stores whose files are suffixed, so that shards write to distinct files."""
+
+    def __init__(self, tsv_suffix: str):
+        super().__init__()
+        self.tsv_suffix = tsv_suffix
+
+    def __missing__(self, key):
+        ret = self[key] = image.ImageStore(provider=key, tsv_suffix=self.tsv_suffix)
+        return ret
 
 
-def clean_tsv_directory(tsv_directory):
-    for tsv in os.listdir(tsv_directory):
-        clean_tsv(os.path.join(tsv_directory, tsv))
+_image_store_dict = ImageStoreDict()
+
+# The size of the byte ranges into which large files are split in parallel mode
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024
+
+
+def clean_tsv_directory(
+    tsv_directory, processes: int = 1, shard_size: int = DEFAULT_SHARD_SIZE
+) -> dict[str, str] | None:
+    """
+    Clean every TSV file in the directory.
+
+    With more than one process, the files are split into shards of about
+    `shard_size` bytes, at line boundaries, which are cleaned in parallel. Each
+    shard writes to its own files, which are then merged into a single file per
+    provider in the order of the shards, so the output does not depend on the
+    order in which the shards complete. Returns the merged file of each provider.
+    """
+    if processes <= 1:
+        for tsv in os.listdir(tsv_directory):
+            clean_tsv(os.path.join(tsv_directory, tsv))
+        return None
+
+    tsv_filenames = [
+        os.path.join(tsv_directory, tsv) for tsv in sorted(os.listdir(tsv_directory))
+    ]
+    shards = _get_shards(tsv_filenames, shard_size)
+    logger.info(
+        f"Cleaning {len(tsv_filenames)} files in {len(shards)} shards"
+        f" with {processes} processes."
+    )
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        shard_outputs = list(
+            executor.map(_clean_shard, range(len(shards)), *zip(*shards))
+        )
+    return _merge_shard_outputs(shard_outputs)
 
 
 def clean_tsv(tsv_filename):
@@ -35,10 +79,77 @@ def clean_tsv(tsv_filename):
             image_store.commit()
 
 
-def _process_row(tsv_row):
+def _get_shards(
+    tsv_filenames: list[str], shard_size: int
+) -> list[tuple[str, int, int]]:
+    """Split the files into byte ranges of about `shard_size`, ending at a newline."""
+    shards = []
+    for tsv_filename in tsv_filenames:
+        file_size = os.path.getsize(tsv_filename)
+        with open(tsv_filename, "rb") as f:
+            start = 0
+            while start < file_size:
+                end = start + shard_size
+                if end < file_size:
+                    f.seek(end)
+                    f.readline()
+                    end = f.tell()
+                end = min(end, file_size)
+                shards.append((tsv_filename, start, end))
+                start = end
+    return shards
+
+
+def _clean_shard(
+    shard_index: int, tsv_filename: str, start: int, end: int
+) -> dict[str, str]:
+    """
+    Clean the rows in a byte range of a file, in a worker process.
+
+    Each shard uses its own image stores, whose files are suffixed with the index
+    of the shard. Returns the output file of each provider found in the shard.
+    """
+    image_store_dict = ShardImageStoreDict(tsv_suffix=f"shard{shard_index:06d}")
+    with open(tsv_filename, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end and (line := f.readline()):
+            position += len(line)
+            _process_row(line.decode("utf-8"), image_store_dict)
+
+    outputs = {}
+    for provider, image_store in image_store_dict.items():
+        image_store.commit()
+        if os.path.exists(image_store.output_path):
+            outputs[provider] = image_store.output_path
+    return outputs
+
+
+def _merge_shard_outputs(shard_outputs: list[dict[str, str]]) -> dict[str, str]:
+    """Concatenate the files of each provider in shard order, removing the parts."""
+    parts_by_provider: dict[str, list[str]] = {}
+    for outputs in shard_outputs:
+        for provider, output_path in outputs.items():
+            parts_by_provider.setdefault(provider, []).append(output_path)
+
+    merged = {}
+    for provider, parts in parts_by_provider.items():
+        merged[provider] = image.ImageStore(provider=provider).output_path
+        with open(merged[provider], "wb") as merged_file:
+            for part in parts:
+                with open(part, "rb") as part_file:
+                    shutil.copyfileobj(part_file, merged_file)
+                os.remove(part)
+        logger.info(f"Merged {len(parts)} shards into {merged[provider]}.")
+    return merged
+
+
+def _process_row(tsv_row, image_store_dict: ImageStoreDict | None = None):
+    if image_store_dict is None:
+        image_store_dict = _image_store_dict
     row_image = _get_image_from_row(tsv_row)
     row_meta_data = _get_json_from_string(row_image.meta_data)
-    image_store = _image_store_dict[row_image.provider]
+    image_store = image_store_dict[row_image.provider]
     image_store.add_item(
         foreign_landing_url=row_image.foreign_landing_url,
         url=row_image.url,
@@ -0,0 +1,99 @@
+"""
+A persistent cache of information obtained from upstream URLs.
+
+Provider scripts can use this to avoid requesting the same, rarely changing
+information from upstream on every ingestion, e.g. the size of a media file. The
+cache is a SQLite database in a local file, so that it persists between runs on
+the same worker. Each entry records its ``ETag``, if any, so that an entry
+which is too old to be trusted can be revalidated with a conditional request.
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS url_cache (
+    namespace TEXT NOT NULL,
+    url TEXT NOT NULL,
+    value TEXT NOT NULL,
+    etag TEXT,
+    checked_at TEXT NOT NULL,
+    PRIMARY KEY (namespace, url)
+)
+"""
+
+
+@dataclass
+class CachedURL:
+    value: dict
+    etag: str | None
+    checked_at: datetime
+
+    def is_fresh(self, max_age: timedelta) -> bool:
+        """Whether the entry was checked against upstream within ``max_age``."""
+        return datetime.now(timezone.utc) - self.checked_at < max_age
+
+
+class URLCache:
+    """
+    Store JSON-serializable information about URLs in a SQLite database.
+
+    Entries are grouped by namespace, so that one database can hold different
+    kinds of information about the same URLs. The cache is safe to use from
+    multiple threads, and only connects to the database when first used.
+
+    Required Arguments:
+    path: path to the SQLite database file, which is created if missing
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(CREATE_TABLE_QUERY)
+            self._connection.commit()
+        return self._connection
+
+    def get(self, namespace: str, url: str) -> CachedURL | None:
+        """Get the cached information about the URL, if there is any."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value, etag, checked_at FROM url_cache "
+                    "WHERE namespace = ? AND url = ?",
+                    (namespace, url),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        value, etag, checked_at = row
+        return CachedURL(json.loads(value), etag, datetime.fromisoformat(checked_at))
+
+    def set(self, namespace: str, url: str, value: dict, etag: str | None = None):
+        """Store information about the URL, as checked against upstream now."""
+        checked_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO url_cache "
+                "(namespace, url, value, etag, checked_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, url, json.dumps(value), etag, checked_at),
+            )
+            connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -1,9 +1,16 @@
+import csv
+import io
 import json
 import logging
+import math
+from collections.abc import Iterator
+from typing import IO
 
 import smart_open
 from airflow.decorators import task
 from airflow.models import Variable
+from airflow.models.abstractoperator import AbstractOperator
+from airflow.operators.python import get_current_context
 from airflow.providers.amazon.aws.hooks.s3 import S3Hook
 from airflow.utils.trigger_rule import TriggerRule
 from psycopg2.extras import Json
@@ -49,6 +56,42 @@ def _process_labels(labels: list[types.Label]) -> list[types.MachineGeneratedTag
     return tags
 
 
+def _get_s3_client():
+    # If an endpoint is defined for the hook, use the `get_client_type` method
+    # to retrieve the S3 client. Otherwise, create the client from the session
+    # so that Airflow doesn't override the endpoint default we want on the S3 client
+    hook = S3Hook(aws_conn_id=AWS_CONN_ID)
+    if hook.conn_config.endpoint_url:
+        get_client = hook.get_client_type
+    else:
+        get_client = hook.get_session().client
+    return get_client("s3")
+
+
+def _parse_labeled_image(
+    blob: str | bytes, failed_records: list[str]
+) -> types.LabeledImage | None:
+    """
+    Parse a single line of the labels file. Lines which cannot be parsed are added
+    to ``failed_records`` and ``None`` is returned.
+    """
+    try:
+        return json.loads(blob)
+    except json.JSONDecodeError:
+        if isinstance(blob, bytes):
+            blob = blob.decode("utf-8", errors="replace")
+        logger.error(f"Failed to parse JSON: {blob}")
+        failed_records.append(blob)
+        # If this many failures occur, something is likely systematically wrong
+        if len(failed_records) >= constants.MAX_FAILED_RECORDS:
+            raise ValueError(
+                f"Over {constants.MAX_FAILED_RECORDS} failed records, "
+                f"systematic failure may be present. "
+                f"Check the logs to see what the issue may be."
+            )
+        return None
+
+
 def _insert_tags(tags_buffer: types.TagsBuffer, postgres_conn_id: str):
     logger.info(f"Inserting {len(tags_buffer)} records into the temporary table")
     postgres = PostgresHook(
@@ -83,15 +126,7 @@ def parse_and_insert_labels(
         deserialize_json=True,
     )
 
-    # If an endpoint is defined for the hook, use the `get_client_type` method
-    # to retrieve the S3 client. Otherwise, create the client from the session
-    # so that Airflow doesn't override the endpoint default we want on the S3 client
-    hook = S3Hook(aws_conn_id=AWS_CONN_ID)
-    if hook.conn_config.endpoint_url:
-        get_client = hook.get_client_type
-    else:
-        get_client = hook.get_session().client
-    s3_client = get_client("s3")
+    s3_client = _get_s3_client()
     with smart_open.open(
         f"{s3_bucket}/{s3_prefix}",
         transport_params={"buffer_size": file_buffer_size, "client": s3_client},
@@ -106,18 +141,8 @@ def parse_and_insert_labels(
         # and also use file.tell() to get the current position
         while blob := file.readline():
             total_processed += 1
-            try:
-                labeled_image: types.LabeledImage = json.loads(blob)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON: {blob}")
-                failed_records.append(blob)
-                # If this many failures occur, something is likely systematically wrong
-                if len(failed_records) >= constants.MAX_FAILED_RECORDS:
-                    raise ValueError(
-                        f"Over {constants.MAX_FAILED_RECORDS} failed records, "
-                        f"systematic failure may be present. "
-                        f"Check the logs to see what the issue may be."
-                    )
+            labeled_image = _parse_labeled_image(blob, failed_records)
+            if labeled_image is None:
                 continue
             image_id = labeled_image["image_uuid"]
             raw_labels = labeled_image["response"]["Labels"]
@@ -154,6 +179,178 @@ def parse_and_insert_labels(
     )
 
 
+@task
+def get_file_ranges(
+    s3_bucket: str, s3_prefix: str, range_count: int
+) -> list[tuple[int, int]]:
+    """
+    Split the labels file into ``range_count`` contiguous byte ranges of roughly
+    equal size, each of which can be inserted independently. The ranges are not
+    aligned to line boundaries here, see ``_iter_range_lines`` for how lines which
+    straddle two ranges are handled.
+    """
+    s3_client = _get_s3_client()
+    file_size = s3_client.head_object(
+        Bucket=s3_bucket.removeprefix("s3://"), Key=s3_prefix
+    )["ContentLength"]
+    range_size = max(math.ceil(file_size / range_count), 1)
+    ranges = [
+        (start, min(start + range_size, file_size))
+        for start in range(0, file_size, range_size)
+    ]
+    logger.info(f"Split {file_size:,} bytes into {len(ranges)} ranges")
+    return ranges
+
+
+def _iter_range_lines(file: IO[bytes], start: int, end: int) -> Iterator[bytes]:
+    """
+    Yield every line of ``file`` which begins within the byte range [start, end).
+
+    A line which straddles the start of the range belongs to the previous range, so
+    unless the range starts at the beginning of the file, the partial line before
+    the first newline is discarded. Likewise, the last line yielded may extend past
+    the end of the range. Together, this means every line in the file is yielded by
+    exactly one range.
+    """
+    if start > 0:
+        # Seek one byte back so that a range starting exactly at the beginning
+        # of a line does not discard that line
+        file.seek(start - 1)
+        position = start - 1 + len(file.readline())
+    else:
+        file.seek(0)
+        position = 0
+
+    while position < end and (line := file.readline()):
+        position += len(line)
+        yield line
+
+
+def _copy_rows(cursor, staging_table: str, rows: list[tuple[str, str, int]]):
+    logger.info(f"Copying {len(rows)} records into {staging_table}")
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        constants.COPY_STAGING_TABLE_QUERY.format(staging_table=staging_table), buffer
+    )
+
+
+@task(map_index_template="{{ index_template }}")
+def insert_label_range(
+    file_range: tuple[int, int],
+    s3_bucket: str,
+    s3_prefix: str,
+    in_memory_buffer_size: int,
+    file_buffer_size: int,
+    postgres_conn_id: str,
+    task: AbstractOperator = None,
+) -> types.ParseResults:
+    """
+    Parse the lines which begin within the given byte range of the labels file and
+    COPY them into a staging table for the range, then merge the staging table into
+    the temporary table with a single statement.
+
+    All the work for a range happens in one transaction, so a failed range leaves
+    nothing behind and can simply be retried.
+    """
+    start, end = file_range
+    # Includes the formatted byte range in the context to be used as the index
+    # template for easier identification of the tasks in the UI.
+    context = get_current_context()
+    context["index_template"] = f"{start}__{end}"
+
+    staging_table = constants.STAGING_TABLE_NAME.format(start=start)
+    rows_buffer: list[tuple[str, str, int]] = []
+    failed_records = []
+    total_processed = 0
+    total_skipped = 0
+
+    postgres = PostgresHook(
+        postgres_conn_id=postgres_conn_id,
+        default_statement_timeout=PostgresHook.get_execution_timeout(task),
+    )
+    conn = postgres.get_conn()
+    try:
+        with (
+            smart_open.open(
+                f"{s3_bucket}/{s3_prefix}",
+                "rb",
+                transport_params={
+                    "buffer_size": file_buffer_size,
+                    "client": _get_s3_client(),
+                },
+            ) as file,
+            conn.cursor() as cursor,
+        ):
+            cursor.execute(
+                PostgresHook.get_pg_timeout_sql(postgres.default_statement_timeout)
+            )
+            cursor.execute(
+                constants.CREATE_STAGING_TABLE_QUERY.format(staging_table=staging_table)
+            )
+
+            # Each line is at least one byte long, so the n-th line of the range
+            # starts at or after ``start + n`` and before ``end``. The position is
+            # therefore unique and increasing through the whole file.
+            for line_number, blob in enumerate(_iter_range_lines(file, start, end)):
+                total_processed += 1
+                labeled_image = _parse_labeled_image(blob, failed_records)
+                if labeled_image is None:
+                    continue
+                image_id = labeled_image["image_uuid"]
+                raw_labels = labeled_image["response"]["Labels"]
+                if not raw_labels:
+                    total_skipped += 1
+                    continue
+                tags = _process_labels(raw_labels)
+                rows_buffer.append((image_id, json.dumps(tags), start + line_number))
+
+                if len(rows_buffer) >= in_memory_buffer_size:
+                    _copy_rows(cursor, staging_table, rows_buffer)
+                    rows_buffer.clear()
+
+            if rows_buffer:
+                _copy_rows(cursor, staging_table, rows_buffer)
+
+            cursor.execute(
+                constants.MERGE_STAGING_TABLE_QUERY.format(staging_table=staging_table)
+            )
+            logger.info(f"Merged {cursor.rowcount} records from {staging_table}")
+            cursor.execute(
+                constants.DROP_STAGING_TABLE_QUERY.format(staging_table=staging_table)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return types.ParseResults(
+        total_processed,
+        total_skipped,
+        len(failed_records),
+        failed_records[:5],
+    )
+
+
+@task
+def combine_parse_results(results: list[types.ParseResults]) -> types.ParseResults:
+    total_processed, total_skipped, total_failed = 0, 0, 0
+    failed_records_sample = []
+    # Results may be deserialized from XComs as plain lists, so use positional
+    # rather than attribute access
+    for processed, skipped, failed, sample in results:
+        total_processed += processed
+        total_skipped += skipped
+        total_failed += failed
+        failed_records_sample += sample
+    return types.ParseResults(
+        total_processed,
+        total_skipped,
+        total_failed,
+        failed_records_sample[:5],
+    )
+
+
 @task
 def notify_parse_complete(results: types.ParseResults):
     message = f"""
@@ -17,10 +17,17 @@ This DAG can be configured with the following Variables:
 - `REKOGNITION_FILE_BUFFER_SIZE`: The size of the buffer to use when reading from the
   file in S3, in bytes. The higher this number is, the more is read into memory before
   being processed by the DAG (but the fewer calls that are made to S3).
+- `REKOGNITION_PARALLEL_RANGE_COUNT`: The number of byte ranges the file is split
+  into. Each range is parsed by its own mapped task, which COPYs the records into a
+  staging table and merges them into the temporary table with a single statement.
+  At most `REKOGNITION_MAX_CONCURRENT_RANGE_TASKS` ranges are processed at once.
 
-This DAG also automatically uses the `REKOGNITION_LABEL_INSERTION_CURRENT_POSITION`
-variable to keep track of the current position in the file. This can be used to resume
-the DAG from a specific position in the file if it fails.
+If a range fails, only that mapped task needs to be cleared to retry it; each range
+is inserted in a single transaction and its merge is idempotent.
+
+If the `REKOGNITION_LABEL_INSERTION_CURRENT_POSITION` variable is set when the DAG
+starts, the DAG instead resumes the sequential, line-by-line insertion from that
+position in the file, keeping the variable up to date as it goes.
 
 This DAG is idempotent and can be run multiple times without issue.
 """
@@ -29,13 +36,18 @@ import logging
 from datetime import timedelta
 
 from airflow.decorators import dag
+from airflow.models import Variable
 from airflow.operators.trigger_dagrun import TriggerDagRunOperator
+from airflow.utils.trigger_rule import TriggerRule
 
 from common.constants import DAG_DEFAULT_ARGS, POSTGRES_CONN_ID
 from common.slack import notify_slack
 from common.sql import run_sql
 from data_augmentation.rekognition import constants
 from data_augmentation.rekognition.add_rekognition_labels import (
+    combine_parse_results,
+    get_file_ranges,
+    insert_label_range,
     notify_parse_complete,
     parse_and_insert_labels,
     resume_insertion,
@@ -60,6 +72,12 @@ logger = logging.getLogger(__name__)
     render_template_as_native_obj=True,
 )
 def add_rekognition_labels():
+    max_concurrent_range_tasks = Variable.get(
+        "REKOGNITION_MAX_CONCURRENT_RANGE_TASKS",
+        default_var=constants.MAX_CONCURRENT_RANGE_TASKS,
+        deserialize_json=True,
+    )
+
     check_for_resume = resume_insertion()
 
     notify_start = notify_slack.override(task_id=constants.NOTIFY_START_TASK_ID)(
@@ -89,6 +107,31 @@ def add_rekognition_labels():
 
     # These values are interpolated to allow overriding locally while still
     # defining a default value in an obvious location
+    file_ranges = get_file_ranges(
+        s3_bucket=constants.S3_BUCKET,
+        s3_prefix=constants.TEMPLATE_S3_PREFIX,
+        range_count=constants.TEMPLATE_PARALLEL_RANGE_COUNT,
+    )
+
+    insert_ranges = (
+        insert_label_range.override(
+            max_active_tis_per_dag=max_concurrent_range_tasks,
+        )
+        .partial(
+            s3_bucket=constants.S3_BUCKET,
+            s3_prefix=constants.TEMPLATE_S3_PREFIX,
+            in_memory_buffer_size=constants.TEMPLATE_IN_MEMORY_BUFFER_SIZE,
+            file_buffer_size=constants.TEMPLATE_FILE_BUFFER_SIZE,
+            postgres_conn_id=POSTGRES_CONN_ID,
+        )
+        .expand(file_range=file_ranges)
+    )
+
+    range_results = combine_parse_results(insert_ranges)
+
+    notify_parse_complete(range_results)
+
+    # Resuming a sequential insertion from a known position in the file
     insert_labels = parse_and_insert_labels(
         s3_bucket=constants.S3_BUCKET,
         s3_prefix=constants.TEMPLATE_S3_PREFIX,
@@ -97,7 +140,9 @@ def add_rekognition_labels():
         postgres_conn_id=POSTGRES_CONN_ID,
     )
 
-    notify_parse_complete(insert_labels)
+    notify_parse_complete.override(task_id="notify_resumed_parse_complete")(
+        insert_labels
+    )
 
     batched_update = TriggerDagRunOperator(
         task_id="trigger_batched_update",
@@ -106,6 +151,8 @@ def add_rekognition_labels():
         execution_timeout=timedelta(days=1),
         retries=0,
         conf=constants.BATCHED_UPDATE_CONFIG,
+        # Only one of the insertion paths will have run
+        trigger_rule=TriggerRule.NONE_FAILED_MIN_ONE_SUCCESS,
     )
 
     drop_temp_table = run_sql.override(
@@ -120,9 +167,10 @@ def add_rekognition_labels():
     )
 
     check_for_resume >> [notify_start, notify_resume]
-    notify_start >> create_temp_table >> create_temp_table_index >> insert_labels
+    notify_start >> create_temp_table >> create_temp_table_index >> file_ranges
     notify_resume >> insert_labels
-    insert_labels >> batched_update >> drop_temp_table >> notify_complete
+    [range_results, insert_labels] >> batched_update
+    batched_update >> drop_temp_table >> notify_complete
 
 
 add_rekognition_labels()
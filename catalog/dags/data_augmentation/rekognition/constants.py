@@ -23,15 +23,20 @@ MEMORY_BUFFER_SIZE = 1_000
 FILE_BUFFER_SIZE = 5 * 1024 * 1024  # 5MB
 # Limit to the number of failed records to keep track of
 MAX_FAILED_RECORDS = 100
+# Number of byte ranges the file is split into for parallel insertion
+PARALLEL_RANGE_COUNT = 16
+# Maximum number of range insertion tasks to run at once
+MAX_CONCURRENT_RANGE_TASKS = 4
 
 # Timeout for inserting a batch of records into the temporary table
 INSERT_TIMEOUT = timedelta(minutes=2)
 TEMP_TABLE_NAME = "rekognition_label_insertion"
 # Copy the table definition using a query which will return no rows, but
-# prevents us from having to be explicit about data types
+# prevents us from having to be explicit about data types. The position orders
+# the records of the file, see ``MERGE_STAGING_TABLE_QUERY``.
 CREATE_TEMP_TABLE_QUERY = f"""
     CREATE TABLE {TEMP_TABLE_NAME} AS
-    SELECT identifier, tags
+    SELECT identifier, tags, 0::bigint AS position
     FROM image
     WHERE 0=1;
     """
@@ -41,6 +46,34 @@ SELECT_TEMP_TABLE_COUNT_QUERY = f"""
     FROM {TEMP_TABLE_NAME};
     """
 DROP_TABLE_QUERY = f"DROP TABLE IF EXISTS {TEMP_TABLE_NAME} CASCADE;"
+# Each byte range of the file is copied into its own unlogged staging table, which
+# is then merged into the temporary table in a single statement. The staging table
+# is named after the range's starting byte so that retries reuse the same name.
+STAGING_TABLE_NAME = f"{TEMP_TABLE_NAME}_{{start}}"
+CREATE_STAGING_TABLE_QUERY = """
+    DROP TABLE IF EXISTS {staging_table};
+    CREATE UNLOGGED TABLE {staging_table} AS
+    SELECT identifier, tags, 0::bigint AS position
+    FROM image
+    WHERE 0=1;
+    """
+COPY_STAGING_TABLE_QUERY = (
+    "COPY {staging_table} (identifier, tags, position) FROM STDIN WITH (FORMAT csv)"
+)
+# Matches the `replace=True` behavior of the row-by-row insertion, where a later
+# record for an identifier replaces an earlier one. Positions increase through the
+# file, so the record with the highest position wins both within a range and
+# across ranges, whatever order the ranges are merged in.
+MERGE_STAGING_TABLE_QUERY = f"""
+    INSERT INTO {TEMP_TABLE_NAME} (identifier, tags, position)
+    SELECT DISTINCT ON (identifier) identifier, tags, position
+    FROM {{staging_table}}
+    ORDER BY identifier, position DESC
+    ON CONFLICT (identifier) DO UPDATE
+    SET tags = EXCLUDED.tags, position = EXCLUDED.position
+    WHERE {TEMP_TABLE_NAME}.position < EXCLUDED.position;
+    """
+DROP_STAGING_TABLE_QUERY = "DROP TABLE IF EXISTS {staging_table};"
 BATCHED_UPDATE_CONFIG = {
     "query_id": f"{DAG_ID}_insertion",
     "table_name": "image",
@@ -78,10 +111,14 @@ TEMPLATE_IN_MEMORY_BUFFER_SIZE = (
 TEMPLATE_FILE_BUFFER_SIZE = (
     "{{ var.value.get('REKOGNITION_FILE_BUFFER_SIZE', %s) }}" % FILE_BUFFER_SIZE  # noqa: UP031
 )
+TEMPLATE_PARALLEL_RANGE_COUNT = (
+    "{{ var.value.get('REKOGNITION_PARALLEL_RANGE_COUNT', %s) }}" % PARALLEL_RANGE_COUNT  # noqa: UP031
+)
 
 TEMPLATE_SLACK_MESSAGE_CONFIG = f"""
 *Configuration*:
  - S3 prefix: `{S3_BUCKET}/{TEMPLATE_S3_PREFIX}`
  - In-memory buffer size: `{TEMPLATE_IN_MEMORY_BUFFER_SIZE}`
  - File buffer size: `{TEMPLATE_FILE_BUFFER_SIZE}`
+ - Parallel ranges: `{TEMPLATE_PARALLEL_RANGE_COUNT}`
 """
@@ -21,3 +21,56 @@ DELETE_RECORDS_QUERY = """
     DELETE FROM {table}
     {select_query}
     """
+
+# Chunked deletion
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_WORKERS = 1
+MAX_WORKERS = 8
+SELECT_TIMEOUT = CREATE_TIMEOUT
+DELETE_BATCHES_TIMEOUT = timedelta(days=30)
+DELETE_BATCHES_RETRIES = 3
+# Timeout for an individual batch
+BATCH_TIMEOUT = DELETE_TIMEOUT
+
+ROWS_TABLE_NAME = "delete_records_{run_key}_rows"
+PROGRESS_TABLE_NAME = "delete_records_{run_key}_progress"
+# The tables are only created if they do not already exist, so that a retry resumes
+# with the rows selected by the first attempt
+SELECT_ROWS_QUERY = """
+    CREATE TABLE IF NOT EXISTS {rows_table} AS
+    SELECT ROW_NUMBER() OVER() row_id, identifier
+    FROM {table}
+    {select_query};
+    CREATE INDEX IF NOT EXISTS {rows_table}_row_id_idx ON {rows_table} (row_id);
+    CREATE TABLE IF NOT EXISTS {progress_table} (
+        batch_start bigint PRIMARY KEY,
+        deleted_count integer NOT NULL
+    );
+    SELECT COUNT(*) FROM {rows_table};
+    """
+# Copies the rows of the batch into the Deleted Media table, deletes them from the
+# media table and records the batch as complete, all in a single transaction
+DELETE_BATCH_QUERY = """
+    WITH deleted AS (
+        DELETE FROM {table}
+        WHERE identifier IN (
+            SELECT identifier FROM {rows_table}
+            WHERE row_id > {batch_start} AND row_id <= {batch_end}
+        )
+        RETURNING {returning_cols}
+    ), created AS (
+        INSERT INTO {destination_table} ({destination_cols})
+        SELECT {source_cols}
+        FROM deleted
+        ON CONFLICT {unique_cols}
+        DO NOTHING
+    )
+    INSERT INTO {progress_table} (batch_start, deleted_count)
+    SELECT {batch_start}, COUNT(*) FROM deleted
+    RETURNING deleted_count;
+    """
+SELECT_COMPLETED_BATCHES_QUERY = "SELECT batch_start FROM {progress_table};"
+SELECT_DELETED_COUNT_QUERY = (
+    "SELECT COALESCE(SUM(deleted_count), 0) FROM {progress_table};"
+)
+DROP_TABLES_QUERY = "DROP TABLE IF EXISTS {rows_table}, {progress_table};"
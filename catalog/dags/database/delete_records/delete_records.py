@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 from airflow.decorators import task
@@ -6,7 +7,7 @@ from airflow.models.abstractoperator import AbstractOperator
 
 from common import slack
 from common.constants import POSTGRES_CONN_ID
-from common.sql import RETURN_ROW_COUNT, PostgresHook
+from common.sql import RETURN_ROW_COUNT, PostgresHook, fetch_all, single_value
 from common.storage.columns import DELETED_ON, FOREIGN_ID, PROVIDER, Column
 from common.storage.db_columns import (
     setup_db_columns_for_media_type,
@@ -56,6 +57,25 @@ def create_deleted_records(
     record create a corresponding record in the Deleted Media table.
     """
 
+    return run_sql(
+        sql_template=constants.CREATE_RECORDS_QUERY,
+        postgres_conn_id=postgres_conn_id,
+        task=task,
+        source_table=media_type,
+        select_query=select_query,
+        **_get_deleted_records_kwargs(
+            media_type, deleted_reason, db_columns, deleted_db_columns
+        ),
+    )
+
+
+def _get_deleted_records_kwargs(
+    media_type: str,
+    deleted_reason: str,
+    db_columns: list[Column],
+    deleted_db_columns: list[Column],
+) -> dict[str, str]:
+    """Build the parts of a query which copies media records into Deleted Media."""
     destination_cols = ", ".join([col.db_name for col in deleted_db_columns])
 
     # To build the source columns, we first list all columns in the main media table
@@ -74,17 +94,12 @@ def create_deleted_records(
     # record exactly as it was when it was first deleted.
     unique_cols = f"({PROVIDER.db_name}, md5({FOREIGN_ID.db_name}))"
 
-    return run_sql(
-        sql_template=constants.CREATE_RECORDS_QUERY,
-        postgres_conn_id=postgres_conn_id,
-        task=task,
-        destination_table=f"deleted_{media_type}",
-        destination_cols=destination_cols,
-        source_table=media_type,
-        source_cols=source_cols,
-        select_query=select_query,
-        unique_cols=unique_cols,
-    )
+    return {
+        "destination_table": f"deleted_{media_type}",
+        "destination_cols": destination_cols,
+        "source_cols": source_cols,
+        "unique_cols": unique_cols,
+    }
 
 
 @task
@@ -99,6 +114,149 @@ def delete_records_from_media_table(
     )
 
 
+@task
+def select_rows_to_delete(
+    table: str,
+    select_query: str,
+    run_key: str,
+    postgres_conn_id: str = POSTGRES_CONN_ID,
+    task: AbstractOperator = None,
+) -> int:
+    """
+    Select the identifiers of the records to delete into a table, numbering them so
+    that they can be deleted in batches, and return the number of records.
+
+    If the table already exists, because this is a retry, it is used as is.
+    """
+    return run_sql(
+        sql_template=constants.SELECT_ROWS_QUERY,
+        postgres_conn_id=postgres_conn_id,
+        task=task,
+        handler=single_value,
+        table=table,
+        select_query=select_query,
+        **_get_temp_table_names(run_key),
+    )
+
+
+def _get_temp_table_names(run_key: str) -> dict[str, str]:
+    return {
+        "rows_table": constants.ROWS_TABLE_NAME.format(run_key=run_key),
+        "progress_table": constants.PROGRESS_TABLE_NAME.format(run_key=run_key),
+    }
+
+
+def get_pending_batches(
+    total_row_count: int, batch_size: int, completed_batches: set[int]
+) -> list[int]:
+    """Get the start of each batch of row ids which has not been deleted yet."""
+    return [
+        batch_start
+        for batch_start in range(0, total_row_count, batch_size)
+        if batch_start not in completed_batches
+    ]
+
+
+@task
+@setup_deleted_db_columns_for_media_type
+@setup_db_columns_for_media_type
+def delete_records_in_batches(
+    *,
+    total_row_count: int,
+    batch_size: int,
+    workers: int,
+    run_key: str,
+    deleted_reason: str,
+    media_type: str,
+    db_columns: list[Column] = None,
+    deleted_db_columns: list[Column] = None,
+    batch_timeout: timedelta = constants.BATCH_TIMEOUT,
+    postgres_conn_id: str = POSTGRES_CONN_ID,
+) -> int:
+    """
+    Move the selected records into the Deleted Media table, in batches of row ids.
+
+    Each batch is copied into the Deleted Media table and deleted from the media
+    table in its own transaction, which also records the batch as complete in the
+    progress table. A retry skips the completed batches, and resumes the rest. With
+    more than one worker, batches are deleted concurrently on separate connections.
+
+    Returns the number of records deleted, including those deleted by any previous
+    attempts.
+    """
+    table_names = _get_temp_table_names(run_key)
+    timeout = batch_timeout.total_seconds()
+    query_kwargs = {
+        "table": media_type,
+        "returning_cols": ", ".join([col.db_name for col in db_columns]),
+        **table_names,
+        **_get_deleted_records_kwargs(
+            media_type, deleted_reason, db_columns, deleted_db_columns
+        ),
+    }
+
+    completed_batches = run_sql(
+        sql_template=constants.SELECT_COMPLETED_BATCHES_QUERY,
+        postgres_conn_id=postgres_conn_id,
+        timeout=timeout,
+        handler=fetch_all,
+        **table_names,
+    )
+    pending_batches = get_pending_batches(
+        total_row_count, batch_size, set(completed_batches)
+    )
+    logger.info(
+        f"Deleting {len(pending_batches):,} batches of up to {batch_size:,} records"
+        f" with {workers} workers. {len(completed_batches):,} batches were already"
+        " deleted."
+    )
+
+    def delete_batch(batch_start: int) -> int:
+        return run_sql(
+            sql_template=constants.DELETE_BATCH_QUERY,
+            postgres_conn_id=postgres_conn_id,
+            timeout=timeout,
+            handler=single_value,
+            batch_start=batch_start,
+            batch_end=batch_start + batch_size,
+            **query_kwargs,
+        )
+
+    # Each call to run_sql uses its own connection, so batches can run concurrently
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for completed, count in enumerate(
+            executor.map(delete_batch, pending_batches), start=1
+        ):
+            percent_complete = completed / len(pending_batches) * 100
+            logger.info(
+                f"Deleted {count:,} records in batch {completed:,}."
+                f" {percent_complete:.2f}% complete."
+            )
+
+    return run_sql(
+        sql_template=constants.SELECT_DELETED_COUNT_QUERY,
+        postgres_conn_id=postgres_conn_id,
+        timeout=timeout,
+        handler=single_value,
+        **table_names,
+    )
+
+
+@task
+def drop_temp_tables(
+    run_key: str,
+    postgres_conn_id: str = POSTGRES_CONN_ID,
+    task: AbstractOperator = None,
+):
+    """Drop the tables used to select the records and track the deletion."""
+    return run_sql(
+        sql_template=constants.DROP_TABLES_QUERY,
+        postgres_conn_id=postgres_conn_id,
+        task=task,
+        **_get_temp_table_names(run_key),
+    )
+
+
 @task
 def notify_slack(deleted_records_count: int, table_name: str, select_query: str) -> str:
     """Send a message to Slack."""
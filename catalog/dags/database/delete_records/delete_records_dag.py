@@ -24,6 +24,26 @@ due to deadlinks would look like this:
 }
 ```
 
+Optional params:
+
+* batch_size: the number of records to delete in each batch. By default, 10,000
+* workers:    the number of batches to delete concurrently. By default, 1
+
+## Batched deletion
+
+The identifiers of the selected records are first saved to a temporary table, and
+numbered. The records are then deleted in batches of consecutive row numbers: each
+batch is copied into the Deleted Media table and deleted from the media table in a
+single transaction, so that locks are only held on one batch at a time and the
+deletion can proceed alongside other work. Batches may be deleted by several workers
+concurrently.
+
+The records which are deleted are those matched by the `select_query` when the
+temporary table was created. Completed batches are recorded in a second temporary
+table, so if the deletion fails or times out, a retry of the task resumes from the
+remaining batches instead of starting over. Both tables are dropped once every batch
+has been deleted; if the DagRun fails instead, clear the failed task to resume it.
+
 ## Multiple deletions
 
 When a record is deleted, it is added to the corresponding Deleted Media table. If the
@@ -58,9 +78,10 @@ from airflow.models.param import Param
 from common.constants import AUDIO, DAG_DEFAULT_ARGS, MEDIA_TYPES
 from database.delete_records import constants
 from database.delete_records.delete_records import (
-    create_deleted_records,
-    delete_records_from_media_table,
+    delete_records_in_batches,
+    drop_temp_tables,
     notify_slack,
+    select_rows_to_delete,
 )
 
 
@@ -95,30 +116,58 @@ logger = logging.getLogger(__name__)
             type="string",
             description="Short descriptor of the reason for deleting the records.",
         ),
+        "batch_size": Param(
+            default=constants.DEFAULT_BATCH_SIZE,
+            type="integer",
+            minimum=1,
+            description="The number of records to delete per batch.",
+        ),
+        "workers": Param(
+            default=constants.DEFAULT_WORKERS,
+            type="integer",
+            minimum=1,
+            maximum=constants.MAX_WORKERS,
+            description="The number of batches to delete concurrently.",
+        ),
     },
 )
 def delete_records():
-    # Create the records in the Deleted Media table
-    insert_into_deleted_media_table = create_deleted_records.override(
-        task_id="update_deleted_media_table", execution_timeout=constants.CREATE_TIMEOUT
+    # Identifies the temporary tables of this DagRun, which persist across retries
+    run_key = "{{ ts_nodash }}"
+
+    # Select the records to delete into a temporary table
+    select_rows = select_rows_to_delete.override(
+        execution_timeout=constants.SELECT_TIMEOUT
     )(
+        table="{{ params.table_name }}",
         select_query="{{ params.select_query }}",
+        run_key=run_key,
+    )
+
+    # Move the records into the Deleted Media table in batches, resuming on retries
+    delete_records = delete_records_in_batches.override(
+        execution_timeout=constants.DELETE_BATCHES_TIMEOUT,
+        retries=constants.DELETE_BATCHES_RETRIES,
+    )(
+        total_row_count=select_rows,
+        batch_size="{{ params.batch_size }}",
+        workers="{{ params.workers }}",
+        run_key=run_key,
         deleted_reason="{{ params.reason }}",
         media_type="{{ params.table_name }}",
     )
 
-    # If successful, delete the records from the media table
-    delete_records = delete_records_from_media_table.override(
-        execution_timeout=constants.DELETE_TIMEOUT
-    )(table="{{ params.table_name }}", select_query="{{ params.select_query }}")
-
     notify_complete = notify_slack(
         deleted_records_count=delete_records,
         table_name="{{ params.table_name }}",
         select_query="{{ params.select_query }}",
     )
 
-    insert_into_deleted_media_table >> delete_records >> notify_complete
+    # The temporary tables are only dropped once every batch has been deleted, so
+    # that a failed deletion can be resumed
+    drop_tables = drop_temp_tables(run_key=run_key)
+
+    delete_records >> [notify_complete, drop_tables]
 
 
 delete_records()
@@ -12,6 +12,7 @@ Notes:                  <https://pro.europeana.eu/page/search>
 import argparse
 import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from airflow.models import Variable
@@ -207,7 +208,12 @@ class EuropeanaDataIngester(ProviderDataIngester):
     providers = {"image": prov.EUROPEANA_DEFAULT_PROVIDER}
     sub_providers = prov.EUROPEANA_SUB_PROVIDERS
     endpoint = "https://api.europeana.eu/record/v2/search.json?"
+    # The delay is shared by the search and item requests of all threads, and so
+    # keeps the API as a whole to at most one request every 3 seconds.
     delay = 3
+    # The number of item requests that may be in progress at the same time. This
+    # overlaps the latency of item requests, within the budget set by ``delay``.
+    item_request_concurrency = 4
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -273,11 +279,22 @@ class EuropeanaDataIngester(ProviderDataIngester):
 
         return response_json.get("items")
 
-    def get_record_data(self, data: dict) -> dict:
-        return self.record_builder.get_record_data(
-            data | {"item_webresource": self._get_additional_item_data(data)}
+    def process_batch(self, media_batch) -> int:
+        # Fetch the item data for the whole batch up front, so that the item
+        # requests can be made concurrently.
+        item_data = self._get_additional_item_data_batch(media_batch)
+        return super().process_batch(
+            [
+                data | {"item_webresource": webresource}
+                for data, webresource in zip(media_batch, item_data)
+            ]
         )
 
+    def get_record_data(self, data: dict) -> dict:
+        if "item_webresource" not in data:
+            data = data | {"item_webresource": self._get_additional_item_data(data)}
+        return self.record_builder.get_record_data(data)
+
     def _get_id_and_url(self, data) -> tuple:
         try:
             return (
@@ -288,6 +305,23 @@ class EuropeanaDataIngester(ProviderDataIngester):
             logger.warning("Missing id or url", exc_info=exc)
             return (None, None)
 
+    def _get_additional_item_data_batch(self, media_batch: list[dict]) -> list[dict]:
+        """
+        Get the additional item data for each record in the batch.
+
+        The item requests are made by a pool of ``item_request_concurrency``
+        threads, which share the connections and the delay of the requester. The
+        results are returned in the same order as the batch.
+        """
+        if self.item_request_concurrency <= 1 or len(media_batch) <= 1:
+            return [self._get_additional_item_data(data) for data in media_batch]
+
+        with ThreadPoolExecutor(
+            max_workers=self.item_request_concurrency,
+            thread_name_prefix="europeana-item",
+        ) as executor:
+            return list(executor.map(self._get_additional_item_data, media_batch))
+
     def _get_additional_item_data(self, data) -> dict:
         # The Europeana requester uses a 3 second delay to avoid overwhelming the item
         # endpoint and to maintain at least a 30 second break between calls to the
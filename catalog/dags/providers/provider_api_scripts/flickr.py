@@ -58,6 +58,9 @@ class FlickrDataIngester(TimeDelineatedProviderDataIngester):
     division_threshold = 10_000
     min_divisions = 6
     max_divisions = 12
+    # The shortest interval into which a large batch is split by time, before it is
+    # split up by license type instead. Flickr upload dates have second granularity.
+    min_interval = timedelta(seconds=1)
     # When we pull more records than the API reports, we don't want to raise an error
     # and halt ingestion. Instead, this DAG adds its own separate handling to cut off
     # ingestion when max_records is reached, and continue to the next time interval. See
@@ -88,6 +91,10 @@ class FlickrDataIngester(TimeDelineatedProviderDataIngester):
         # Keep track of the current timestamp pair being processed.
         self.current_timestamp_pair = ()
 
+        # The record counts reported for each interval and license, so that no
+        # interval is probed more than once while splitting up large batches.
+        self.record_counts: dict[tuple[datetime, datetime, str], int] = {}
+
     def ingest_records(self, **kwargs):
         """
         Ingest records, handling large batches.
@@ -100,10 +107,12 @@ class FlickrDataIngester(TimeDelineatedProviderDataIngester):
         First, we use the TimeDelineatedProviderDataIngester to break queries down into
         smaller intervals of time throughout the ingestion day. However, this only has
         granularity down to about 5 minute intervals. If a 5-minute interval contains
-        more than the max unique records, we then try splitting the interval up by
-        license, making a separate query for each license type.
+        more than the max unique records, we then bisect the interval by time, using
+        the record count reported for each half, until each part is small enough to
+        ingest completely. See `_split_large_batch`.
 
-        If a 5-minute interval contains more than max_unique_records for a single
+        If a single second contains more than max_unique_records, we split it up by
+        license instead. If it contains more than max_unique_records for a single
         license type, we accept that we cannot produce a query small enough to ingest
         all the unique records over this time period. We will process up to the
         max_unique_records count and then move on to the next batch.
@@ -120,24 +129,84 @@ class FlickrDataIngester(TimeDelineatedProviderDataIngester):
         # possible.
         self.process_large_batch = True
 
-        for start_ts, end_ts in self.large_batches:
-            # For each large batch, ingest records for that interval one license
-            # type at a time.
-            for license_ in LICENSE_INFO.keys():
+        # A large batch may be detected more than once for the same interval, so
+        # remove duplicates while preserving the order.
+        for start_ts, end_ts in dict.fromkeys(self.large_batches):
+            # For each large batch, ingest records for each of the smaller intervals
+            # into which it can be split.
+            for fixed_query_params in self._split_large_batch(start_ts, end_ts):
                 super()._ingest_records(
                     initial_query_params=None,
-                    fixed_query_params={
-                        "min_upload_date": start_ts,
-                        "max_upload_date": end_ts,
-                        "license": license_,
-                    },
+                    fixed_query_params=fixed_query_params,
                 )
-        logger.info("Completed large batch processing by license type.")
+        logger.info("Completed large batch processing.")
+
+        # Report the final number of requests made, including the count probes.
+        logger.info(f"Made {self.requests_count} requests to the Flickr API.")
+
+    def _split_large_batch(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Split an interval containing too many records into intervals which can be
+        ingested completely, returning the fixed query params for each of them.
+
+        The interval is bisected recursively, using the record count reported for
+        each half, until each part contains fewer than `max_records` or is as short
+        as `min_interval`. Parts that are that short and still contain too many
+        records are split up by license type instead. Flickr treats both upload
+        dates as inclusive, so records uploaded at the boundary between two parts
+        are fetched twice and deduplicated when loaded.
+        """
+        record_count = self._get_record_count(start, end)
+        if record_count == 0:
+            return []
+        if record_count < self.max_records:
+            return [self.get_timestamp_query_params(start, end)]
+
+        if end - start <= self.min_interval:
+            logger.info(
+                f"Record count {record_count} is greater than maximum of"
+                f" {self.max_records} for the interval starting at {start}. Ingesting"
+                " data separately for each license type."
+            )
+            return [
+                self.get_timestamp_query_params(start, end) | {"license": license_}
+                for license_ in LICENSE_INFO.keys()
+                if self._get_record_count(start, end, license_=license_)
+            ]
+
+        # Bisect on a whole second, as the interval is at least two seconds long
+        half = timedelta(seconds=(end - start).total_seconds() // 2)
+        midpoint = start + max(half, self.min_interval)
+        return self._split_large_batch(start, midpoint) + self._split_large_batch(
+            midpoint, end
+        )
 
-        # Report the final number of requests made. Because the Flickr DAG receives a
-        # large amount of data, we can safely assume that we used the maximum of 25
-        # additional requests when generating timestamp pairs.
-        logger.info(f"Made {self.requests_count + 25} requests to the Flickr API.")
+    def _get_record_count(
+        self, start: datetime, end: datetime, license_: str | None = None
+    ) -> int:
+        """
+        Get the number of records the API reports for an interval and license.
+
+        This requests a single record without any extras, which is much cheaper
+        than requesting a full batch. Counts are cached for each interval.
+        """
+        license_ = license_ or self.default_license_param
+        if (key := (start, end, license_)) in self.record_counts:
+            return self.record_counts[key]
+
+        query_params = (
+            self.get_next_query_params(None)
+            | self.get_timestamp_query_params(start, end)
+            | self.additional_query_params
+            | {"license": license_, "per_page": 1}
+        )
+        query_params.pop("extras")
+
+        self.requests_count += 1
+        response_json = self.get_response_json(query_params)
+        record_count = self.get_record_count_from_response(response_json)
+        self.record_counts[key] = record_count
+        return record_count
 
     def _ingest_records(
         self, initial_query_params: dict | None, fixed_query_params: dict | None
@@ -205,8 +274,11 @@ class FlickrDataIngester(TimeDelineatedProviderDataIngester):
             if not self.process_large_batch:
                 # We don't want to attempt to process this batch. Return an empty
                 # batch now, and we will try again later, splitting the batch up by
-                # license type.
+                # time.
                 self.large_batches.append(self.current_timestamp_pair)
+                self.record_counts[
+                    (*self.current_timestamp_pair, self.default_license_param)
+                ] = detected_count
                 return None
 
             # If we do want to process large batches, we should only ingest up to
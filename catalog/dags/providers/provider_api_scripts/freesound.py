@@ -15,7 +15,10 @@ as a dated DAG.
 
 import functools
 import logging
-from datetime import datetime
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 
 import backoff
 from airflow.models import Variable
@@ -23,11 +26,16 @@ from requests.exceptions import ConnectionError, HTTPError, SSLError
 
 from common.licenses.licenses import get_license_info
 from common.loader import provider_details as prov
+from common.requester import DelayedRequester
+from common.url_cache import URLCache
 from providers.provider_api_scripts.provider_data_ingester import ProviderDataIngester
 
 
 logger = logging.getLogger(__name__)
 
+FILE_SIZE_NAMESPACE = "freesound_preview"
+SET_INFO_NAMESPACE = "freesound_set"
+
 
 class FreesoundDataIngester(ProviderDataIngester):
     batch_limit = 150
@@ -57,6 +65,16 @@ class FreesoundDataIngester(ProviderDataIngester):
     # I can't imagine it's throttling (aetherunbound).
     flaky_exceptions = (SSLError, ConnectionError)
 
+    # Previews are served separately from the API, so their sizes are requested
+    # without the API delay, for a whole batch at a time.
+    preview_delay = 0
+    preview_request_concurrency = 8
+    # Preview sizes and audio sets are cached between runs. Entries older than
+    # these are revalidated with upstream before they are used.
+    preview_cache_max_age = timedelta(days=30)
+    set_cache_max_age = timedelta(days=7)
+    cache_path = Path(os.getenv("OUTPUT_DIR", "/tmp/")) / "freesound_cache.sqlite3"
+
     def __init__(self, *args, **kwargs):
         self.api_key = Variable.get("API_KEY_FREESOUND")
         self.headers = {
@@ -66,13 +84,20 @@ class FreesoundDataIngester(ProviderDataIngester):
 
         super().__init__(*args, **kwargs)
 
+        self.preview_requester = DelayedRequester(
+            delay=self.preview_delay, headers=self.headers
+        )
+        self.url_cache = URLCache(self.cache_path)
+        self._prefetched_file_sizes: dict[str, Future] = {}
+
     get_response_json = backoff.on_exception(
         backoff.expo,
         HTTPError,
         max_time=60 * 2,
         # Raise all other errors
-        giveup=lambda e: e.response.status_code
-        not in FreesoundDataIngester.flaky_error_codes,
+        giveup=lambda e: (
+            e.response.status_code not in FreesoundDataIngester.flaky_error_codes
+        ),
     )(ProviderDataIngester.get_response_json)
 
     def get_next_query_params(self, prev_query_params: dict | None) -> dict:
@@ -152,6 +177,10 @@ class FreesoundDataIngester(ProviderDataIngester):
 
     @functools.lru_cache(maxsize=1024)
     def _get_set_info(self, set_url):
+        cached = self.url_cache.get(SET_INFO_NAMESPACE, set_url)
+        if cached and cached.is_fresh(self.set_cache_max_age):
+            return cached.value["id"], cached.value["name"]
+
         try:
             response_json = self.get_response_json(
                 query_params={},
@@ -159,6 +188,9 @@ class FreesoundDataIngester(ProviderDataIngester):
             )
             set_id = response_json.get("id")
             set_name = response_json.get("name")
+            self.url_cache.set(
+                SET_INFO_NAMESPACE, set_url, {"id": set_id, "name": set_name}
+            )
             return set_id, set_name
         except HTTPError as error:
             # https://github.com/WordPress/openverse-catalog/issues/659
@@ -179,14 +211,72 @@ class FreesoundDataIngester(ProviderDataIngester):
         else:
             return None, None, None
 
+    def process_batch(self, media_batch) -> int:
+        self._prefetch_audio_file_sizes(media_batch)
+        try:
+            return super().process_batch(media_batch)
+        finally:
+            self._prefetched_file_sizes.clear()
+
+    def _prefetch_audio_file_sizes(self, media_batch):
+        """
+        Get the sizes of the preferred previews in the batch concurrently.
+
+        The results, including any errors, are kept until the records that use
+        them are processed by ``_get_audio_file_size``.
+        """
+        urls = {
+            url
+            for media_data in media_batch
+            if (url := (media_data.get("previews") or {}).get(self.preferred_preview))
+        }
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=self.preview_request_concurrency,
+            thread_name_prefix="freesound-preview",
+        ) as executor:
+            futures = {
+                url: executor.submit(self._get_audio_file_size, url) for url in urls
+            }
+        self._prefetched_file_sizes |= futures
+
     @backoff.on_exception(backoff.expo, flaky_exceptions, max_tries=3)
+    def _head_audio_file(self, url, etag=None):
+        headers = self.headers | ({"If-None-Match": etag} if etag else {})
+        return self.preview_requester.head(url, headers=headers)
+
     def _get_audio_file_size(self, url):
-        """Get the content length of a provided URL."""
-        response = self.delayed_requester.head(url)
+        """
+        Get the content length of a provided URL.
 
-        if response:
-            return response.headers.get("content-length")
-        return None
+        Sizes prefetched for the current batch are used first. Otherwise, a size
+        from the cache is used if it is recent enough, or revalidated using its
+        ETag if it is not.
+        """
+        if (future := self._prefetched_file_sizes.pop(url, None)) is not None:
+            return future.result()
+
+        cached = self.url_cache.get(FILE_SIZE_NAMESPACE, url)
+        if cached and cached.is_fresh(self.preview_cache_max_age):
+            return cached.value["content_length"]
+
+        response = self._head_audio_file(url, etag=cached.etag if cached else None)
+        if not response:
+            return None
+
+        if cached and response.status_code == 304:
+            content_length, etag = cached.value["content_length"], cached.etag
+        else:
+            content_length = response.headers.get("content-length")
+            etag = response.headers.get("etag")
+
+        if content_length:
+            self.url_cache.set(
+                FILE_SIZE_NAMESPACE, url, {"content_length": content_length}, etag
+            )
+        return content_length
 
     def _get_audio_files(
         self, media_data
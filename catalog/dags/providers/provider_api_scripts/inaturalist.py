@@ -19,7 +19,6 @@ Notes:      The iNaturalist API is not intended for data scraping.
 import logging
 import os
 import time
-import zipfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -35,6 +34,7 @@ from airflow.utils.trigger_rule import TriggerRule
 
 from common.constants import AWS_CONN_ID, IMAGE, POSTGRES_CONN_ID, XCOM_PULL_TEMPLATE
 from common.loader import provider_details, reporting, sql
+from common.loader.copy_stream import copy_zip_member
 from common.sql import PGExecuteQueryOperator, PostgresHook
 from providers.provider_api_scripts.provider_data_ingester import ProviderDataIngester
 
@@ -51,6 +51,10 @@ LOADER_ARGS = {
 OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "/tmp/"))
 COL_URL = "https://download.checklistbank.org/col/latest_coldp.zip"
 INATURALIST_BUCKET = "inaturalist-open-data"
+# The number of batches of transformed data to load at once. Each batch uses its own
+# staging table, and only the upserts into the image table run one at a time.
+LOAD_CONCURRENCY = 4
+UPSERT_LOCK_NAME = "inaturalist_upsert"
 
 
 class INaturalistDataIngester(ProviderDataIngester):
@@ -105,7 +109,6 @@ class INaturalistDataIngester(ProviderDataIngester):
     @staticmethod
     def load_transformed_data(
         batch: tuple[int, int],
-        intermediate_table: str,
         identifier: str,
         task: AbstractOperator,
         sql_template_file_name="transformed_table.template.sql",
@@ -114,6 +117,11 @@ class INaturalistDataIngester(ProviderDataIngester):
         Process a single batch of inaturalist photo ids. batch_start is the minimum
         photo_id for the batch. get_batches generates a list for xcoms to use in
         generating tasks that use this function.
+
+        Each batch is loaded and cleaned in its own unlogged staging table, so that
+        several batches can be processed at once. The upserts into the image table
+        are run one batch at a time, under an advisory lock, so that concurrent
+        batches do not contend for locks on the image table and its indexes.
         """
         start_time = time.perf_counter()
         (batch_start, batch_end) = batch
@@ -124,34 +132,47 @@ class INaturalistDataIngester(ProviderDataIngester):
         sql_template = (SCRIPT_DIR / sql_template_file_name).read_text()
         batch_number = int(batch_start / (batch_end - batch_start + 1)) + 1
         logger.info(f"Starting at photo_id {batch_start}, on batch {batch_number}.")
-        # Load records to the intermediate table
-        (loaded_records, max_id_loaded) = pg.get_records(
-            sql_template.format(
-                intermediate_table=intermediate_table,
-                batch_start=batch_start,
-                batch_end=batch_end,
-            )
-        )[0]
-        logger.info(
-            f"Inserted {loaded_records} into {intermediate_table}. "
-            f"Last photo_id loaded was {max_id_loaded}, from batch {batch_number}."
-        )
-        # Run standard cleaning
-        (missing_columns, foreign_id_dup) = sql.clean_intermediate_table_data(
-            postgres_conn_id=POSTGRES_CONN_ID, identifier=identifier, task=task
+        # Create the staging table for this batch, replacing any left behind by a
+        # previous attempt
+        batch_identifier = f"{identifier}_{batch_number}"
+        sql.drop_load_table(POSTGRES_CONN_ID, batch_identifier, media_type=IMAGE)
+        intermediate_table = sql.create_loading_table(
+            POSTGRES_CONN_ID, batch_identifier, media_type=IMAGE
         )
-        # Add transformed records to the target catalog image table.
-        # TO DO: Would it be better to use loader.upsert_records here? Would need to
-        # trace back the parameters that need to be passed in for different stats.
-        upserted_records = sql.upsert_records_to_db_table(
-            postgres_conn_id=POSTGRES_CONN_ID,
-            identifier=identifier,
-            task=task,
-            media_type=IMAGE,
-        )
-        logger.info(f"Upserted {upserted_records} records, from batch {batch_number}.")
-        # Truncate the temp table
-        pg.run(f"truncate table {intermediate_table};")
+        try:
+            # Load records to the intermediate table
+            (loaded_records, max_id_loaded) = pg.get_records(
+                sql_template.format(
+                    intermediate_table=intermediate_table,
+                    batch_start=batch_start,
+                    batch_end=batch_end,
+                )
+            )[0]
+            logger.info(
+                f"Inserted {loaded_records} into {intermediate_table}. "
+                f"Last photo_id loaded was {max_id_loaded}, from batch {batch_number}."
+            )
+            # Run standard cleaning
+            (missing_columns, foreign_id_dup) = sql.clean_intermediate_table_data(
+                postgres_conn_id=POSTGRES_CONN_ID,
+                identifier=batch_identifier,
+                task=task,
+            )
+            # Add transformed records to the target catalog image table.
+            # TO DO: Would it be better to use loader.upsert_records here? Would need to
+            # trace back the parameters that need to be passed in for different stats.
+            with pg.advisory_lock(UPSERT_LOCK_NAME):
+                upserted_records = sql.upsert_records_to_db_table(
+                    postgres_conn_id=POSTGRES_CONN_ID,
+                    identifier=batch_identifier,
+                    task=task,
+                    media_type=IMAGE,
+                )
+            logger.info(
+                f"Upserted {upserted_records} records, from batch {batch_number}."
+            )
+        finally:
+            sql.drop_load_table(POSTGRES_CONN_ID, batch_identifier, media_type=IMAGE)
         # Return results for consolidation
         end_time = time.perf_counter()
         duration = end_time - start_time
@@ -249,55 +270,41 @@ class INaturalistDataIngester(ProviderDataIngester):
             logger.info(
                 f"Saved Catalog of Life download: {OUTPUT_DIR}/{local_zip_file}"
             )
-        # Extract specific files we need from the zip file
-        if (OUTPUT_DIR / name_usage_file).exists() and (
-            OUTPUT_DIR / vernacular_file
-        ).exists():
-            logger.info("No extract, both Catalog of Life tsv files exist.")
-        else:
-            with zipfile.ZipFile(OUTPUT_DIR / local_zip_file) as z:
-                with open(OUTPUT_DIR / name_usage_file, "wb") as f:
-                    f.write(z.read(name_usage_file))
-                logger.info(f"Extracted raw file: {OUTPUT_DIR}/{name_usage_file}")
-                with open(OUTPUT_DIR / vernacular_file, "wb") as f:
-                    f.write(z.read(vernacular_file))
-                logger.info(f"Extracted raw file: {OUTPUT_DIR}/{vernacular_file}")
-        # set up for loading data
-        pg = PostgresHook(
-            default_statement_timeout=PostgresHook.get_execution_timeout(task)
-        )
+        # Stream the files we need from the zip file straight into postgres, rather
+        # than extracting them first
         COPY_SQL = (
             "COPY inaturalist.{} FROM STDIN "
             "DELIMITER E'\t' CSV HEADER QUOTE E'\b' NULL AS ''"
         )
-        COUNT_SQL = "SELECT count(*) FROM inaturalist.{};"
+        statement_timeout = PostgresHook.get_execution_timeout(task)
         # upload vernacular names file to postgres
-        pg.run_statement_timeout()
-        pg.copy_expert(COPY_SQL.format("col_vernacular"), OUTPUT_DIR / vernacular_file)
-        vernacular_records = pg.get_records(COUNT_SQL.format("col_vernacular"))
-        if vernacular_records[0][0] == 0:
+        vernacular_records = copy_zip_member(
+            COPY_SQL.format("col_vernacular"),
+            OUTPUT_DIR / local_zip_file,
+            vernacular_file,
+            statement_timeout=statement_timeout,
+        )
+        if vernacular_records == 0:
             raise AirflowNotFoundException("No Catalog of Life vernacular data loaded.")
         else:
-            logger.info(
-                f"Loaded {vernacular_records[0][0]} records from {vernacular_file}"
-            )
+            logger.info(f"Loaded {vernacular_records} records from {vernacular_file}")
         # upload name usage file to postgres
-        pg.copy_expert(COPY_SQL.format("col_name_usage"), OUTPUT_DIR / name_usage_file)
-        name_usage_records = pg.get_records(COUNT_SQL.format("col_name_usage"))
-        if name_usage_records[0][0] == 0:
+        name_usage_records = copy_zip_member(
+            COPY_SQL.format("col_name_usage"),
+            OUTPUT_DIR / local_zip_file,
+            name_usage_file,
+            statement_timeout=statement_timeout,
+        )
+        if name_usage_records == 0:
             raise AirflowNotFoundException("No Catalog of Life name usage data loaded.")
         else:
-            logger.info(
-                f"Loaded {name_usage_records[0][0]} records from {name_usage_file}"
-            )
+            logger.info(f"Loaded {name_usage_records} records from {name_usage_file}")
         # TO DO #917: save source files on s3?
         if remove_api_files:
             os.remove(OUTPUT_DIR / local_zip_file)
-            os.remove(OUTPUT_DIR / vernacular_file)
-            os.remove(OUTPUT_DIR / name_usage_file)
         return {
-            "COL Name Usage Records": name_usage_records[0][0],
-            "COL Vernacular Records": vernacular_records[0][0],
+            "COL Name Usage Records": name_usage_records,
+            "COL Vernacular Records": vernacular_records,
         }
 
     @staticmethod
@@ -363,14 +370,7 @@ class INaturalistDataIngester(ProviderDataIngester):
                 doc_md="Drop iNaturalist source tables and their schema",
                 execution_timeout=timedelta(minutes=10),
             )
-            drop_loading_table = PythonOperator(
-                task_id="drop_loading_table",
-                python_callable=sql.drop_load_table,
-                op_kwargs=LOADER_ARGS,
-                doc_md="Drop the temporary (transformed) loading table",
-                execution_timeout=timedelta(minutes=10),
-            )
-            (check_drop_parameter >> [drop_inaturalist_schema, drop_loading_table])
+            check_drop_parameter >> drop_inaturalist_schema
         return postingestion_tasks
 
     @staticmethod
@@ -388,19 +388,6 @@ class INaturalistDataIngester(ProviderDataIngester):
                     )
 
             with TaskGroup(group_id="load_image_data") as loader_tasks:
-                # Using the existing set up, but the indexes on the temporary table
-                # probably slows down the load a bit.
-                create_loading_table = PythonOperator(
-                    task_id="create_loading_table",
-                    python_callable=sql.create_loading_table,
-                    op_kwargs=LOADER_ARGS,
-                    doc_md=(
-                        "Create a temp table for ingesting data from inaturalist "
-                        "source tables."
-                    ),
-                    execution_timeout=timedelta(minutes=1),
-                )
-
                 get_batches = PythonOperator(
                     task_id="get_batches",
                     python_callable=INaturalistDataIngester.get_batches,
@@ -416,18 +403,16 @@ class INaturalistDataIngester(ProviderDataIngester):
                     task_id="load_transformed_data",
                     python_callable=INaturalistDataIngester.load_transformed_data,
                     retries=0,
-                    max_active_tis_per_dag=1,
+                    max_active_tis_per_dag=LOAD_CONCURRENCY,
                     op_kwargs={
-                        "intermediate_table": XCOM_PULL_TEMPLATE.format(
-                            create_loading_table.task_id, "return_value"
-                        ),
                         "identifier": LOADER_ARGS["identifier"],
                     },
                     doc_md=(
                         "Load one batch of data from source tables to target table."
                     ),
-                    # Use all of the available pool slots.
-                    pool_slots=128,
+                    # Use all of the available pool slots between the concurrent
+                    # batches.
+                    pool_slots=128 // LOAD_CONCURRENCY,
                     # Default priority_weight is 1, higher numbers are more important.
                     priority_weight=0,
                     # Particularly towards the beginning there will be lots of
@@ -450,12 +435,7 @@ class INaturalistDataIngester(ProviderDataIngester):
                     retries=0,
                     trigger_rule=TriggerRule.NONE_SKIPPED,
                 )
-                (
-                    create_loading_table
-                    >> get_batches
-                    >> load_transformed_data
-                    >> consolidate_load_statistics
-                )
+                get_batches >> load_transformed_data >> consolidate_load_statistics
 
             postingestion_tasks = INaturalistDataIngester.create_postingestion_tasks()
 
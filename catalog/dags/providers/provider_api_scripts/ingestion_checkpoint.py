@@ -0,0 +1,130 @@
+"""
+Checkpoints for ingesters which ingest several sets of fixed query params at once.
+
+When ingestion is performed separately for each set of fixed query params (a
+shard), and several shards are ingested concurrently, a failure part way through
+leaves some shards complete and others partially ingested. The checkpoint records,
+for each shard, the query params of the next batch to ingest, or that the shard is
+complete. The next attempt at ingestion skips the completed shards and resumes the
+others from their next batch, rather than starting over. The checkpoint also
+records the TSV files to which the shards were written, so that the next attempt
+appends to them, and the records of the completed shards are loaded as well.
+
+The checkpoint is a JSON file in the ``OUTPUT_DIR``, which is removed once every
+shard has been ingested.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+COMPLETE = "complete"
+
+
+class IngestionCheckpoint:
+    """
+    Track the progress of each shard of an ingestion in a local file.
+
+    A checkpoint which is older than ``max_age`` is discarded rather than resumed,
+    so that a failed run does not cause a much later run to skip shards. The
+    checkpoint is safe to update from multiple threads.
+
+    Required Arguments:
+    path:    path to the checkpoint file
+    max_age: the age after which a previous checkpoint is no longer resumed
+    """
+
+    def __init__(self, path: str | Path, max_age: timedelta):
+        self.path = Path(path)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._created_at = datetime.now(timezone.utc)
+        self._shards: dict[str, dict | str] = {}
+        # The TSV file to which the records of each media type are written
+        self.output_paths: dict[str, str] = {}
+
+    @classmethod
+    def for_ingester(
+        cls, name: str, date: str | None, max_age: timedelta
+    ) -> "IngestionCheckpoint":
+        """Get the checkpoint of the ingestion for the given DAG and date."""
+        output_dir = Path(os.getenv("OUTPUT_DIR", "/tmp/"))
+        file_name = "_".join(filter(None, [name, date, "checkpoint"])) + ".json"
+        return cls(output_dir / file_name, max_age)
+
+    @staticmethod
+    def _key(fixed_query_params: dict) -> str:
+        return json.dumps(fixed_query_params, sort_keys=True, default=str)
+
+    def load(self) -> int:
+        """
+        Load the progress made by a previous attempt at ingestion, if any.
+
+        Returns the number of shards on which progress had been made.
+        """
+        try:
+            checkpoint = json.loads(self.path.read_text())
+            created_at = datetime.fromisoformat(checkpoint["created_at"])
+            shards = checkpoint["shards"]
+            output_paths = checkpoint.get("output_paths", {})
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, KeyError) as error:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {error}")
+            return 0
+
+        if datetime.now(timezone.utc) - created_at >= self.max_age:
+            logger.info(f"Ignoring checkpoint {self.path} created at {created_at}.")
+            return 0
+
+        logger.info(f"Resuming ingestion from checkpoint {self.path}.")
+        with self._lock:
+            self._created_at = created_at
+            self._shards = shards
+            self.output_paths = output_paths
+        return len(shards)
+
+    def is_complete(self, fixed_query_params: dict) -> bool:
+        """Whether every batch of the shard has been ingested."""
+        return self._shards.get(self._key(fixed_query_params)) == COMPLETE
+
+    def get_query_params(self, fixed_query_params: dict) -> dict | None:
+        """Get the query params from which to resume the shard, if it was begun."""
+        query_params = self._shards.get(self._key(fixed_query_params))
+        return query_params if isinstance(query_params, dict) else None
+
+    def update(self, fixed_query_params: dict, query_params: dict | None) -> None:
+        """Record the query params of the next batch to ingest for the shard."""
+        if query_params is not None:
+            self._set(fixed_query_params, query_params)
+
+    def complete(self, fixed_query_params: dict) -> None:
+        """Record that every batch of the shard has been ingested."""
+        self._set(fixed_query_params, COMPLETE)
+
+    def clear(self) -> None:
+        """Remove the checkpoint, once every shard has been ingested."""
+        with self._lock:
+            self._shards = {}
+            self.output_paths = {}
+            self.path.unlink(missing_ok=True)
+
+    def _set(self, fixed_query_params: dict, progress: dict | str) -> None:
+        with self._lock:
+            self._shards[self._key(fixed_query_params)] = progress
+            checkpoint = {
+                "created_at": self._created_at.isoformat(),
+                "shards": self._shards,
+                "output_paths": self.output_paths,
+            }
+            # Write to a temporary file first, so that a failure while writing
+            # cannot leave a truncated checkpoint behind
+            temp_path = self.path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(checkpoint, default=str))
+            os.replace(temp_path, self.path)
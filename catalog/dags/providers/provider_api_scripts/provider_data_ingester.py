@@ -1,8 +1,10 @@
 import json
 import logging
+import threading
 import traceback
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from typing import TypedDict
 
 from airflow.exceptions import AirflowException
@@ -12,6 +14,7 @@ from common.loader import provider_details as prov
 from common.requester import DelayedRequester
 from common.storage.media import MediaStore
 from common.storage.util import get_media_store_class
+from providers.provider_api_scripts.ingestion_checkpoint import IngestionCheckpoint
 
 
 logger = logging.getLogger(__name__)
@@ -78,12 +81,19 @@ class ProviderDataIngester(ABC):
     batch_limit: integer giving the number of records to get in each batch
     retries:     integer number of times to retry the request on error
     headers:     dictionary to be passed as headers to the request
+    fixed_query_params_concurrency: integer number of sets of fixed query params
+                 to ingest at once, each with its own checkpoint. Ingesters which
+                 set this above 1 must not keep per-batch state on the instance.
+    checkpoint_max_age: the age after which the checkpoint of a failed ingestion
+                 is no longer resumed
     """
 
     delay = 1
     retries = 3
     batch_limit = 100
     headers: dict = {}
+    fixed_query_params_concurrency = 1
+    checkpoint_max_age = timedelta(days=2)
 
     @property
     @abstractmethod
@@ -146,6 +156,12 @@ class ProviderDataIngester(ABC):
         # Keep track of number of records ingested
         self.record_count = 0
 
+        # Guards the media stores and the record count when sets of fixed query
+        # params are ingested concurrently, and signals the remaining sets to stop
+        # when one of them fails.
+        self._store_lock = threading.Lock()
+        self._stop_ingestion = threading.Event()
+
         # Set default headers
         self.headers = {"User-Agent": prov.UA_STRING} | self.headers
 
@@ -203,6 +219,17 @@ class ProviderDataIngester(ABC):
             or environment == "local"
         )
 
+        # The checkpoint is loaded before ingestion begins, so that the media stores
+        # write to the files of a previous attempt, and those files are the ones
+        # which are loaded once ingestion has completed.
+        self._checkpoint: IngestionCheckpoint | None = None
+        if (
+            self.fixed_query_params_concurrency > 1
+            and not self.initial_query_params
+            and not self.override_query_params
+        ):
+            self._get_checkpoint()
+
     def _init_media_stores(self, day_shift: int = None) -> dict[str, MediaStore]:
         """Initialize a media store for each media type supported by this provider."""
 
@@ -216,7 +243,10 @@ class ProviderDataIngester(ABC):
         return media_stores
 
     def _ingest_records(
-        self, initial_query_params: dict | None, fixed_query_params: dict | None
+        self,
+        initial_query_params: dict | None,
+        fixed_query_params: dict | None,
+        checkpoint: IngestionCheckpoint | None = None,
     ) -> None:
         """
         Perform ingestion.
@@ -229,6 +259,8 @@ class ProviderDataIngester(ABC):
         fixed_query_params:      Optional, fixed query params which should be passed to
                                  `get_next_query_params`. These should not change during this
                                  round of ingestion.
+        checkpoint:              Optional checkpoint in which to record the progress
+                                 of this round of ingestion after each batch.
         """
         should_continue = True
         # Use initial_query_params if provided, or get the next set of params.
@@ -237,8 +269,7 @@ class ProviderDataIngester(ABC):
         )
         if initial_query_params:
             logger.info(
-                "Using initial_query_params from dag_run conf:"
-                f" {json.dumps(self.initial_query_params)}"
+                f"Using initial_query_params: {json.dumps(initial_query_params)}"
             )
 
         # If an ingestion limit has been set and we have already ingested records
@@ -261,7 +292,9 @@ class ProviderDataIngester(ABC):
                 batch, should_continue = self.get_batch(query_params)
 
                 if batch and len(batch) > 0:
-                    self.record_count += self.process_batch(batch)
+                    processed_count = self.process_batch(batch)
+                    with self._store_lock:
+                        self.record_count += processed_count
                     logger.info(f"{self.record_count} records ingested so far.")
                 else:
                     logger.info("Batch complete.")
@@ -310,6 +343,19 @@ class ProviderDataIngester(ABC):
             # Get next query params
             query_params = self._get_query_params(query_params, fixed_query_params)
 
+            if checkpoint is not None:
+                # Write out the records of this batch before recording the progress,
+                # so that a resumed ingestion cannot skip records that were not saved
+                self._commit_records()
+                if not should_continue:
+                    # Record that the set is complete even if ingestion is stopping,
+                    # so that the next attempt does not resume it past its end
+                    checkpoint.complete(fixed_query_params)
+                    break
+                checkpoint.update(fixed_query_params, query_params)
+                if self._stop_ingestion.is_set():
+                    break
+
         # Commit whatever records we were able to process
         self._commit_records()
 
@@ -325,6 +371,12 @@ class ProviderDataIngester(ABC):
         if not (fixed_query_params := self.get_fixed_query_params()):
             # If no fixed params were provided, simply begin ingestion
             self._ingest_records(self.initial_query_params, {})
+        elif (
+            self.fixed_query_params_concurrency > 1
+            and not self.initial_query_params
+            and not self.override_query_params
+        ):
+            self._ingest_fixed_query_params_concurrently(fixed_query_params)
         else:
             # Else, ingestion should be run separately for each set of fixed_query_params.
             logger.info(
@@ -366,6 +418,102 @@ class ProviderDataIngester(ABC):
         if error_summary := self._get_ingestion_errors():
             raise error_summary
 
+    def _ingest_fixed_query_params_concurrently(
+        self, fixed_query_params: list[dict]
+    ) -> None:
+        """
+        Ingest several sets of fixed query params at once, using a pool of threads.
+
+        The progress of each set is recorded in a checkpoint after every batch. If
+        ingestion fails, the sets which are in progress stop after their current
+        batch, and the next attempt resumes only the sets which were not completed,
+        each from its last batch, and appends to the same files. All sets share the
+        media stores and the DelayedRequester, so the delay between requests still
+        applies to the provider as a whole.
+        """
+        checkpoint = self._get_checkpoint()
+        pending_params = [
+            params
+            for params in fixed_query_params
+            if not checkpoint.is_complete(params)
+        ]
+        logger.info(
+            f"Ingesting {len(pending_params)} of {len(fixed_query_params)} sets of"
+            f" fixed query params, {self.fixed_query_params_concurrency} at a time."
+        )
+
+        self._stop_ingestion.clear()
+        with ThreadPoolExecutor(
+            max_workers=self.fixed_query_params_concurrency,
+            thread_name_prefix=self.__class__.__name__,
+        ) as executor:
+            futures = [
+                executor.submit(self._ingest_fixed_query_params, params, checkpoint)
+                for params in pending_params
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Let the sets in progress finish their current batch, and do not
+                # start any others
+                self._stop_ingestion.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        checkpoint.clear()
+
+    def _get_checkpoint(self) -> IngestionCheckpoint:
+        """
+        Get the checkpoint of the concurrent ingestion, loading the progress of a
+        previous attempt the first time.
+
+        The media stores append to the files of the previous attempt, which contain
+        the records of the sets it ingested. If the checkpoint does not record the
+        file of every media store, its progress is discarded, and every set is
+        ingested again.
+        """
+        if self._checkpoint is not None:
+            return self._checkpoint
+
+        checkpoint = IngestionCheckpoint.for_ingester(
+            self.dag_id or self.__class__.__name__,
+            self.date,
+            self.checkpoint_max_age,
+        )
+        if checkpoint.load():
+            output_paths = checkpoint.output_paths
+            if output_paths.keys() == self.media_stores.keys():
+                for media_type, store in self.media_stores.items():
+                    store.output_path = output_paths[media_type]
+                    logger.info(
+                        f"Appending {media_type} records to {store.output_path}."
+                    )
+            else:
+                logger.warning(
+                    "The checkpoint does not record the files of the previous"
+                    " attempt, so ingestion will start over."
+                )
+                checkpoint.clear()
+        checkpoint.output_paths = {
+            media_type: store.output_path
+            for media_type, store in self.media_stores.items()
+        }
+        self._checkpoint = checkpoint
+        return checkpoint
+
+    def _ingest_fixed_query_params(
+        self, fixed_params: dict, checkpoint: IngestionCheckpoint
+    ) -> None:
+        """Ingest a single set of fixed query params, resuming from the checkpoint."""
+        if self._stop_ingestion.is_set():
+            return
+        logger.info(f"==Starting ingestion with fixed params: {fixed_params}==")
+        self._ingest_records(
+            checkpoint.get_query_params(fixed_params), fixed_params, checkpoint
+        )
+
     def _should_skip_ingestion_error(self, error: Exception) -> bool:
         """Determine whether an error should be skipped."""
         if self.skip_all_ingestion_errors:
@@ -565,7 +713,8 @@ class ProviderDataIngester(ABC):
 
                 # Add the record to the correct store
                 store = self.media_stores[media_type]
-                store.add_item(**record)
+                with self._store_lock:
+                    store.add_item(**record)
                 processed_count += 1
 
                 if self.limit and (self.record_count + processed_count) >= self.limit:
@@ -605,8 +754,9 @@ class ProviderDataIngester(ABC):
 
     def _commit_records(self) -> int:
         total = 0
-        for store in self.media_stores.values():
-            total += store.commit()
+        with self._store_lock:
+            for store in self.media_stores.values():
+                total += store.commit()
         logger.info(f"Committed {total} records")
         return total
 
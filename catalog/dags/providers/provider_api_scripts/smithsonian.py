@@ -30,6 +30,10 @@ class SmithsonianDataIngester(ProviderDataIngester):
     delay = 5.0
     batch_limit = 1000
     hash_prefix_length = 2
+    # Each hash prefix is ingested separately, so that several of the slow search
+    # requests can be in flight at once while the delay keeps the overall request
+    # rate within the limit of the API key.
+    fixed_query_params_concurrency = 4
     description_types = {
         "description",
         "summary",
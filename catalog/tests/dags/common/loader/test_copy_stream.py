@@ -0,0 +1,77 @@
+import gzip
+import io
+import zipfile
+from unittest import mock
+
+import pytest
+
+from common.loader import copy_stream
+
+
+ROWS = b"id\tname\n1\tapple\n2\tbanana\n3\tcherry\n"
+COPY_SQL = "COPY fruit FROM STDIN DELIMITER E'\\t' CSV HEADER"
+
+
+@pytest.mark.parametrize("size", [-1, 1, 5, 1024])
+def test_copy_stream_passes_all_lines_through(size):
+    stream = copy_stream.CopyStream(io.BytesIO(ROWS))
+
+    data = b""
+    while chunk := stream.read(size):
+        data += chunk
+
+    assert data == ROWS
+    assert stream.row_count == 3
+
+
+def test_copy_stream_filters_rows_but_not_the_header():
+    stream = copy_stream.CopyStream(
+        io.BytesIO(ROWS), row_filter=lambda line: b"banana" not in line
+    )
+
+    assert stream.read() == b"id\tname\n1\tapple\n3\tcherry\n"
+    assert stream.row_count == 2
+    assert stream.filtered_count == 1
+
+
+def test_copy_stream_without_header():
+    stream = copy_stream.CopyStream(
+        io.BytesIO(ROWS),
+        row_filter=lambda line: not line.startswith(b"id"),
+        header=False,
+    )
+
+    assert stream.read() == b"1\tapple\n2\tbanana\n3\tcherry\n"
+    assert stream.row_count == 3
+
+
+@pytest.fixture
+def cursor():
+    with mock.patch.object(copy_stream.PostgresHook, "get_conn") as get_conn:
+        cursor = get_conn.return_value.cursor.return_value.__enter__.return_value
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, file, size: copied.append(
+            file.read()
+        )
+        cursor.copied = copied
+        yield cursor
+
+
+def test_copy_stream_sets_timeout_on_copy_connection(cursor):
+    source = gzip.GzipFile(fileobj=io.BytesIO(gzip.compress(ROWS)))
+
+    assert copy_stream.copy_stream(COPY_SQL, source, statement_timeout=30) == 3
+
+    cursor.execute.assert_called_once_with("SET statement_timeout TO '30s';")
+    assert cursor.copy_expert.call_args.args[0] == COPY_SQL
+    assert cursor.copied == [ROWS]
+
+
+def test_copy_zip_member(cursor, tmp_path):
+    zip_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("fruit.tsv", ROWS)
+        archive.writestr("other.tsv", b"other\n")
+
+    assert copy_stream.copy_zip_member(COPY_SQL, zip_path, "fruit.tsv") == 3
+    assert cursor.copied == [ROWS]
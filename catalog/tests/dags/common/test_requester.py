@@ -37,6 +37,19 @@ def test_delay_processing(mock_time, delay, last_request, time_value, expected_w
         mock_time.sleep.assert_not_called()
 
 
+@patch("common.requester.time")
+def test_delay_processing_reserves_consecutive_slots(mock_time):
+    # Requests made at the same moment, e.g. from several threads, must each
+    # wait for their own slot rather than all waiting for the same one
+    mock_time.time.return_value = 100
+    dq = requester.DelayedRequester(2)
+
+    for _ in range(3):
+        dq._delay_processing()
+
+    assert [call.args for call in mock_time.sleep.call_args_list] == [(2,), (4,)]
+
+
 def test_get_delays_processing(monkeypatch):
     def mock_requests_get(url, params, **kwargs):
         r = requests.Response()
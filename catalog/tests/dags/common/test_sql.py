@@ -180,3 +180,12 @@ def test_run_statement_timeout():
     pg.run_statement_timeout()
     actual = pg.run(sql="show statement_timeout;", statement_timeout=0)
     assert actual == ("10s",)
+
+
+def test_advisory_lock_is_held_for_the_block():
+    pg = PostgresHook(default_statement_timeout=10)
+    try_lock = "SELECT pg_try_advisory_lock(hashtext('test_advisory_lock'));"
+    with pg.advisory_lock("test_advisory_lock"):
+        # Another session cannot take the lock
+        assert pg.get_records(try_lock) == [(False,)]
+    assert pg.get_records(try_lock) == [(True,)]
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from unittest.mock import call, patch
 
@@ -88,3 +89,60 @@ def test_clean_tsv_cleans_tsv_rows(tmpdir):
         tsv_cleaner.clean_tsv(tsv_file_path)
     for i, expected_call in enumerate(expected_calls):
         assert mock_image_store.mock_calls[i] == expected_call
+
+
+def _read_outputs(outputs):
+    return {
+        provider: Path(output_path).read_text()
+        for provider, output_path in outputs.items()
+    }
+
+
+def _with_tag_names(rows):
+    """Replace the tags of each row with their names, as real stores expect."""
+    tags = image.Image._fields.index("tags")
+    cleaned_rows = []
+    for row in rows.splitlines():
+        columns = row.split("\t")
+        columns[tags] = json.dumps([tag["name"] for tag in json.loads(columns[tags])])
+        cleaned_rows.append("\t".join(columns) + "\n")
+    return "".join(cleaned_rows)
+
+
+def test_clean_tsv_directory_in_parallel(tmp_path, monkeypatch):
+    tsv_directory = tmp_path / "tsvs"
+    tsv_directory.mkdir()
+    rows = _with_tag_names((RESOURCES / "multi_prov.tsv").read_text())
+    (tsv_directory / "a.tsv").write_text(rows * 3)
+    (tsv_directory / "b.tsv").write_text(rows)
+
+    # Clean each file as a whole, and then in shards of a single row each
+    outputs = {}
+    for shard_size in [10_000, 1]:
+        output_dir = tmp_path / str(shard_size)
+        output_dir.mkdir()
+        monkeypatch.setenv("OUTPUT_DIR", str(output_dir))
+        outputs[shard_size] = tsv_cleaner.clean_tsv_directory(
+            tsv_directory, processes=2, shard_size=shard_size
+        )
+        # Only the merged file of each provider remains
+        assert sorted(output_dir.iterdir()) == sorted(
+            Path(output_path) for output_path in outputs[shard_size].values()
+        )
+
+    assert outputs[10_000].keys() == {"test_provider", "next_provider"}
+    merged = _read_outputs(outputs[10_000])
+    assert merged == _read_outputs(outputs[1])
+    # Each provider has one row in the source file, which was cleaned four times
+    assert all(len(content.splitlines()) == 4 for content in merged.values())
+
+
+def test_get_shards_splits_files_at_line_boundaries(tmp_path):
+    tsv = tmp_path / "a.tsv"
+    tsv.write_text("one\ntwo\nthree\n")
+
+    assert tsv_cleaner._get_shards([str(tsv)], 5) == [
+        (str(tsv), 0, 8),
+        (str(tsv), 8, 14),
+    ]
+    assert tsv_cleaner._get_shards([str(tsv)], 100) == [(str(tsv), 0, 14)]
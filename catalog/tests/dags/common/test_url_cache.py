@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from common.url_cache import URLCache
+
+
+def test_url_cache_persists_entries(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = URLCache(path)
+    cache.set("files", "https://example.com/a.mp3", {"size": 1}, etag='"a"')
+    cache.close()
+
+    cached = URLCache(path).get("files", "https://example.com/a.mp3")
+    assert cached.value == {"size": 1}
+    assert cached.etag == '"a"'
+    assert cached.is_fresh(timedelta(minutes=1))
+    assert not cached.is_fresh(timedelta(0))
+
+
+def test_url_cache_separates_namespaces(tmp_path):
+    cache = URLCache(tmp_path / "cache.sqlite3")
+    cache.set("files", "https://example.com/a", {"size": 1})
+
+    assert cache.get("sets", "https://example.com/a") is None
+
+
+def test_url_cache_replaces_entries(tmp_path):
+    cache = URLCache(tmp_path / "cache.sqlite3")
+    cache.set("files", "https://example.com/a", {"size": 1}, etag='"a"')
+    cache.set("files", "https://example.com/a", {"size": 2})
+
+    cached = cache.get("files", "https://example.com/a")
+    assert cached.value == {"size": 2}
+    assert cached.etag is None
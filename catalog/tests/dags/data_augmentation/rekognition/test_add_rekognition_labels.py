@@ -1,3 +1,4 @@
+import io
 from pathlib import Path
 from unittest import mock
 
@@ -130,3 +131,98 @@ def test_parse_and_insert_labels_buffer_config(
     assert mock_insert_tags.call_count == expected_insert_call_count
     assert mock_variable.set.call_count == expected_insert_call_count - 1
     mock_variable.delete.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "file_size, range_count, expected",
+    [
+        (100, 4, [(0, 25), (25, 50), (50, 75), (75, 100)]),
+        (10, 3, [(0, 4), (4, 8), (8, 10)]),
+        # More ranges than bytes
+        (2, 4, [(0, 1), (1, 2)]),
+        (0, 4, []),
+    ],
+)
+def test_get_file_ranges(file_size, range_count, expected):
+    with mock.patch.object(add_rekognition_labels, "_get_s3_client") as mock_client:
+        mock_client.return_value.head_object.return_value = {"ContentLength": file_size}
+        actual = add_rekognition_labels.get_file_ranges.function(
+            constants.S3_BUCKET, TEST_PREFIX, range_count
+        )
+
+    assert actual == expected
+    mock_client.return_value.head_object.assert_called_once_with(
+        Bucket="migrated-cccatalog-archives", Key=TEST_PREFIX
+    )
+
+
+@pytest.mark.parametrize("range_size", [1, 2, 3, 5, 7, 11, 64, 1000])
+def test_iter_range_lines_yields_each_line_once(range_size):
+    lines = [b"first\n", b"\n", b"second line\n", b"3\n", b"the last line"]
+    content = b"".join(lines)
+
+    actual = []
+    for start in range(0, len(content), range_size):
+        end = min(start + range_size, len(content))
+        actual += add_rekognition_labels._iter_range_lines(
+            io.BytesIO(content), start, end
+        )
+
+    assert actual == lines
+
+
+def test_copy_rows_writes_csv():
+    cursor = mock.MagicMock()
+    rows = [
+        ("b840de61-fb9d-4ec5-9572-8d778875869f", '[{"name": "Say \\"hi\\", ok"}]', 7),
+    ]
+    add_rekognition_labels._copy_rows(cursor, "staging", rows)
+
+    query, buffer = cursor.copy_expert.call_args.args
+    assert query.startswith("COPY staging (identifier, tags, position) FROM STDIN")
+    assert buffer.read() == (
+        'b840de61-fb9d-4ec5-9572-8d778875869f,"[{""name"": ""Say \\""hi\\"", ok""}]",7\r\n'
+    )
+
+
+@mock.patch.object(add_rekognition_labels, "get_current_context", return_value={})
+@mock.patch.object(add_rekognition_labels, "_get_s3_client")
+@mock.patch.object(add_rekognition_labels, "PostgresHook")
+@mock.patch("smart_open.open")
+def test_insert_label_range(mock_file, mock_hook, mock_client, mock_context):
+    content = (
+        SAMPLE_JSON.replace("\n", "").encode()
+        + b"\n"
+        + b'{"image_uuid": "b840de61-fb9d-4ec5-9572-8d778875869f", "response": {"Labels": []}}\n'
+        + b"this line should fail!\n"
+    )
+    mock_file.return_value.__enter__.return_value = io.BytesIO(content)
+    cursor = mock_hook.return_value.get_conn.return_value.cursor.return_value
+    cursor = cursor.__enter__.return_value
+    cursor.rowcount = 1
+
+    actual = add_rekognition_labels.insert_label_range.function(
+        file_range=(0, len(content)),
+        **{**DEFAULT_ARGS, "in_memory_buffer_size": 1},
+    )
+
+    assert actual == ParseResults(3, 1, 1, ["this line should fail!\n"])
+    cursor.copy_expert.assert_called_once()
+    queries = [call.args[0] for call in cursor.execute.call_args_list]
+    assert "CREATE UNLOGGED TABLE rekognition_label_insertion_0" in queries[1]
+    assert "INSERT INTO rekognition_label_insertion " in queries[2]
+    assert "ORDER BY identifier, position DESC" in queries[2]
+    assert "DROP TABLE IF EXISTS rekognition_label_insertion_0" in queries[3]
+    mock_hook.return_value.get_conn.return_value.commit.assert_called_once()
+
+
+def test_combine_parse_results():
+    actual = add_rekognition_labels.combine_parse_results.function(
+        [
+            ParseResults(10, 1, 2, ["a", "b"]),
+            # XComs may deserialize as plain lists
+            [20, 2, 4, ["c", "d", "e", "f"]],
+        ]
+    )
+
+    assert actual == ParseResults(30, 3, 6, ["a", "b", "c", "d", "e"])
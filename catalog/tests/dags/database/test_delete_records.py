@@ -5,10 +5,15 @@ import pytest
 
 from common.storage import columns as col
 from common.storage.db_columns import DELETED_IMAGE_TABLE_COLUMNS, IMAGE_TABLE_COLUMNS
+from database.delete_records import constants
 from database.delete_records.delete_records import (
     create_deleted_records,
     delete_records_from_media_table,
+    delete_records_in_batches,
+    drop_temp_tables,
+    get_pending_batches,
     notify_slack,
+    select_rows_to_delete,
 )
 from tests.test_utils import sql
 
@@ -329,6 +334,134 @@ def test_delete_no_records_from_media_table(
     assert len(actual_rows) == 3
 
 
+@pytest.fixture
+def run_key(identifier):
+    yield identifier
+    drop_temp_tables.function(run_key=identifier, postgres_conn_id=sql.POSTGRES_CONN_ID)
+
+
+def _delete_records_in_batches(image_table, run_key, **kwargs):
+    return delete_records_in_batches.function(
+        run_key=run_key,
+        deleted_reason="FOO",
+        media_type=image_table,
+        db_columns=IMAGE_TABLE_COLUMNS,
+        deleted_db_columns=DELETED_IMAGE_TABLE_COLUMNS,
+        postgres_conn_id=sql.POSTGRES_CONN_ID,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("batch_size, workers", [(10, 1), (1, 1), (1, 2)])
+def test_delete_records_in_batches(
+    postgres_with_image_and_deleted_image_table,
+    image_table,
+    deleted_image_table,
+    run_key,
+    batch_size,
+    workers,
+):
+    _load_sample_data_into_image_table(
+        image_table,
+        postgres_with_image_and_deleted_image_table,
+    )
+
+    total_row_count = select_rows_to_delete.function(
+        table=image_table,
+        select_query=f"WHERE provider='{MATCHING_PROVIDER}'",
+        run_key=run_key,
+        postgres_conn_id=sql.POSTGRES_CONN_ID,
+    )
+    assert total_row_count == 2
+
+    deleted_count = _delete_records_in_batches(
+        image_table,
+        run_key,
+        total_row_count=total_row_count,
+        batch_size=batch_size,
+        workers=workers,
+    )
+    assert deleted_count == 2
+
+    cursor = postgres_with_image_and_deleted_image_table.cursor
+    cursor.execute(f"SELECT foreign_identifier FROM {image_table};")
+    assert cursor.fetchall() == [(FID_C,)]
+    cursor.execute(
+        f"SELECT foreign_identifier, deleted_reason FROM {deleted_image_table}"
+        " ORDER BY foreign_identifier;"
+    )
+    assert cursor.fetchall() == [(FID_A, "FOO"), (FID_B, "FOO")]
+
+
+def test_delete_records_in_batches_resumes_from_completed_batches(
+    postgres_with_image_and_deleted_image_table,
+    image_table,
+    deleted_image_table,
+    run_key,
+):
+    _load_sample_data_into_image_table(
+        image_table,
+        postgres_with_image_and_deleted_image_table,
+    )
+    total_row_count = select_rows_to_delete.function(
+        table=image_table,
+        select_query="WHERE TRUE",
+        run_key=run_key,
+        postgres_conn_id=sql.POSTGRES_CONN_ID,
+    )
+    assert total_row_count == 3
+
+    # Record the first batch as having been deleted by a previous attempt
+    postgres = postgres_with_image_and_deleted_image_table
+    postgres.cursor.execute(
+        f"INSERT INTO {constants.PROGRESS_TABLE_NAME.format(run_key=run_key)}"
+        " VALUES (0, 1);"
+    )
+    postgres.connection.commit()
+
+    # Selecting the rows again on retry does not select them anew
+    assert (
+        select_rows_to_delete.function(
+            table=image_table,
+            select_query="WHERE FALSE",
+            run_key=run_key,
+            postgres_conn_id=sql.POSTGRES_CONN_ID,
+        )
+        == 3
+    )
+
+    deleted_count = _delete_records_in_batches(
+        image_table,
+        run_key,
+        total_row_count=total_row_count,
+        batch_size=1,
+        workers=2,
+    )
+
+    # The count includes the batch deleted previously, whose record is not deleted
+    assert deleted_count == 3
+    postgres.cursor.execute(f"SELECT COUNT(*) FROM {image_table};")
+    assert postgres.cursor.fetchone()[0] == 1
+    postgres.cursor.execute(f"SELECT COUNT(*) FROM {deleted_image_table};")
+    assert postgres.cursor.fetchone()[0] == 2
+
+
+@pytest.mark.parametrize(
+    "total_row_count, batch_size, completed_batches, expected",
+    [
+        (0, 10, set(), []),
+        (25, 10, set(), [0, 10, 20]),
+        (30, 10, set(), [0, 10, 20]),
+        (25, 10, {0, 20}, [10]),
+        (25, 10, {0, 10, 20}, []),
+    ],
+)
+def test_get_pending_batches(total_row_count, batch_size, completed_batches, expected):
+    assert (
+        get_pending_batches(total_row_count, batch_size, completed_batches) == expected
+    )
+
+
 def test_notify_slack():
     message = notify_slack.function(123456789, "audio", "WHERE provider='foo';")
     assert message == (
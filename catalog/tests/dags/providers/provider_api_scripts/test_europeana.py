@@ -1,3 +1,5 @@
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
@@ -171,6 +173,66 @@ def test_get_additional_item_data_no_foreign_id(ingester):
     patch_call.assert_not_called
 
 
+def test_get_additional_item_data_batch_is_concurrent_and_ordered(ingester):
+    batch = [
+        {"id": f"/item/{idx}", "edmIsShownBy": [f"https://example.com/{idx}.jpg"]}
+        for idx in range(8)
+    ]
+    lock = threading.Lock()
+    in_flight = max_in_flight = 0
+
+    def get_response_json(query_params, endpoint):
+        nonlocal in_flight, max_in_flight
+        idx = int(endpoint.removesuffix(".json").rsplit("/", 1)[1])
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Later items respond sooner, to check that the order is preserved
+        time.sleep(0.01 * (len(batch) - idx))
+        with lock:
+            in_flight -= 1
+        return {
+            "success": True,
+            "object": {
+                "aggregations": [
+                    {
+                        "webResources": [
+                            {
+                                "about": f"https://example.com/{idx}.jpg",
+                                "ebucoreHasMimeType": "image/jpeg",
+                            }
+                        ]
+                    }
+                ]
+            },
+        }
+
+    with patch.object(ingester, "get_response_json", side_effect=get_response_json):
+        actual = ingester._get_additional_item_data_batch(batch)
+
+    assert [item["about"] for item in actual] == [
+        f"https://example.com/{idx}.jpg" for idx in range(len(batch))
+    ]
+    assert 1 < max_in_flight <= ingester.item_request_concurrency
+
+
+def test_process_batch_uses_prefetched_item_data(ingester):
+    image_store = ImageStore(provider=prov.EUROPEANA_DEFAULT_PROVIDER)
+    ingester.media_stores = {"image": image_store}
+    batch_json = _get_resource_json("europeana_example.json")
+    with (
+        patch.object(
+            ingester, "_get_additional_item_data_batch", return_value=[{}] * 3
+        ) as batch_call,
+        patch.object(ingester, "_get_additional_item_data") as item_call,
+        patch.object(image_store, "add_item"),
+    ):
+        ingester.process_batch(batch_json["items"][:3])
+
+    batch_call.assert_called_once_with(batch_json["items"][:3])
+    item_call.assert_not_called()
+
+
 def test_record_builder_get_record_data(ingester, record_builder):
     image_data = _get_resource_json("image_data_example.json") | {
         "item_webresource": _get_resource_json("item_full.json")
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from unittest import mock
 
 import pytest
@@ -391,14 +391,129 @@ def test_ingest_records_when_large_batches_detected():
         mock.patch(
             "providers.provider_api_scripts.time_delineated_provider_data_ingester.TimeDelineatedProviderDataIngester._ingest_records"
         ) as ingest_for_pair_mock,
+        mock.patch.object(
+            ingester,
+            "_split_large_batch",
+            return_value=[{"min_upload_date": 1}, {"min_upload_date": 2}],
+        ) as split_mock,
     ):
-        # Set large_batches to include one timestamp pair
+        # Set large_batches to include one timestamp pair, detected twice
         mock_start = datetime(2020, 1, 1, 1, 0, 0)
         mock_end = datetime(2020, 1, 1, 2, 0, 0)
         ingester.large_batches = [
             (mock_start, mock_end),
+            (mock_start, mock_end),
         ]
 
         ingester.ingest_records()
-        # An additional call made to ingest_records_for_timestamp_pair for each license type
-        assert ingest_for_pair_mock.call_count == 8
+        # The large batch is split once, and an additional call made to
+        # ingest_records_for_timestamp_pair for each of the smaller intervals
+        split_mock.assert_called_once_with(mock_start, mock_end)
+        assert ingest_for_pair_mock.call_count == 2
+
+
+def _count_response(upload_times):
+    """Mock the API to report the count of the given upload times in each query."""
+
+    def get_response_json(query_params):
+        count = sum(
+            query_params["min_upload_date"]
+            <= upload_time
+            <= query_params["max_upload_date"]
+            for upload_time in upload_times
+        )
+        return {"stat": "ok", "photos": {"total": count}}
+
+    return get_response_json
+
+
+def test_split_large_batch_bisects_interval_by_time():
+    ingester = FlickrDataIngester(date=FROZEN_DATE)
+    start = datetime(2020, 4, 1, 1, 0, 0, tzinfo=timezone.utc)
+    end = start + timedelta(minutes=5)
+    # 20 records in each second of the second half of the interval
+    upload_times = [
+        start + timedelta(seconds=second, microseconds=i)
+        for second in range(150, 300)
+        for i in range(1, 21)
+    ]
+
+    with mock.patch.object(
+        ingester, "get_response_json", side_effect=_count_response(upload_times)
+    ) as response_mock:
+        fixed_query_params = ingester._split_large_batch(start, end)
+
+    # The empty first half is skipped, and the second half is bisected once more
+    assert fixed_query_params == [
+        {
+            "min_upload_date": start + timedelta(seconds=150),
+            "max_upload_date": start + timedelta(seconds=225),
+        },
+        {"min_upload_date": start + timedelta(seconds=225), "max_upload_date": end},
+    ]
+    # Count probes request a single record without extras
+    probe_params = response_mock.call_args.args[0]
+    assert probe_params["per_page"] == 1
+    assert "extras" not in probe_params
+    # The full interval, each half, and each quarter of the second half
+    assert response_mock.call_count == 5
+    assert ingester.requests_count == 5
+
+
+def test_split_large_batch_splits_by_license_at_min_interval():
+    ingester = FlickrDataIngester(date=FROZEN_DATE)
+    ingester.max_records = 10
+    start = datetime(2020, 4, 1, 1, 0, 0, tzinfo=timezone.utc)
+    end = start + timedelta(seconds=1)
+
+    def get_response_json(query_params):
+        total = 20 if "," in query_params["license"] else 5
+        if query_params["license"] == "10":
+            total = 0
+        return {"stat": "ok", "photos": {"total": total}}
+
+    with mock.patch.object(
+        ingester, "get_response_json", side_effect=get_response_json
+    ):
+        fixed_query_params = ingester._split_large_batch(start, end)
+
+    assert [params["license"] for params in fixed_query_params] == [
+        "1",
+        "2",
+        "3",
+        "4",
+        "5",
+        "6",
+        "9",
+    ]
+
+
+def test_get_record_count_is_cached_per_interval():
+    ingester = FlickrDataIngester(date=FROZEN_DATE)
+    start = datetime(2020, 4, 1, 1, 0, 0, tzinfo=timezone.utc)
+    end = start + timedelta(minutes=5)
+
+    with mock.patch.object(
+        ingester, "get_response_json", return_value={"photos": {"total": 3}}
+    ) as response_mock:
+        assert ingester._get_record_count(start, end) == 3
+        assert ingester._get_record_count(start, end) == 3
+        assert ingester._get_record_count(start, end, license_="4") == 3
+
+    assert response_mock.call_count == 2
+
+
+def test_get_batch_data_records_count_of_large_batch():
+    ingester = FlickrDataIngester(date=FROZEN_DATE)
+    start = datetime(2020, 4, 1, 1, 0, 0, tzinfo=timezone.utc)
+    end = start + timedelta(minutes=5)
+    ingester.current_timestamp_pair = (start, end)
+
+    response_json = _get_resource_json("flickr_example_pretty.json")
+    response_json["photos"]["total"] = 5_000
+    ingester.get_batch_data(response_json)
+
+    # Splitting the large batch does not probe the count of the whole interval again
+    with mock.patch.object(ingester, "get_response_json") as response_mock:
+        assert ingester._get_record_count(start, end) == 5_000
+    response_mock.assert_not_called()
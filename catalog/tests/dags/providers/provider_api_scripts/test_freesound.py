@@ -1,3 +1,4 @@
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,7 +8,11 @@ from tests.dags.providers.provider_api_scripts.resources.json_load import (
 )
 
 from common.licenses.licenses import LicenseInfo
-from providers.provider_api_scripts.freesound import FreesoundDataIngester
+from common.url_cache import URLCache
+from providers.provider_api_scripts.freesound import (
+    FILE_SIZE_NAMESPACE,
+    FreesoundDataIngester,
+)
 
 
 fsd = FreesoundDataIngester()
@@ -25,6 +30,16 @@ def freesound_module():
     fsd._get_set_info = old_get_set
 
 
+@pytest.fixture(autouse=True)
+def url_cache(monkeypatch, tmp_path):
+    cache_path = tmp_path / "freesound_cache.sqlite3"
+    cache = URLCache(cache_path)
+    monkeypatch.setattr(FreesoundDataIngester, "cache_path", cache_path)
+    monkeypatch.setattr(fsd, "url_cache", cache)
+    yield cache
+    cache.close()
+
+
 @pytest.fixture
 def file_size_patch():
     with patch.object(fsd, "_get_audio_file_size") as get_file_size_mock:
@@ -83,7 +98,7 @@ def test_get_audio_pages_returns_correctly_with_empty_list():
 def test_get_audio_file_size_retries_and_does_not_raise(exception_type, audio_data):
     expected_result = None
     # Patch the sleep function so it doesn't take long
-    with patch.object(fsd.delayed_requester, "head") as head_patch, patch("time.sleep"):
+    with patch.object(fsd.preview_requester, "head") as head_patch, patch("time.sleep"):
         head_patch.side_effect = exception_type("whoops")
         actual_result = fsd.get_record_data(audio_data)
 
@@ -92,7 +107,7 @@ def test_get_audio_file_size_retries_and_does_not_raise(exception_type, audio_da
 
 
 def test_get_audio_file_size_returns_None_when_preview_url_404s(audio_data):
-    with patch.object(fsd.delayed_requester, "head") as head_patch:
+    with patch.object(fsd.preview_requester, "head") as head_patch:
         # Returns None when 404
         head_patch.return_value = None
 
@@ -101,6 +116,72 @@ def test_get_audio_file_size_returns_None_when_preview_url_404s(audio_data):
         assert actual_result is None
 
 
+def test_get_audio_file_size_stores_probed_size(url_cache):
+    url = "https://cdn.freesound.org/previews/1/1-hq.mp3"
+    response = MagicMock(
+        status_code=200, headers={"content-length": "16359", "etag": '"abc"'}
+    )
+    with patch.object(fsd.preview_requester, "head", return_value=response):
+        assert fsd._get_audio_file_size(url) == "16359"
+
+    cached = url_cache.get(FILE_SIZE_NAMESPACE, url)
+    assert cached.value == {"content_length": "16359"}
+    assert cached.etag == '"abc"'
+
+
+def test_get_audio_file_size_uses_fresh_cache(url_cache):
+    url = "https://cdn.freesound.org/previews/1/1-hq.mp3"
+    url_cache.set(FILE_SIZE_NAMESPACE, url, {"content_length": "16359"}, '"abc"')
+
+    with patch.object(fsd.preview_requester, "head") as head_patch:
+        assert fsd._get_audio_file_size(url) == "16359"
+    head_patch.assert_not_called()
+
+
+def test_get_audio_file_size_revalidates_stale_cache(url_cache, monkeypatch):
+    url = "https://cdn.freesound.org/previews/1/1-hq.mp3"
+    url_cache.set(FILE_SIZE_NAMESPACE, url, {"content_length": "16359"}, '"abc"')
+    monkeypatch.setattr(fsd, "preview_cache_max_age", timedelta(0))
+
+    with patch.object(
+        fsd.preview_requester, "head", return_value=MagicMock(status_code=304)
+    ) as head_patch:
+        assert fsd._get_audio_file_size(url) == "16359"
+    assert head_patch.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+
+
+def test_process_batch_prefetches_file_sizes(url_cache):
+    batch = _get_resource_json("page.json")
+    preview_urls = {
+        item["previews"][fsd.preferred_preview]
+        for item in batch
+        if item and item.get("previews")
+    }
+    response = MagicMock(status_code=200, headers={"content-length": "16359"})
+    with patch.object(fsd, "_head_audio_file", return_value=response) as head_patch:
+        fsd.process_batch(batch)
+
+    assert head_patch.call_count == len(preview_urls)
+    assert {call.args[0] for call in head_patch.call_args_list} == preview_urls
+    assert not fsd._prefetched_file_sizes
+
+
+def test_get_set_info_uses_cache():
+    ingester = FreesoundDataIngester()
+    set_url = "https://freesound.org/apiv2/packs/35596/"
+    with patch.object(
+        ingester, "get_response_json", return_value={"id": 35596, "name": "Birds"}
+    ) as get_mock:
+        assert ingester._get_set_info(set_url) == (35596, "Birds")
+    get_mock.assert_called_once()
+
+    # A new ingester, as in a later run, uses the stored set information
+    ingester = FreesoundDataIngester()
+    with patch.object(ingester, "get_response_json") as get_mock:
+        assert ingester._get_set_info(set_url) == (35596, "Birds")
+    get_mock.assert_not_called()
+
+
 def test_get_query_params_increments_page_number():
     first_qp = fsd.get_next_query_params(None)
     second_qp = fsd.get_next_query_params(first_qp)
@@ -172,7 +253,7 @@ def test_get_audio_files_returns_none_when_missing_preferred_preview(audio_data)
 
 def test_get_audio_files_returns_none_when_unable_to_get_filesize(audio_data):
     # Mimics a 404 when attempting to get filesize information from the preview url
-    with patch.object(fsd.delayed_requester, "head") as head_patch:
+    with patch.object(fsd.preview_requester, "head") as head_patch:
         head_patch.return_value = None
 
         actual = fsd._get_audio_files(audio_data)
@@ -184,6 +184,60 @@ def test_get_batches(batch_length, min_and_max, expected):
             assert actual == expected
 
 
+def test_load_transformed_data_uses_a_staging_table_per_batch():
+    task = mock.Mock()
+    with (
+        mock.patch.object(PostgresHook, "get_execution_timeout", return_value=60),
+        mock.patch.object(PostgresHook, "get_records", return_value=[(5, 19)]),
+        mock.patch.object(PostgresHook, "advisory_lock") as lock_mock,
+        mock.patch.object(inaturalist, "sql") as sql_mock,
+    ):
+        sql_mock.create_loading_table.return_value = "load_image_20230101_2"
+        sql_mock.clean_intermediate_table_data.return_value = (1, 1)
+        sql_mock.upsert_records_to_db_table.return_value = 3
+        # Record the lock in the same call list as the loader functions
+        sql_mock.attach_mock(lock_mock, "advisory_lock")
+
+        actual = INAT.load_transformed_data((10, 19), "20230101", task)
+
+    assert actual["loaded"] == 5
+    assert actual["upserted"] == 3
+    # The batch is loaded into, cleaned and upserted from its own staging table,
+    # which is dropped afterwards
+    assert [c[0] for c in sql_mock.mock_calls if "." not in c[0]] == [
+        "drop_load_table",
+        "create_loading_table",
+        "clean_intermediate_table_data",
+        "advisory_lock",
+        "upsert_records_to_db_table",
+        "drop_load_table",
+    ]
+    sql_mock.create_loading_table.assert_called_once_with(
+        inaturalist.POSTGRES_CONN_ID, "20230101_2", media_type=IMAGE
+    )
+    assert (
+        sql_mock.upsert_records_to_db_table.call_args.kwargs["identifier"]
+        == "20230101_2"
+    )
+    lock_mock.assert_called_once_with(inaturalist.UPSERT_LOCK_NAME)
+
+
+def test_load_transformed_data_drops_staging_table_on_error():
+    task = mock.Mock()
+    with (
+        mock.patch.object(PostgresHook, "get_execution_timeout", return_value=60),
+        mock.patch.object(
+            PostgresHook, "get_records", side_effect=ValueError("Whoops :C")
+        ),
+        mock.patch.object(inaturalist, "sql") as sql_mock,
+        pytest.raises(ValueError, match="Whoops :C"),
+    ):
+        INAT.load_transformed_data((10, 19), "20230101", task)
+
+    assert sql_mock.drop_load_table.call_count == 2
+    sql_mock.upsert_records_to_db_table.assert_not_called()
+
+
 LAST_SUCCESS = pendulum.datetime(2023, 2, 15, tz="UTC")
 OLD = pendulum.datetime(2023, 1, 27, tz="UTC")
 NEW = pendulum.datetime(2023, 2, 27, tz="UTC")
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from providers.provider_api_scripts.ingestion_checkpoint import IngestionCheckpoint
+
+
+FIXED_PARAMS = {"q": "hash:a*"}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "checkpoint.json"
+
+
+def test_checkpoint_round_trip(path):
+    checkpoint = IngestionCheckpoint(path, timedelta(days=1))
+    checkpoint.output_paths = {"image": "/tmp/smithsonian_image.tsv"}
+    checkpoint.update(FIXED_PARAMS, {"start": 1000, **FIXED_PARAMS})
+    checkpoint.complete({"q": "hash:b*"})
+
+    resumed = IngestionCheckpoint(path, timedelta(days=1))
+    assert resumed.load() == 2
+    assert resumed.get_query_params(FIXED_PARAMS) == {"start": 1000, **FIXED_PARAMS}
+    assert not resumed.is_complete(FIXED_PARAMS)
+    assert resumed.is_complete({"q": "hash:b*"})
+    assert resumed.get_query_params({"q": "hash:b*"}) is None
+    assert resumed.output_paths == {"image": "/tmp/smithsonian_image.tsv"}
+
+    resumed.clear()
+    assert not path.exists()
+    assert resumed.output_paths == {}
+
+
+def test_checkpoint_ignores_old_checkpoint(path):
+    created_at = datetime.now(timezone.utc) - timedelta(days=3)
+    path.write_text(
+        json.dumps(
+            {
+                "created_at": created_at.isoformat(),
+                "shards": {json.dumps(FIXED_PARAMS): "complete"},
+            }
+        )
+    )
+
+    checkpoint = IngestionCheckpoint(path, timedelta(days=2))
+    assert checkpoint.load() == 0
+    assert not checkpoint.is_complete(FIXED_PARAMS)
+
+
+@pytest.mark.parametrize("contents", ["", "{", json.dumps({"shards": {}})])
+def test_checkpoint_ignores_unreadable_checkpoint(path, contents):
+    path.write_text(contents)
+
+    assert IngestionCheckpoint(path, timedelta(days=1)).load() == 0
+
+
+def test_checkpoint_for_ingester(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+
+    checkpoint = IngestionCheckpoint.for_ingester(
+        "smithsonian_workflow", "2024-01-01", timedelta(days=1)
+    )
+    assert (
+        checkpoint.path == tmp_path / "smithsonian_workflow_2024-01-01_checkpoint.json"
+    )
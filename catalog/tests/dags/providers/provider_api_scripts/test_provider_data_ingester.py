@@ -1,8 +1,11 @@
+import json
+from datetime import timedelta
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 import requests
 from airflow.exceptions import AirflowException
+from freezegun import freeze_time
 from requests.exceptions import HTTPError
 from tests.dags.providers.provider_api_scripts.resources.json_load import (
     make_resource_json_func,
@@ -21,6 +24,7 @@ from tests.dags.providers.provider_api_scripts.resources.provider_data_ingester.
 from common.loader import provider_details as prov
 from common.storage.audio import AudioStore, MockAudioStore
 from common.storage.image import ImageStore, MockImageStore
+from providers.provider_api_scripts.ingestion_checkpoint import IngestionCheckpoint
 from providers.provider_api_scripts.provider_data_ingester import (
     AggregateIngestionError,
 )
@@ -509,6 +513,172 @@ def test_ingest_records_merges_fixed_query_params():
         )
 
 
+@pytest.fixture
+def concurrent_ingester(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    ingester = MockProviderDataIngester(dag_id="mock_dag")
+    ingester.fixed_query_params_concurrency = 2
+    with (
+        patch.object(
+            ingester,
+            "get_fixed_query_params",
+            return_value=[{"foo": "a"}, {"foo": "b"}, {"foo": "c"}],
+        ),
+        patch.object(ingester, "process_batch", return_value=3),
+        patch.object(ingester, "_commit_records"),
+    ):
+        yield ingester
+
+
+def _checkpoint_path(tmp_path):
+    return tmp_path / "mock_dag_checkpoint.json"
+
+
+def test_ingest_records_ingests_fixed_query_params_concurrently(
+    concurrent_ingester, tmp_path
+):
+    def get_batch(query_params):
+        return EXPECTED_BATCH_DATA, query_params["page"] < 2
+
+    with patch.object(
+        concurrent_ingester, "get_batch", side_effect=get_batch
+    ) as get_batch_mock:
+        concurrent_ingester.ingest_records()
+
+    assert sorted(
+        (c.args[0]["foo"], c.args[0]["page"]) for c in get_batch_mock.call_args_list
+    ) == [("a", 1), ("a", 2), ("b", 1), ("b", 2), ("c", 1), ("c", 2)]
+    assert concurrent_ingester.record_count == 18
+    # The checkpoint is removed once every set of fixed params is complete
+    assert not _checkpoint_path(tmp_path).exists()
+
+
+def test_ingest_records_checkpoints_unfinished_fixed_query_params(
+    concurrent_ingester, tmp_path
+):
+    def get_batch(query_params):
+        if query_params["page"] == 2:
+            raise ValueError("Whoops :C")
+        return EXPECTED_BATCH_DATA, True
+
+    with (
+        patch.object(
+            concurrent_ingester,
+            "get_fixed_query_params",
+            return_value=[{"foo": "a"}],
+        ),
+        patch.object(concurrent_ingester, "get_batch", side_effect=get_batch),
+        pytest.raises(ValueError, match="Whoops :C"),
+    ):
+        concurrent_ingester.ingest_records()
+
+    checkpoint = json.loads(_checkpoint_path(tmp_path).read_text())
+    assert checkpoint["shards"] == {
+        json.dumps({"foo": "a"}): {"has_image": 1, "page": 2, "foo": "a"}
+    }
+
+
+def test_ingest_records_resumes_fixed_query_params_from_checkpoint(
+    concurrent_ingester, tmp_path
+):
+    checkpoint = IngestionCheckpoint(_checkpoint_path(tmp_path), timedelta(days=1))
+    checkpoint.output_paths = {
+        media_type: str(tmp_path / f"previous_{media_type}.tsv")
+        for media_type in concurrent_ingester.media_stores
+    }
+    checkpoint.complete({"foo": "a"})
+    checkpoint.update({"foo": "b"}, {"has_image": 1, "page": 5, "foo": "b"})
+
+    with patch.object(
+        concurrent_ingester, "get_batch", return_value=(EXPECTED_BATCH_DATA, False)
+    ) as get_batch_mock:
+        concurrent_ingester.ingest_records()
+
+    # The complete set is skipped, and the unfinished set resumes where it stopped
+    assert sorted(get_batch_mock.call_args_list, key=lambda c: c.args[0]["foo"]) == [
+        call({"has_image": 1, "page": 5, "foo": "b"}),
+        call({"has_image": 1, "page": 1, "foo": "c"}),
+    ]
+    # The records are appended to the files of the previous attempt
+    assert {
+        media_type: store.output_path
+        for media_type, store in concurrent_ingester.media_stores.items()
+    } == checkpoint.output_paths
+    assert not _checkpoint_path(tmp_path).exists()
+
+
+def test_ingest_records_resumes_fixed_query_params_without_checkpointed_files(
+    concurrent_ingester, tmp_path
+):
+    checkpoint = IngestionCheckpoint(_checkpoint_path(tmp_path), timedelta(days=1))
+    checkpoint.complete({"foo": "a"})
+
+    with patch.object(
+        concurrent_ingester, "get_batch", return_value=(EXPECTED_BATCH_DATA, False)
+    ) as get_batch_mock:
+        concurrent_ingester.ingest_records()
+
+    # Without the files of the previous attempt, every set is ingested again
+    assert get_batch_mock.call_count == 3
+
+
+def test_ingest_records_loads_every_set_of_fixed_query_params_after_retry(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(MockImageOnlyProviderDataIngester, "batch_limit", 1)
+    monkeypatch.setattr(
+        MockImageOnlyProviderDataIngester, "fixed_query_params_concurrency", 2
+    )
+    fixed_query_params = [{"foo": "a"}, {"foo": "b"}, {"foo": "c"}]
+    failing_params = {"has_image": 1, "page": 2, "foo": "b"}
+
+    def get_batch(query_params, fail):
+        if fail and query_params == failing_params:
+            raise ValueError("Whoops :C")
+        identifier = f"{query_params['foo']}-{query_params['page']}"
+        record = {
+            "id": identifier,
+            "media_type": "image",
+            "url": f"https://example.com/{identifier}.jpg",
+            "foreign_landing_url": f"https://example.com/{identifier}",
+        }
+        return [record], query_params["page"] < 3
+
+    def run_attempt(fail):
+        # Each attempt of the task initializes a new ingester
+        ingester = MockImageOnlyProviderDataIngester(dag_id="mock_dag")
+        with (
+            patch.object(
+                ingester, "get_fixed_query_params", return_value=fixed_query_params
+            ),
+            patch.object(
+                ingester,
+                "get_batch",
+                side_effect=lambda query_params: get_batch(query_params, fail),
+            ),
+        ):
+            ingester.ingest_records()
+        return ingester
+
+    with (
+        freeze_time("2024-01-01 00:00:00"),
+        pytest.raises(ValueError, match="Whoops :C"),
+    ):
+        run_attempt(fail=True)
+    with freeze_time("2024-01-01 01:00:00"):
+        ingester = run_attempt(fail=False)
+
+    output_path = ingester.media_stores["image"].output_path
+    assert "20240101000000" in output_path
+    with open(output_path) as tsv:
+        identifiers = {line.split("\t")[0] for line in tsv}
+    assert identifiers == {
+        f"{params['foo']}-{page}" for params in fixed_query_params for page in (1, 2, 3)
+    }
+    assert not _checkpoint_path(tmp_path).exists()
+
+
 def test_ingest_records_raises_IngestionError():
     with patch.object(ingester, "get_batch") as get_batch_mock:
         get_batch_mock.side_effect = [
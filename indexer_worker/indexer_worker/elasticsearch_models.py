@@ -116,6 +116,8 @@ class Media(SyncableDocType):
             "authority_boost": authority_boost,
             "max_boost": max(popularity or 1, authority_boost or 1),
             "min_boost": min(popularity or 1, authority_boost or 1),
+            # Sort fields
+            "popularity": popularity,
             # Nested fields
             "tags": Media.parse_detailed_tags(row[schema["tags"]]),
             # Extra fields, not indexed
@@ -0,0 +1,161 @@
+"""
+Benchmark of collection and sorted queries against sorted and unsorted indices.
+
+Builds one index per entry of ``INDEX_SORTS``, plus an unsorted index, from the same
+synthetic documents, using the settings and mappings created by the ingestion
+server. Then runs the queries made by the API for collection views and for results
+sorted by indexing date, and a popularity-ranked search, against each index, and
+prints the p50 and p95 latency reported by Elasticsearch.
+
+Each query is run counting hits up to the default of Elasticsearch, and up to the
+maximum result count of the API, which the API uses for queries sorted in the same
+order as their index. Only with the lower count and a matching index sort can
+Elasticsearch terminate the search early, which the last column reports.
+
+Run it from the ``ingestion_server`` directory against a local Elasticsearch, e.g.
+the one started by ``just up``::
+
+    ELASTICSEARCH_URL=localhost pipenv run python benchmarks/index_sort.py
+
+The benchmark indices are deleted afterwards.
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from elasticsearch import helpers
+
+from ingestion_server.es_helpers import elasticsearch_connect
+from ingestion_server.es_mapping import INDEX_SORTS, index_settings
+
+
+MEDIA_TYPE = "image"
+DOCUMENT_COUNT = 500_000
+REPEAT = 200
+PAGE_SIZE = 20
+# The number of hits counted by default by Elasticsearch, and the maximum result
+# count of anonymous requests, up to which the API counts the hits of queries
+# sorted in the same order as their index
+TRACK_TOTAL_HITS = [10_000, 240]
+
+SOURCES = [f"source_{idx}" for idx in range(20)]
+TAGS = ["cat", "dog", "tree", "sky", "car", "bird", "flower", "river", "city", "sea"]
+START = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def generate_documents(index: str):
+    rng = random.Random(0)
+    for idx in range(DOCUMENT_COUNT):
+        # Popularity is heavily skewed, and missing for most documents
+        popularity = rng.paretovariate(2) if rng.random() < 0.3 else None
+        yield {
+            "_index": index,
+            "_id": idx,
+            "id": idx,
+            "created_on": START + timedelta(minutes=rng.randrange(5_000_000)),
+            "identifier": f"{idx:032x}",
+            "license": "by",
+            "provider": "provider",
+            # Sources are skewed too, so that some collections are large
+            "source": SOURCES[min(int(rng.expovariate(0.3)), len(SOURCES) - 1)],
+            "title": " ".join(rng.sample(TAGS, 3)),
+            "tags": [{"name": tag} for tag in rng.sample(TAGS, 4)],
+            "standardized_popularity": popularity,
+            "popularity": popularity,
+        }
+
+
+def build_index(es, index: str, index_sort: str | None):
+    es.indices.delete(index=index, ignore_unavailable=True)
+    es.indices.create(index=index, body=index_settings(MEDIA_TYPE, index_sort))
+    helpers.bulk(es, generate_documents(index), chunk_size=5_000)
+    es.indices.refresh(index=index)
+    # Searches are compared over the same number of segments
+    es.indices.forcemerge(index=index, max_num_segments=5)
+
+
+def queries():
+    collection = {
+        "query": {"bool": {"filter": [{"term": {"source": SOURCES[0]}}]}},
+        "sort": [{"created_on": {"order": "desc"}}],
+    }
+    sorted_search = {
+        "query": {"bool": {"must": [{"match": {"title": "cat"}}]}},
+        "sort": [{"created_on": {"order": "desc"}}],
+    }
+    ranked_search = {
+        "query": {
+            "bool": {
+                "must": [{"match": {"title": "cat"}}],
+                "should": [
+                    {
+                        "rank_feature": {
+                            "field": "standardized_popularity",
+                            "boost": 10_000,
+                        }
+                    }
+                ],
+            }
+        },
+    }
+    return {
+        "collection": collection,
+        "sorted search": sorted_search,
+        "ranked search": ranked_search,
+    }
+
+
+def measure(
+    es, index: str, body: dict, track_total_hits: int
+) -> tuple[list[int], bool]:
+    """
+    Run the query repeatedly, and return the time each run took, and whether the
+    search terminated before visiting every matching document.
+    """
+    timings = []
+    for _ in range(REPEAT):
+        response = es.search(
+            index=index,
+            body=body,
+            size=PAGE_SIZE,
+            track_total_hits=track_total_hits,
+            request_cache=False,
+        )
+        timings.append(response["took"])
+    # Elasticsearch flags the searches which it stopped once enough hits were found
+    is_early = response.body.get("terminated_early", False)
+    return timings, is_early
+
+
+def main():
+    es = elasticsearch_connect()
+    indices = {
+        f"benchmark-{index_sort or 'unsorted'}": index_sort
+        for index_sort in [None, *INDEX_SORTS]
+    }
+    try:
+        for index, index_sort in indices.items():
+            print(f"Building {index} with {DOCUMENT_COUNT:,} documents...")
+            build_index(es, index, index_sort)
+
+        print(
+            f"\n{'query':<16}{'index':<24}{'hits':>8}"
+            f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'early':>8}"
+        )
+        for name, body in queries().items():
+            for index in indices:
+                for track_total_hits in TRACK_TOTAL_HITS:
+                    timings, is_early = measure(es, index, body, track_total_hits)
+                    p50 = statistics.median(timings)
+                    p95 = statistics.quantiles(timings, n=20)[-1]
+                    print(
+                        f"{name:<16}{index:<24}{track_total_hits:>8}"
+                        f"{p50:>10.1f}{p95:>10.1f}{'yes' if is_early else 'no':>8}"
+                    )
+    finally:
+        es.indices.delete(index=list(indices), ignore_unavailable=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,15 @@
 
 import logging
 import os
-import time
 import uuid
 from collections import defaultdict
-from multiprocessing import Process, Value
+from concurrent.futures import wait
 from pathlib import Path
 from urllib.parse import urlparse
 
 import falcon
 import sentry_sdk
+from decouple import config
 from falcon.media.validators import jsonschema
 from sentry_sdk.integrations.falcon import FalconIntegration
 
@@ -22,9 +22,15 @@ from ingestion_server.db_helpers import (
     database_connect,
 )
 from ingestion_server.es_helpers import elasticsearch_connect, get_stat
-from ingestion_server.indexer import TableIndexer
+from ingestion_server.es_mapping import INDEX_SORTS
 from ingestion_server.state import clear_state, worker_finished
-from ingestion_server.tasks import TaskTracker, TaskTypes, perform_task
+from ingestion_server.task_store import TaskStore, get_task_store
+from ingestion_server.tasks import (
+    TaskPool,
+    TaskTypes,
+    get_task_status,
+    list_task_statuses,
+)
 
 
 MODEL = "model"
@@ -32,6 +38,13 @@ ACTION = "action"
 CALLBACK_URL = "callback_url"
 SINCE_DATE = "since_date"
 
+# The maximum number of tasks to run at once; further tasks wait for a free worker
+TASK_WORKERS = config("TASK_WORKERS", default=8, cast=int)
+# Seconds to wait for a newly scheduled task to finish, to detect immediate failure
+TASK_STARTUP_TIMEOUT = 0.1
+# The order in which to sort new indices, if the task does not specify one
+DEFAULT_INDEX_SORT = config("ES_INDEX_SORT", default=None)
+
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN"),
     integrations=[
@@ -103,11 +116,12 @@ class StatResource:
 
 
 class BaseTaskResource:
-    """Base class for all resource that need access to a task tracker."""
+    """Base class for all resource that need access to the task store and pool."""
 
-    def __init__(self, tracker: TaskTracker, *args, **kwargs):
+    def __init__(self, store: TaskStore, pool: TaskPool, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.tracker = tracker
+        self.store = store
+        self.pool = pool
 
 
 class TaskResource(BaseTaskResource):
@@ -133,6 +147,7 @@ class TaskResource(BaseTaskResource):
                 "force_delete": {"type": "boolean"},
                 "origin_index_suffix": {"type": "string"},
                 "destination_index_suffix": {"type": "string"},
+                "index_sort": {"type": "string", "enum": list(INDEX_SORTS)},
             },
             "required": ["model", "action"],
             "allOf": [
@@ -193,71 +208,45 @@ class TaskResource(BaseTaskResource):
         destination_index_suffix = body.get("destination_index_suffix")
         alias = body.get("alias")
         force_delete = body.get("force_delete", False)
+        index_sort = body.get("index_sort", DEFAULT_INDEX_SORT)
 
-        # Shared memory
-        progress = Value("d", 0.0)
-        finish_time = Value("d", 0.0)
-        active_workers = Value("i", int(False))
-        is_bad_request = Value("i", 0)
-
-        task_sentry_hub = sentry_sdk.Hub(sentry_sdk.Hub.current)
-        task = Process(
-            target=perform_task,
-            kwargs={
-                "task_id": task_id,
-                "model": model,
-                "action": action,
-                "callback_url": callback_url,
-                "progress": progress,
-                "finish_time": finish_time,
-                "active_workers": active_workers,
-                "is_bad_request": is_bad_request,
-                # Task-specific keyword arguments
-                "since_date": since_date,
-                "index_suffix": index_suffix,
-                "origin_index_suffix": origin_index_suffix,
-                "destination_index_suffix": destination_index_suffix,
-                "alias": alias,
-                "force_delete": force_delete,
-                "sentry_hub": task_sentry_hub,
-            },
-        )
-        task.start()
-
-        self.tracker.add_task(
+        future = self.pool.submit(
             task_id,
-            task=task,
             model=model,
             action=action,
             callback_url=callback_url,
-            progress=progress,
-            finish_time=finish_time,
-            active_workers=active_workers,
-            is_bad_request=is_bad_request,
+            # Task-specific keyword arguments
+            since_date=since_date,
+            index_suffix=index_suffix,
+            origin_index_suffix=origin_index_suffix,
+            destination_index_suffix=destination_index_suffix,
+            alias=alias,
+            force_delete=force_delete,
+            index_sort=index_sort,
         )
 
         base_url = self._get_base_url(req)
         status_url = f"{base_url}/task/{task_id}"
 
-        # Give the task a moment to start so we can detect immediate failure.
-        # TODO: Use IPC to detect if the job launched successfully instead
-        # of giving it 100ms to crash. This is prone to race conditions.
-        time.sleep(0.1)
-        if task.is_alive():
+        # Give the task a moment to run, so that we can report immediate failure.
+        # Waiting on the future returns as soon as the task finishes.
+        wait([future], timeout=TASK_STARTUP_TIMEOUT)
+        task_info = self.store.get_task(task_id)
+        if not future.done():
             res.status = falcon.HTTP_202
             res.media = {
                 "message": "Successfully scheduled task",
                 "task_id": task_id,
                 "status_check": status_url,
             }
-        elif progress.value == 100:
+        elif task_info["progress"] == 100:
             res.status = falcon.HTTP_202
             res.media = {
                 "message": "Successfully completed task",
                 "task_id": task_id,
                 "status_check": status_url,
             }
-        elif is_bad_request.value == 1:
+        elif task_info["is_bad_request"] == 1:
             res.status = falcon.HTTP_400
             res.media = {
                 "message": (
@@ -282,7 +271,7 @@ class TaskResource(BaseTaskResource):
         :param res: the appropriate response
         """
 
-        res.media = self.tracker.list_task_statuses()
+        res.media = list_task_statuses(self.store)
 
 
 class TaskStatus(BaseTaskResource):
@@ -296,30 +285,32 @@ class TaskStatus(BaseTaskResource):
         """
 
         try:
-            result = self.tracker.get_task_status(task_id)
-            res.media = result
+            res.media = get_task_status(self.store, task_id)
         except KeyError:
             res.status = falcon.HTTP_404
             res.media = {"message": f"No task found with id {task_id}."}
 
 
 class WorkerFinishedResource(BaseTaskResource):
-    def on_post(self, req, _):
+    def on_post(self, req, res):
         """
         Handle an incoming POST request and record messages sent from indexer workers.
 
         :param req: the incoming request
-        :param _: the appropriate response
+        :param res: the appropriate response
         """
 
         task_data = worker_finished(str(req.remote_addr), req.media["error"])
+        if task_data is None:
+            res.status = falcon.HTTP_404
+            res.media = {"message": "No indexing job is being tracked."}
+            return
         task_id = task_data.task_id
         target_index = task_data.target_index
-        task_info = self.tracker.tasks[task_id]
-        active_workers = task_info["active_workers"]
+        task_info = self.store.get_task(task_id)
 
         # Update global task progress based on worker results
-        task_info["progress"].value = task_data.percent_successful
+        self.store.update_task(task_id, progress=task_data.percent_successful)
 
         if task_data.percent_successful == 100:
             logging.info(f"All indexer workers succeeded! New index: {target_index}")
@@ -331,28 +322,14 @@ class WorkerFinishedResource(BaseTaskResource):
                 f"_Next: re-apply indices & constraints_"
             )
 
-            elasticsearch = elasticsearch_connect()
-            indexer = TableIndexer(
-                elasticsearch,
-                task_id,
-                task_info["callback_url"],
-                task_info["progress"],
-                task_info["active_workers"],
-            )
-            task = Process(
-                target=indexer.refresh,
-                kwargs={
-                    "index_name": target_index,
-                    "change_settings": True,
-                },
+            self.pool.submit_refresh(
+                task_id, task_info["callback_url"], index_name=target_index
             )
-            task.start()
-            indexer.ping_callback()
         elif task_data.percent_completed == 100:
             # All workers finished, but not all were successful. Mark
             # workers as complete and do not attempt to go live with the new
             # indices.
-            active_workers.value = int(False)
+            self.store.update_task(task_id, active_workers=int(False))
 
 
 class StateResource:
@@ -368,13 +345,17 @@ def create_api():
 
     _api = falcon.App()
 
-    task_tracker = TaskTracker()
+    # Tasks which were pending or running before a restart can no longer finish
+    task_store = get_task_store()
+    if interrupted := task_store.interrupt_unfinished_tasks():
+        logging.warning(f"Marked {interrupted} unfinished tasks as interrupted.")
+    task_pool = TaskPool(task_store, max_workers=TASK_WORKERS)
 
     _api.add_route("/", HealthResource())
     _api.add_route("/stat/{name}", StatResource())
-    _api.add_route("/task", TaskResource(task_tracker))
-    _api.add_route("/task/{task_id}", TaskStatus(task_tracker))
-    _api.add_route("/worker_finished", WorkerFinishedResource(task_tracker))
+    _api.add_route("/task", TaskResource(task_store, task_pool))
+    _api.add_route("/task/{task_id}", TaskStatus(task_store, task_pool))
+    _api.add_route("/worker_finished", WorkerFinishedResource(task_store, task_pool))
     _api.add_route("/state", StateResource())
     _api.add_static_route("/static", (Path(".") / "static").absolute())
 
@@ -1,11 +1,23 @@
 from ingestion_server.constants.media_types import AUDIO_TYPE, IMAGE_TYPE, MediaType
 
 
-def index_settings(media_type: MediaType):
+# The fields by which an index can be sorted, and the order of each. Sorting the
+# segments of an index in the order in which queries sort their results allows
+# Elasticsearch to stop collecting hits early. The ``standardized_popularity`` rank
+# feature has no doc values, so the index is sorted by its ``popularity`` copy.
+INDEX_SORTS = {
+    "popularity": {"field": "popularity", "order": "desc"},
+    "created_on": {"field": "created_on", "order": "desc"},
+}
+
+
+def index_settings(media_type: MediaType, index_sort: str | None = None):
     """
     Return the Elasticsearch mapping for a given table in the database.
 
     :param media_type: The name of the table in the upstream database.
+    :param index_sort: The key in ``INDEX_SORTS`` of the order in which to sort the
+    documents of the index, if any.
     :return: the settings for the ES mapping
     """
 
@@ -102,6 +114,8 @@ def index_settings(media_type: MediaType):
             },
             "max_boost": {"type": "rank_feature"},
             "min_boost": {"type": "rank_feature"},
+            # Sort fields, which are only used through their doc values
+            "popularity": {"type": "float", "index": False},
             # Nested fields
             "tags": {
                 "properties": {
@@ -130,6 +144,10 @@ def index_settings(media_type: MediaType):
             "length": {"type": "keyword"},
         },
     }
+    if index_sort is not None:
+        sort = INDEX_SORTS[index_sort]
+        settings["index"]["sort.field"] = sort["field"]
+        settings["index"]["sort.order"] = sort["order"]
     media_mappings = common_mappings.copy()
     media_mappings["properties"].update(media_properties[media_type])
     result = {"settings": settings.copy(), "mappings": media_mappings}
@@ -243,7 +243,12 @@ class TableIndexer:
     # ==========
 
     def reindex(
-        self, model_name: str, table_name: str = None, index_suffix: str = None, **_
+        self,
+        model_name: str,
+        table_name: str = None,
+        index_suffix: str = None,
+        index_sort: str | None = None,
+        **_,
     ):
         """
         Copy contents of the database to a new Elasticsearch index.
@@ -251,6 +256,7 @@ class TableIndexer:
         :param model_name: the name of the media type
         :param table_name: the name of the DB table, if different from model name
         :param index_suffix: the unique suffix to add to the index name
+        :param index_sort: the order in which to sort the index, from ``INDEX_SORTS``
         """
 
         if not index_suffix:
@@ -261,11 +267,11 @@ class TableIndexer:
 
         log.info(
             f"Creating index {destination_index} for model {model_name} "
-            f"from table {table_name}."
+            f"from table {table_name}, sorted by {index_sort}."
         )
         self.es.indices.create(
             index=destination_index,
-            body=index_settings(model_name),
+            body=index_settings(model_name, index_sort),
         )
 
         log.info("Running distributed index using indexer workers.")
@@ -432,6 +438,7 @@ class TableIndexer:
         model_name: str,
         origin_index_suffix: str | None = None,
         destination_index_suffix: str | None = None,
+        index_sort: str | None = None,
         **_,
     ):
         """
@@ -448,6 +455,8 @@ class TableIndexer:
         origin index and we wish to update the filtered index immediately. If not
         supplied, a UUID based suffix will be generated. This does not affect the
         final alias used.
+        :param index_sort: The order in which to sort the filtered index, from
+        ``INDEX_SORTS``. This is independent of the sort of the origin index.
         """
         # Allow relying on the model-name-based alias by
         # not supplying `origin_index_suffix`
@@ -463,7 +472,7 @@ class TableIndexer:
 
         self.es.indices.create(
             index=destination_index,
-            body=index_settings(model_name),
+            body=index_settings(model_name, index_sort),
         )
 
         sensitive_terms = get_sensitive_terms()
@@ -6,22 +6,17 @@ Indexing is distributed across multiple independent hosts. We don't want to
 workers have finished their tasks. To that end, we need to track the state of
 each worker, and be notified when the job has finished.
 
-State is persisted to the disk using shelve. Concurrent writes aren't allowed,
-so all operations need to acquire a lock.
+State is persisted in the task store, in which each operation is a transaction,
+so concurrent updates from different processes cannot interfere with each other.
 """
 
 import datetime
 import enum
 import logging as log
-import shelve
+import sqlite3
 from typing import NamedTuple
 
-from decouple import config
-from filelock import FileLock
-
-
-lock_path = config("LOCK_PATH", default="lock")
-shelf_path = config("SHELF_PATH", default="db")
+from ingestion_server.task_store import get_task_store
 
 
 class WorkerStatus(enum.Enum):
@@ -37,19 +32,26 @@ class TaskData(NamedTuple):
     percent_completed: float
 
 
-def is_indexing_in_progress(db):
+def is_indexing_in_progress(connection: sqlite3.Connection) -> bool:
     """
     Determine whether any indexing is in progress, by checking to see if there are any
     registered workers with the RUNNING status.
 
-    :param db: the Shelf object representing worker state on disk.
+    :param connection: a connection to the task store.
     :return: True if there are any active indexer workers.
     """
-    if "worker_statuses" in db:
-        for worker in db["worker_statuses"]:
-            if db["worker_statuses"][worker] == WorkerStatus.RUNNING:
-                return True
-    return False
+    return _count_workers(connection, WorkerStatus.RUNNING) > 0
+
+
+def _count_workers(
+    connection: sqlite3.Connection, status: WorkerStatus | None = None
+) -> int:
+    query = "SELECT COUNT(*) FROM indexer_worker"
+    params = ()
+    if status is not None:
+        query += " WHERE status = ?"
+        params = (status.name,)
+    return connection.execute(query, params).fetchone()[0]
 
 
 def register_indexing_job(worker_ips, target_index, task_id):
@@ -63,19 +65,29 @@ def register_indexing_job(worker_ips, target_index, task_id):
     :param task_id: The id of the data_refresh task scheduling these workers.
     :return: Return True if scheduling succeeds
     """
-    with FileLock(lock_path), shelve.open(shelf_path, writeback=True) as db:
-        if is_indexing_in_progress(db):
+    with get_task_store().transaction() as connection:
+        if is_indexing_in_progress(connection):
             log.error("Failed to schedule indexing job; another one is running.")
             return False
 
-        # Register the workers.
-        worker_statuses = {}
-        for worker_url in worker_ips:
-            worker_statuses[worker_url] = WorkerStatus.RUNNING
-        db["worker_statuses"] = worker_statuses
-        db["start_time"] = datetime.datetime.now()
-        db["target_index"] = target_index
-        db["task_id"] = task_id
+        # Register the workers, replacing those of the previous job.
+        start_time = datetime.datetime.now().timestamp()
+        connection.execute("DELETE FROM indexer_worker")
+        connection.executemany(
+            "INSERT INTO indexer_worker "
+            "(worker_ip, task_id, target_index, status, start_time) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    worker_url,
+                    task_id,
+                    target_index,
+                    WorkerStatus.RUNNING.name,
+                    start_time,
+                )
+                for worker_url in worker_ips
+            ],
+        )
         return True
 
 
@@ -87,50 +99,59 @@ def has_active_workers_for_task_id(task_id):
     :param task_id: The id of the data_refresh task to check.
     :return: Return True if there are any active workers for this task.
     """
-    with FileLock(lock_path), shelve.open(shelf_path) as db:
-        if "task_id" in db and db["task_id"] == task_id:
-            return is_indexing_in_progress(db)
-
-        # There can only be one indexing job happening at a time, so if the currently
-        # registered `task_id` does not match the one we're looking for, we can
-        # be sure there are no active workers for this task.
-        return False
+    with get_task_store().connect() as connection:
+        return (
+            connection.execute(
+                "SELECT 1 FROM indexer_worker WHERE task_id = ? AND status = ?",
+                (task_id, WorkerStatus.RUNNING.name),
+            ).fetchone()
+            is not None
+        )
 
 
-def worker_finished(worker_ip, error):
+def worker_finished(worker_ip, error) -> TaskData | None:
     """
     Receive the notifications indicating an indexing worker has finished its task.
 
     :param worker_ip: The private IP of the worker.
     :param error: Whether this worker had an error during processing.
     :return: TaskData namedtuple containing the target index, task_id, and the
-    percent of workers that have completed and that were successful.
+    percent of workers that have completed and that were successful, or None if
+    there is no indexing job.
     """
-    with FileLock(lock_path), shelve.open(shelf_path, writeback=True) as db:
-        try:
-            _ = db["worker_statuses"][worker_ip]
-            db["worker_statuses"][worker_ip] = (
-                WorkerStatus.FINISHED if not error else WorkerStatus.ERROR
-            )
+    with get_task_store().transaction() as connection:
+        updated = connection.execute(
+            "UPDATE indexer_worker SET status = ? WHERE worker_ip = ?",
+            (
+                (WorkerStatus.FINISHED if not error else WorkerStatus.ERROR).name,
+                worker_ip,
+            ),
+        ).rowcount
+        if updated:
             log.info(f"Received worker_finished signal from {worker_ip}")
-        except KeyError:
+        else:
             log.error(
                 "An indexer worker notified us it finished its task, but "
                 "we are not tracking it."
             )
-        total_workers = len(db["worker_statuses"])
-        completed_workers = 0
-        running_workers = 0
-        for worker_key in db["worker_statuses"]:
-            status = db["worker_statuses"][worker_key]
-            if status == WorkerStatus.RUNNING:
-                log.info(f"{worker_key} is still indexing")
-                running_workers += 1
-            elif status == WorkerStatus.FINISHED:
-                completed_workers += 1
+
+        job = connection.execute(
+            "SELECT task_id, target_index FROM indexer_worker LIMIT 1"
+        ).fetchone()
+        if job is None:
+            return None
+        for (worker_key,) in connection.execute(
+            "SELECT worker_ip FROM indexer_worker WHERE status = ?",
+            (WorkerStatus.RUNNING.name,),
+        ):
+            log.info(f"{worker_key} is still indexing")
+
+        total_workers = _count_workers(connection)
+        completed_workers = _count_workers(connection, WorkerStatus.FINISHED)
+        running_workers = _count_workers(connection, WorkerStatus.RUNNING)
         return TaskData(
-            target_index=db["target_index"],
-            task_id=db["task_id"],
+            target_index=job["target_index"],
+            task_id=job["task_id"],
             percent_successful=(completed_workers / total_workers) * 100,
             percent_completed=((total_workers - running_workers) / total_workers) * 100,
         )
@@ -139,8 +160,8 @@ def worker_finished(worker_ip, error):
 def clear_state():
     """Forget about all running index jobs. Use with care."""
 
-    with FileLock(lock_path), shelve.open(shelf_path, writeback=True) as db:
-        for key in db:
-            log.info("Deleting " + str(db[key]))
-            del db[key]
+    with get_task_store().transaction() as connection:
+        for worker in connection.execute("SELECT * FROM indexer_worker"):
+            log.info("Deleting " + str(dict(worker)))
+        connection.execute("DELETE FROM indexer_worker")
     log.info("Cleared indexing state.")
@@ -0,0 +1,218 @@
+"""
+Transactional storage for tasks and the state of indexer workers.
+
+Tasks are run by a pool of worker processes, so their progress is shared through a
+SQLite database on disk rather than through shared memory. This also allows the
+tasks scheduled by a previous run of the server to be reported after a restart.
+
+Every operation opens its own connection, which makes the store safe to use from
+any process or thread. The database is in WAL mode, so that status queries are not
+blocked by progress updates, and each update is a single short transaction instead
+of holding a global lock.
+"""
+
+import enum
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from functools import cache
+from typing import Any
+
+from decouple import config
+
+
+CREATE_TABLES_QUERY = """
+CREATE TABLE IF NOT EXISTS task (
+    task_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    action TEXT NOT NULL,
+    callback_url TEXT,
+    status TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    finish_time REAL NOT NULL DEFAULT 0,
+    progress REAL NOT NULL DEFAULT 0,
+    active_workers INTEGER NOT NULL DEFAULT 0,
+    is_bad_request INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS indexer_worker (
+    worker_ip TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    target_index TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_time REAL NOT NULL
+);
+"""
+
+# The columns of a task which are updated while it runs
+TASK_VALUE_COLUMNS = {"progress", "finish_time", "active_workers", "is_bad_request"}
+
+
+class TaskState(enum.Enum):
+    PENDING = "pending"
+    """waiting for a free process in the worker pool"""
+
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+    INTERRUPTED = "interrupted"
+    """pending or running when the server was restarted"""
+
+
+UNFINISHED_STATES = (TaskState.PENDING.value, TaskState.RUNNING.value)
+
+
+class TaskValue:
+    """
+    A value of a task in the store, with the interface of ``multiprocessing.Value``.
+
+    This allows the task functions to report their progress with
+    ``progress.value = ...`` whether or not they are run through the task store.
+    """
+
+    def __init__(self, store: "TaskStore", task_id: str, column: str):
+        if column not in TASK_VALUE_COLUMNS:
+            raise ValueError(f"Task column {column} cannot be updated.")
+        self.store = store
+        self.task_id = task_id
+        self.column = column
+
+    @property
+    def value(self):
+        return self.store.get_task(self.task_id)[self.column]
+
+    @value.setter
+    def value(self, value):
+        self.store.update_task(self.task_id, **{self.column: value})
+
+
+class TaskStore:
+    """
+    Store tasks and indexer worker state in a SQLite database.
+
+    :param path: the path to the database file, which is created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(CREATE_TABLES_QUERY)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Get a connection in autocommit mode, which is closed on exit."""
+
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        with closing(connection):
+            yield connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Get a connection in a write transaction, which is committed on exit.
+
+        The transaction is begun immediately, so that reads made within it cannot
+        be invalidated by a concurrent write before it commits.
+        """
+
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    # Tasks
+    # =====
+
+    def add_task(self, task_id: str, model: str, action: str, callback_url: str | None):
+        """Record a new task, which is pending until a worker process starts it."""
+
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT INTO task "
+                "(task_id, model, action, callback_url, status, start_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    task_id,
+                    model,
+                    action,
+                    callback_url,
+                    TaskState.PENDING.value,
+                    datetime.now(timezone.utc).timestamp(),
+                ),
+            )
+
+    def update_task(self, task_id: str, **values: Any):
+        """
+        Update the given columns of a task.
+
+        :param task_id: the ID of the task to update
+        :param values: the new value of each column to update
+        """
+
+        if not values.keys() <= TASK_VALUE_COLUMNS | {"status"}:
+            raise ValueError(f"Task columns {list(values)} cannot be updated.")
+        if "status" in values:
+            values["status"] = TaskState(values["status"]).value
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self.connect() as connection:
+            connection.execute(
+                f"UPDATE task SET {assignments} WHERE task_id = ?",
+                (*values.values(), task_id),
+            )
+
+    def get_value(self, task_id: str, column: str) -> TaskValue:
+        """Get an updatable reference to a value of a task."""
+
+        return TaskValue(self, task_id, column)
+
+    def get_task(self, task_id: str) -> dict:
+        """
+        Get the stored information about a task.
+
+        :raises KeyError: if there is no task with the given ID
+        """
+
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT * FROM task WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return dict(row)
+
+    def list_tasks(self) -> list[dict]:
+        """Get the stored information about all tasks, in order of scheduling."""
+
+        with self.connect() as connection:
+            rows = connection.execute("SELECT * FROM task ORDER BY start_time")
+            return [dict(row) for row in rows]
+
+    def interrupt_unfinished_tasks(self) -> int:
+        """
+        Mark the tasks which were pending or running as interrupted.
+
+        This must be called when the server starts, before any task is scheduled,
+        because the worker processes of any previous run of the server are gone.
+
+        :return: the number of interrupted tasks
+        """
+
+        with self.connect() as connection:
+            return connection.execute(
+                "UPDATE task SET status = ? WHERE status IN (?, ?)",
+                (TaskState.INTERRUPTED.value, *UNFINISHED_STATES),
+            ).rowcount
+
+
+@cache
+def get_task_store() -> TaskStore:
+    """Get the task store of this server, which is shared by all its processes."""
+
+    return TaskStore(config("TASK_DB_PATH", default="tasks.sqlite3"))
@@ -1,10 +1,10 @@
-"""Simple in-memory tracking of executed tasks."""
+"""Running tasks in a pool of worker processes, and reporting their status."""
 
 import datetime
 import logging
+from concurrent.futures import Future, ProcessPoolExecutor
 from enum import Enum, auto
 from functools import wraps
-from multiprocessing import Value
 
 import sentry_sdk
 
@@ -14,6 +14,13 @@ from ingestion_server.es_helpers import elasticsearch_connect
 from ingestion_server.indexer import TableIndexer
 from ingestion_server.ingest import promote_api_table, refresh_api_table
 from ingestion_server.state import has_active_workers_for_task_id
+from ingestion_server.task_store import (
+    UNFINISHED_STATES,
+    TaskState,
+    TaskStore,
+    TaskValue,
+    get_task_store,
+)
 
 
 class TaskTypes(Enum):
@@ -69,106 +76,143 @@ class TaskTypes(Enum):
         return self.name
 
 
-class TaskTracker:
-    def __init__(self):
-        self.tasks = {}
+def serialize_task_info(task_info: dict) -> dict:
+    """
+    Generate a response dictionary containing all relevant information about a task.
 
-    def _prune_old_tasks(self):
-        # TODO: Populate, document or delete function stub
-        pass
+    :param task_info: the stored information about the task
+    :return: the details of the task to show to the user
+    """
 
-    def add_task(self, task_id: str, **kwargs):
+    def _time_fmt(timestamp: int) -> str | None:
         """
-        Store information about a new task in memory.
+        Format the timestamp into a human-readable date and time notation.
 
-        :param task: the task being performed
-        :param task_id: the UUID of the task
+        :param timestamp: the timestamp to format
+        :return: the human-readable form of the timestamp
         """
 
-        self._prune_old_tasks()
+        if timestamp == 0:
+            return None
+        return str(datetime.datetime.utcfromtimestamp(timestamp))
 
-        self.tasks[task_id] = {
-            "start_time": datetime.datetime.utcnow().timestamp(),
-        } | kwargs
+    task_id = task_info["task_id"]
+    active = task_info["status"] in UNFINISHED_STATES or has_active_workers_for_task_id(
+        task_id
+    )
+    start_time = task_info["start_time"]
+    finish_time = task_info["finish_time"]
+    progress = task_info["progress"]
+
+    return {
+        "task_id": task_id,
+        "active": active,
+        "status": task_info["status"],
+        "model": task_info["model"],
+        "action": task_info["action"],
+        "progress": progress,
+        "start_timestamp": start_time,
+        "start_time": _time_fmt(start_time),
+        "finish_timestamp": finish_time,
+        "finish_time": _time_fmt(finish_time),
+        "active_workers": bool(task_info["active_workers"]),
+        # The task is considered to have errored if the task is no longer running, and
+        # it does not have any associated active workers, but progress did not
+        # reach 100%.
+        "error": progress < 100 and not active,
+        "is_bad_request": bool(task_info["is_bad_request"]),
+    }
+
+
+def list_task_statuses(store: TaskStore) -> list:
+    """
+    Get the statuses of all tasks.
 
-    @staticmethod
-    def serialize_task_info(task_id: str, task_info: dict) -> dict:
-        """
-        Generate a response dictionary containing all relevant information about a task.
+    :param store: the store in which the tasks are recorded
+    :return: the statuses of all tasks
+    """
 
-        :param task_info: the stored information about the task
-        :return: the details of the task to show to the user
-        """
+    results = [serialize_task_info(task_info) for task_info in store.list_tasks()]
+    results.sort(key=lambda task: task["finish_timestamp"])
+    return results
 
-        def _time_fmt(timestamp: int) -> str | None:
-            """
-            Format the timestamp into a human-readable date and time notation.
-
-            :param timestamp: the timestamp to format
-            :return: the human-readable form of the timestamp
-            """
-
-            if timestamp == 0:
-                return None
-            return str(datetime.datetime.utcfromtimestamp(timestamp))
-
-        active = task_info["task"].is_alive() or has_active_workers_for_task_id(task_id)
-        start_time = task_info["start_time"]
-        finish_time = task_info["finish_time"].value
-        progress = task_info["progress"].value
-        active_workers = task_info["active_workers"].value
-        is_bad_request = task_info["is_bad_request"].value
-
-        return {
-            "active": active,
-            "model": task_info["model"],
-            "action": str(task_info["action"]),
-            "progress": progress,
-            "start_timestamp": start_time,
-            "start_time": _time_fmt(start_time),
-            "finish_timestamp": finish_time,
-            "finish_time": _time_fmt(finish_time),
-            "active_workers": bool(active_workers),
-            # The task is considered to have errored if the task is no longer alive, or
-            # else it does not have any associated active workers, but progress did not
-            # reach 100%.
-            "error": progress < 100 and not active,
-            "is_bad_request": bool(is_bad_request),
-        }
-
-    def list_task_statuses(self) -> list:
-        """
-        Get the statuses of all tasks.
 
-        :return: the statuses of all tasks
-        """
+def get_task_status(store: TaskStore, task_id: str) -> dict:
+    """
+    Get the status of a single task with the given task ID.
 
-        results = [self.get_task_status(task_id) for task_id in self.tasks.keys()]
-        results.sort(key=lambda task: task["finish_timestamp"])
-        return results
+    :param store: the store in which the tasks are recorded
+    :param task_id: the ID of the task to get the status for
+    :return: the status of the task
+    :raises KeyError: if there is no task with the given ID
+    """
 
-    def get_task_status(self, task_id) -> dict:
+    return serialize_task_info(store.get_task(task_id))
+
+
+class TaskPool:
+    """
+    Run tasks in a long-lived pool of worker processes.
+
+    Each task is recorded in the task store when it is submitted, and remains
+    pending until a process of the pool is free to run it. The processes report
+    the progress and status of their tasks through the store.
+
+    :param store: the store in which to record the tasks
+    :param max_workers: the maximum number of tasks to run at once
+    """
+
+    def __init__(self, store: TaskStore, max_workers: int):
+        self.store = store
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit(
+        self,
+        task_id: str,
+        model: MediaType,
+        action: TaskTypes,
+        callback_url: str | None,
+        **kwargs,
+    ) -> Future:
         """
-        Get the status of a single task with the given task ID.
+        Schedule the task to run in the pool.
+
+        Any additional keyword arguments will be forwarded to ``perform_task``.
 
-        :param task_id: the ID of the task to get the status for
-        :return: the status of the task
+        :return: the future of the task, which completes when the task has finished
         """
 
-        self._prune_old_tasks()
+        self.store.add_task(task_id, model, str(action), callback_url)
+        return self._executor.submit(
+            run_task,
+            task_id=task_id,
+            model=model,
+            action=action,
+            callback_url=callback_url,
+            **kwargs,
+        )
 
-        task_info = self.tasks[task_id]
-        return {"task_id": task_id} | self.serialize_task_info(task_id, task_info)
+    def submit_refresh(
+        self, task_id: str, callback_url: str | None, index_name: str
+    ) -> Future:
+        """Schedule the refresh of an index built by the task's indexer workers."""
+
+        return self._executor.submit(
+            refresh_index,
+            task_id=task_id,
+            callback_url=callback_url,
+            index_name=index_name,
+        )
 
 
 def _with_sentry(fn):
     """
     Wrap the decorated function for Sentry multiprocessing.
 
-    Convenience function to wrap ``perform_task`` in such a way
-    to extract the ``sentry_hub`` kwarg passed by ``api.py``, send
-    exceptions to Sentry, and fully flush the client's Sentry
-    queue before the worker exits.
+    Convenience function to wrap the functions run in the worker pool in
+    such a way to run them in their own Sentry hub, send exceptions to
+    Sentry, and fully flush the client's Sentry queue before the function
+    returns.
 
     We cannot use the convenient ``ThreadingIntegration`` because it
     does not support ``multiprocessing``, only the legacy ``threading``
@@ -177,7 +221,7 @@ def _with_sentry(fn):
 
     @wraps(fn)
     def fn_with_sentry(*args, **kwargs):
-        hub = kwargs.pop("sentry_hub")
+        hub = sentry_sdk.Hub(sentry_sdk.Hub.current)
         with hub:
             try:
                 result = fn(*args, **kwargs)
@@ -189,8 +233,8 @@ def _with_sentry(fn):
         client = hub.client
         if client is not None:
             # Sentry does not send events right away (it handles messages async)
-            # and because the task finishing will shut down the worker thread
-            # we need to flush the client before exiting the function.
+            # and because the worker process may be shut down once the task
+            # finishes we need to flush the client before exiting the function.
             # ``client.flush`` will block until all messages in Sentry's queue are sent.
             # We do this _outside_ the try/except so that _anything_ passed to sentry
             # (like messages, etc) also get sent before the worker thread is closed.
@@ -202,15 +246,64 @@ def _with_sentry(fn):
 
 
 @_with_sentry
+def run_task(task_id: str, **kwargs):
+    """
+    Run the task in a process of the worker pool, recording its status in the store.
+
+    Any additional keyword arguments will be forwarded to ``perform_task``.
+
+    :param task_id: the UUID assigned to the task for tracking
+    """
+
+    store = get_task_store()
+    store.update_task(task_id, status=TaskState.RUNNING)
+    try:
+        perform_task(
+            task_id=task_id,
+            progress=store.get_value(task_id, "progress"),
+            finish_time=store.get_value(task_id, "finish_time"),
+            active_workers=store.get_value(task_id, "active_workers"),
+            is_bad_request=store.get_value(task_id, "is_bad_request"),
+            **kwargs,
+        )
+    except BaseException:
+        store.update_task(task_id, status=TaskState.FAILED)
+        raise
+    store.update_task(task_id, status=TaskState.FINISHED)
+
+
+@_with_sentry
+def refresh_index(task_id: str, callback_url: str | None, index_name: str):
+    """
+    Re-enable replicas and refresh the index built by the task's indexer workers,
+    then notify the callback URL.
+
+    :param task_id: the UUID of the task which scheduled the indexer workers
+    :param callback_url: the URL to which the task makes a request when completed
+    :param index_name: the name of the index to replicate and refresh
+    """
+
+    store = get_task_store()
+    indexer = TableIndexer(
+        elasticsearch_connect(),
+        task_id,
+        callback_url,
+        store.get_value(task_id, "progress"),
+        store.get_value(task_id, "active_workers"),
+    )
+    indexer.refresh(index_name=index_name, change_settings=True)
+    indexer.ping_callback()
+
+
 def perform_task(
     task_id: str,
     model: MediaType,
     action: TaskTypes,
     callback_url: str | None,
-    progress: Value,
-    finish_time: Value,
-    active_workers: Value,
-    is_bad_request: Value,
+    progress: TaskValue,
+    finish_time: TaskValue,
+    active_workers: TaskValue,
+    is_bad_request: TaskValue,
     **kwargs,
 ):
     """
@@ -222,10 +315,10 @@ def perform_task(
     :param model: the media type for which the action is being performed
     :param action: the name of the action being performed
     :param callback_url: the URL to which to make a request after the task is completed
-    :param progress: shared memory for tracking the task's progress
-    :param finish_time: shared memory for tracking the finish time of the task
-    :param active_workers: shared memory for counting workers assigned to the task
-    :param is_bad_request: shared memory that flags tasks that fail due to bad requests
+    :param progress: the stored progress of the task
+    :param finish_time: the stored finish time of the task
+    :param active_workers: the stored flag for workers assigned to the task
+    :param is_bad_request: the stored flag for tasks that fail due to bad requests
     """
 
     elasticsearch = elasticsearch_connect()
@@ -0,0 +1,17 @@
+import pytest
+
+from ingestion_server.es_mapping import INDEX_SORTS, index_settings
+
+
+def test_index_settings_are_unsorted_by_default():
+    assert "sort.field" not in index_settings("image")["settings"]["index"]
+
+
+@pytest.mark.parametrize("index_sort", INDEX_SORTS)
+def test_index_settings_sort_by_a_field_with_doc_values(index_sort):
+    settings = index_settings("audio", index_sort)
+
+    field = settings["settings"]["index"]["sort.field"]
+    assert settings["settings"]["index"]["sort.order"] == "desc"
+    # Rank features cannot be used to sort an index
+    assert settings["mappings"]["properties"][field]["type"] in {"float", "date"}
@@ -0,0 +1,120 @@
+from unittest import mock
+
+import pytest
+
+from ingestion_server import state, tasks
+from ingestion_server.task_store import TaskState, TaskStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.sqlite3"))
+    with (
+        mock.patch("ingestion_server.state.get_task_store", return_value=store),
+        mock.patch("ingestion_server.tasks.get_task_store", return_value=store),
+    ):
+        yield store
+
+
+def test_task_values_are_updated_in_the_store(store):
+    store.add_task("task", "image", "REINDEX", None)
+    progress = store.get_value("task", "progress")
+
+    progress.value = 42.5
+
+    assert progress.value == 42.5
+    assert store.get_task("task")["progress"] == 42.5
+    assert store.get_task("task")["status"] == TaskState.PENDING.value
+
+
+def test_only_task_values_can_be_updated(store):
+    store.add_task("task", "image", "REINDEX", None)
+
+    with pytest.raises(ValueError):
+        store.update_task("task", model="audio")
+    with pytest.raises(ValueError):
+        store.get_value("task", "task_id")
+
+
+def test_get_missing_task_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.get_task("missing")
+
+
+def test_tasks_persist_across_stores(store):
+    store.add_task("running", "image", "REINDEX", None)
+    store.update_task("running", status=TaskState.RUNNING)
+    store.add_task("finished", "audio", "PROMOTE", "https://example.com")
+    store.update_task("finished", status=TaskState.FINISHED, progress=100)
+
+    restarted_store = TaskStore(store.path)
+    assert restarted_store.interrupt_unfinished_tasks() == 1
+
+    assert [
+        (task["task_id"], task["status"]) for task in restarted_store.list_tasks()
+    ] == [("running", "interrupted"), ("finished", "finished")]
+
+
+@pytest.mark.parametrize(
+    "status, progress, expected_active, expected_error",
+    [
+        (TaskState.PENDING, 0, True, False),
+        (TaskState.RUNNING, 50, True, False),
+        (TaskState.FINISHED, 100, False, False),
+        (TaskState.FAILED, 50, False, True),
+        (TaskState.INTERRUPTED, 50, False, True),
+    ],
+)
+def test_get_task_status(store, status, progress, expected_active, expected_error):
+    store.add_task("task", "image", "REINDEX", None)
+    store.update_task("task", status=status, progress=progress)
+
+    task_status = tasks.get_task_status(store, "task")
+
+    assert task_status["task_id"] == "task"
+    assert task_status["action"] == "REINDEX"
+    assert task_status["status"] == status.value
+    assert task_status["active"] is expected_active
+    assert task_status["error"] is expected_error
+
+
+@pytest.mark.parametrize("error", [False, True])
+def test_run_task_records_status(store, error):
+    store.add_task("task", "image", "REINDEX", None)
+
+    def perform_task(progress, **kwargs):
+        progress.value = 100
+        if error:
+            raise ValueError("Failed")
+
+    with mock.patch.object(tasks, "perform_task", side_effect=perform_task):
+        tasks.run_task(task_id="task", model="image", action=tasks.TaskTypes.REINDEX)
+
+    task_info = store.get_task("task")
+    assert task_info["progress"] == 100
+    assert task_info["status"] == ("failed" if error else "finished")
+
+
+def test_indexing_job_state(store):
+    assert state.register_indexing_job(["a", "b"], "image-new", "task")
+    # Only one indexing job can run at a time
+    assert not state.register_indexing_job(["c"], "image-other", "other")
+    assert state.has_active_workers_for_task_id("task")
+    assert not state.has_active_workers_for_task_id("other")
+
+    assert state.worker_finished("a", False) == state.TaskData(
+        target_index="image-new",
+        task_id="task",
+        percent_successful=50,
+        percent_completed=50,
+    )
+    assert state.worker_finished("b", True) == state.TaskData(
+        target_index="image-new",
+        task_id="task",
+        percent_successful=50,
+        percent_completed=100,
+    )
+    assert not state.has_active_workers_for_task_id("task")
+
+    state.clear_state()
+    assert state.worker_finished("a", False) is None
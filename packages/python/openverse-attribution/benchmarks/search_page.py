@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of the license handling performed by the API when serialising a
+page of 20 search results.
+
+For every result, the API lowercases the license, derives the license URL when
+it is missing from the metadata and renders the attribution text. This compares
+doing that with a freshly constructed ``License`` per result against the
+interned licenses and memoised attribution.
+
+Run it from the package directory with ``pdm run python benchmarks/search_page.py``.
+"""
+
+import itertools
+import timeit
+
+from openverse_attribution.attribution import get_attribution_text
+from openverse_attribution.license import License
+
+
+PAGE_SIZE = 20
+REPEAT = 5
+NUMBER = 2_000
+
+LICENSES = [
+    ("BY", "4.0"),
+    ("by-sa", "2.0"),
+    ("by-nc", "3.0"),
+    ("cc0", "1.0"),
+    ("pdm", "1.0"),
+    ("by-nc-nd", "2.5"),
+]
+
+PAGE = [
+    {
+        "title": f"Result {idx}",
+        "creator": f"Creator {idx % 7}",
+        "license": license,
+        "license_version": version,
+    }
+    for idx, (license, version) in zip(range(PAGE_SIZE), itertools.cycle(LICENSES))
+]
+
+
+def serialize_page_constructed():
+    for item in PAGE:
+        lic = License(item["license"].lower(), item["license_version"])
+        license_url = lic.url
+        License(item["license"].lower(), item["license_version"]).get_attribution_text(
+            item["title"], item["creator"], license_url
+        )
+
+
+def serialize_page_interned():
+    for item in PAGE:
+        slug = item["license"].lower()
+        license_url = License.interned(slug, item["license_version"]).url
+        get_attribution_text(
+            slug,
+            item["license_version"],
+            title=item["title"],
+            creator=item["creator"],
+            license_url=license_url,
+        )
+
+
+def main():
+    for func in (serialize_page_constructed, serialize_page_interned):
+        best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER)) / NUMBER
+        print(f"{func.__name__:<28} {best * 1e6:8.1f} µs per {PAGE_SIZE}-item page")
+
+
+if __name__ == "__main__":
+    main()
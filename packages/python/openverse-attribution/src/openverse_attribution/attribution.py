@@ -0,0 +1,38 @@
+from functools import lru_cache
+
+from openverse_attribution.license import License
+
+
+# Enough to hold the attributions for several pages of popular search results.
+ATTRIBUTION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=ATTRIBUTION_CACHE_SIZE)
+def get_attribution_text(
+    license_slug: str,
+    license_version: str | None = None,
+    license_jurisdiction: str | None = None,
+    title: str | None = None,
+    creator: str | None = None,
+    license_url: str | bool | None = None,
+) -> str:
+    """
+    Get the plain-text English language attribution for a media item.
+
+    This is a memoised shortcut for ``License.get_attribution_text`` on the
+    interned ``License`` for the given slug, version and jurisdiction. Media
+    items that are attributed repeatedly, such as popular search results, only
+    have their attribution rendered once.
+
+    :param license_slug: the slug for the license, from the ``LicenseName`` enum
+    :param license_version: the version of the license
+    :param license_jurisdiction: the jurisdiction of the license
+    :param title: the name of the work, if known
+    :param creator: the name of the work's creator, if known
+    :param license_url: the URL to the license, to override the default
+    :return: the plain-text English language attribution
+    :raise ValueError: if the license, version and jurisdiction are invalid
+    """
+
+    lic = License.interned(license_slug, license_version, license_jurisdiction)
+    return lic.get_attribution_text(title, creator, license_url)
@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import cache, cached_property
 
 from openverse_attribution.data.all_licenses import all_licenses
 from openverse_attribution.license_name import LicenseName
@@ -10,6 +11,10 @@ KNOWN_ALIASES = {
     "mark": "pdm",
 }
 
+ALL_JURISDICTIONS = {jur for item in all_licenses.values() for jur in item.keys()}
+
+MULTIPLE_WHITESPACE = re.compile(r"\s{2,}")
+
 
 @dataclass
 class License:
@@ -66,7 +71,7 @@ class License:
 
         # Validate jurisdiction against known jurisdictions.
         if jur is not None:
-            if all(jur not in item for item in all_licenses.values()):
+            if jur not in ALL_JURISDICTIONS:
                 raise ValueError(f"Jurisdiction `{jur}` does not exist.")
 
             if ver and jur not in all_licenses[ver].keys():
@@ -91,6 +96,31 @@ class License:
                     f"License `{slug}` does not accept version `{ver}` and jurisdiction `{jur}`."
                 )
 
+    @classmethod
+    def interned(
+        cls,
+        slug: str,
+        version: str | None = None,
+        jurisdiction: str | None = None,
+    ) -> "License":
+        """
+        Get a shared instance of ``License`` for the given arguments.
+
+        Validation and deduction run only the first time a combination of
+        arguments is seen; subsequent calls return the same object. The
+        returned instance is shared, so it must not be modified.
+
+        Invalid combinations are not cached and raise ``ValueError`` on every
+        call, like the constructor.
+
+        :param slug: the slug for the license, from the ``LicenseName`` enum
+        :param version: the version of the license
+        :param jurisdiction: the jurisdiction of the license
+        :return: the shared instance of ``License``
+        """
+
+        return _interned_license(slug, version, jurisdiction)
+
     def _deduce_ver(self) -> str | None:
         """
         Deduce version from slug and jurisdiction.
@@ -164,7 +194,7 @@ class License:
         else:
             raise ValueError(f"No version and jurisdiction match slug `{self.slug}`.")
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """
         Get the full name of the license.
@@ -182,7 +212,7 @@ class License:
             name = f"{name} {self.jur.upper()}"
         return name
 
-    @property
+    @cached_property
     def url(self) -> str:
         """
         Get the URL to the deed of this license.
@@ -239,38 +269,37 @@ class License:
         """
 
         title = f'"{title}"' if title else "This work"
+        creator = f"by {creator}" if creator else ""
+        marked_licensed, terms_copy = self._attribution_phrases
 
-        attribution_template = (
-            "{title} {creator} {marked-licensed} {license}. {view-legal}"
+        view_legal = ""
+        if url is not False:
+            view_legal = f"To view {terms_copy}, visit {url or self.url}."
+
+        attribution = (
+            f"{title} {creator} {marked_licensed} {self.full_name}. {view_legal}"
         )
-        attribution_parts = {
-            "title": title,
-            "marked-licensed": "is marked with"
-            if self.name.is_pd
-            else "is licensed under",
-            "license": self.full_name,
-            "view-legal": "",
-            "creator": "",
-        }
 
-        if url is not False:
-            license_url = url or self.url
-            view_legal_template = "To view {terms-copy}, visit {url}."
-            view_legal_parts = {
-                "terms-copy": "the terms"
-                if self.name.is_pd
-                else "a copy of this license",
-                "url": license_url,
-            }
-            attribution_parts["view-legal"] = view_legal_template.format(
-                **view_legal_parts
-            )
+        return MULTIPLE_WHITESPACE.sub(" ", attribution).strip()
+
+    @cached_property
+    def _attribution_phrases(self) -> tuple[str, str]:
+        """
+        Get the phrases of the attribution text that depend on whether the
+        license is in the public domain.
+
+        :return: the verb for the license and the description of its terms
+        """
 
-        if creator:
-            creator_template = "by {creator-name}"
-            creator_parts = {"creator-name": creator}
-            attribution_parts["creator"] = creator_template.format(**creator_parts)
+        if self.name.is_pd:
+            return "is marked with", "the terms"
+        return "is licensed under", "a copy of this license"
 
-        attribution = attribution_template.format(**attribution_parts)
 
-        return re.sub(r"\s{2,}", " ", attribution).strip()
+@cache
+def _interned_license(
+    slug: str,
+    version: str | None,
+    jurisdiction: str | None,
+) -> License:
+    return License(slug, version, jurisdiction)
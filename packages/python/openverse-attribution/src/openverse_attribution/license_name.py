@@ -19,6 +19,26 @@ DEPRECATED_SLUGS = {
 PUBLIC_DOMAIN_SLUGS = NON_CC_SLUGS | {"cc0"}
 
 
+def _build_allowed_versions_jurisdictions() -> dict[str, tuple[tuple[str, str], ...]]:
+    """
+    Map each slug to the versions and jurisdictions where it is valid, in the
+    same order as they appear in the license data.
+
+    :return: a mapping of slugs to allowed versions and jurisdictions
+    """
+
+    allowed: dict[str, list[tuple[str, str]]] = {}
+    for ver, jurs in all_licenses.items():
+        for jur, slugs in jurs.items():
+            for slug in slugs:
+                allowed.setdefault(slug, []).append((ver, jur))
+    return {slug: tuple(ver_jur) for slug, ver_jur in allowed.items()}
+
+
+# Built once at import time so that lookups do not need to scan all licenses.
+ALLOWED_VERSIONS_JURISDICTIONS = _build_allowed_versions_jurisdictions()
+
+
 class LicenseName(StrEnum):
     """
     Represents all existing CC "licenses".
@@ -118,9 +138,4 @@ class LicenseName(StrEnum):
         :return: a list of allowed versions and jurisdictions
         """
 
-        return [
-            (ver, jur)
-            for ver in all_licenses.keys()
-            for jur in all_licenses[ver].keys()
-            if self.value in all_licenses[ver][jur]
-        ]
+        return list(ALLOWED_VERSIONS_JURISDICTIONS.get(self.value, ()))
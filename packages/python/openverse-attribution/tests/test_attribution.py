@@ -1,4 +1,5 @@
 import pytest
+from openverse_attribution.attribution import get_attribution_text
 from openverse_attribution.license import License
 
 
@@ -86,3 +87,27 @@ def test_attribution_text_differentiates_license_and_other_tools(
     attribution: str,
 ):
     assert License(slug).get_attribution_text() == attribution
+
+
+def test_memoised_attribution_text_matches_license():
+    args = ("Title", "Creator", "https://license/url")
+    expected = License("by", "2.0").get_attribution_text(*args)
+
+    get_attribution_text.cache_clear()
+    for _ in range(2):
+        assert (
+            get_attribution_text(
+                "by",
+                "2.0",
+                title=args[0],
+                creator=args[1],
+                license_url=args[2],
+            )
+            == expected
+        )
+    assert get_attribution_text.cache_info().hits == 1
+
+
+def test_memoised_attribution_text_raises_for_invalid_license():
+    with pytest.raises(ValueError, match="Version `5.0` does not exist."):
+        get_attribution_text("by", "5.0")
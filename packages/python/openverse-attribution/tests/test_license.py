@@ -99,6 +99,19 @@ def test_license_validation_never_fails_for_just_name(slug: str):
     assert License(slug)
 
 
+def test_interned_license_is_shared():
+    lic = License.interned("by", "4.0")
+    assert lic is License.interned("by", "4.0")
+    assert lic == License("by", "4.0")
+    assert lic is not License.interned("by", "3.0")
+
+
+def test_interned_license_does_not_cache_invalid_licenses():
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Version `5.0` does not exist."):
+            License.interned("by", "5.0")
+
+
 @pytest.mark.parametrize(
     "slug, version, jurisdiction, full_name",
     [